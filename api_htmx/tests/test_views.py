@@ -0,0 +1,76 @@
+"""Test suite for the HTMX API views."""
+
+from collections.abc import Sequence
+
+__all__: Sequence[str] = ()
+
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from api_htmx.views import DislikePostView, LikePostView, UnlikePostView
+from ratemymodule.models import Course, Module, Post, User
+from ratemymodule.tests.utils import TestCase, TestDataGenerator
+
+
+class PostReactionViewTests(TestCase):
+    @staticmethod
+    def _post_as(view: type[LikePostView | DislikePostView | UnlikePostView], post: Post, user: User) -> HttpResponse:  # noqa: E501
+        request = RequestFactory().post("/")
+        request.user = user
+        response: HttpResponse = view.as_view()(request, pk=post.pk)  # type: ignore[assignment]
+        response.render()  # type: ignore[attr-defined]
+        return response
+
+    def test_like_then_unlike_renders_new_state(self) -> None:
+        course: Course = TestDataGenerator.create_course()
+        module: Module = TestDataGenerator.create_module()
+        module.course_set.add(course)
+        post: Post = Post.objects.create(
+            module=module,
+            user=TestDataGenerator.create_enrolled_user(course),
+            overall_rating=Post.Ratings.FOUR,
+            academic_year_start=timezone.now().year,
+        )
+        reactor: User = TestDataGenerator.create_enrolled_user(course)
+
+        like_response: HttpResponse = self._post_as(LikePostView, post, reactor)
+        self.assertContains(
+            like_response,
+            reverse("api_htmx:unlike_post", kwargs={"pk": post.pk}),
+        )
+        self.assertEqual(post.liked_user_set.count(), 2)
+
+        unlike_response: HttpResponse = self._post_as(UnlikePostView, post, reactor)
+        self.assertContains(
+            unlike_response,
+            reverse("api_htmx:like_post", kwargs={"pk": post.pk}),
+        )
+        self.assertEqual(post.liked_user_set.count(), 1)
+
+    def test_dislike_query_count_independent_of_likes(self) -> None:
+        course: Course = TestDataGenerator.create_course()
+        module: Module = TestDataGenerator.create_module()
+        module.course_set.add(course)
+        post: Post = Post.objects.create(
+            module=module,
+            user=TestDataGenerator.create_enrolled_user(course),
+            overall_rating=Post.Ratings.FOUR,
+            academic_year_start=timezone.now().year,
+        )
+        reactor: User = TestDataGenerator.create_enrolled_user(course)
+
+        with CaptureQueriesContext(connection) as few_likes_queries:
+            self._post_as(DislikePostView, post, reactor)
+
+        post.liked_user_set.add(
+            *(TestDataGenerator.create_enrolled_user(course) for _ in range(5)),
+        )
+
+        with CaptureQueriesContext(connection) as many_likes_queries:
+            self._post_as(DislikePostView, post, reactor)
+
+        self.assertEqual(len(few_likes_queries), len(many_likes_queries))
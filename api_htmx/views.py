@@ -4,6 +4,7 @@ from collections.abc import Sequence
 
 __all__: Sequence[str] = ("LikePostView", "DislikePostView", "UnlikePostView")
 
+import abc
 from typing import override
 
 from django.contrib.auth.mixins import LoginRequiredMixin
@@ -12,40 +13,28 @@ from django.http import HttpRequest, HttpResponse
 from django.views.generic import DetailView
 
 from ratemymodule.models import Post
+from ratemymodule.models.reaction_buffer import record_post_reaction
+from ratemymodule.models.reactions import PostReactionState, Reaction
 
 
-class LikePostView(LoginRequiredMixin, DetailView[Post]):
-    http_method_names = ("post",)
-    template_name = "ratemymodule/fragments/like-dislike-buttons.html"
-    context_object_name = "post"
-
-    @override
-    def get_queryset(self) -> QuerySet[Post]:
-        return Post.filter_by_viewable(request=self.request).all()
-
-    # noinspection PyOverrides
-    @override
-    def post(self, request: HttpRequest, *args: object, **kwargs: object) -> HttpResponse:  # type: ignore[misc]
-        self.object: Post = self.get_object()
-
-        if not self.request.user.is_authenticated:
-            raise RuntimeError
+class _BasePostReactionView(LoginRequiredMixin, DetailView[Post], abc.ABC):
+    """
+    Base view to apply a single reaction to a post, then render the reaction buttons.
 
-        self.object.user_like(self.request.user)
+    The buttons are rendered from the state returned by the reaction service,
+    so no further queries are made about the post's reactions.
+    When `REACTION_BUFFER_ENABLED` is set, the reaction is buffered rather than written
+    immediately.
+    """
 
-        self.object.refresh_from_db()
-
-        return self.render_to_response(self.get_context_data(object=self.object))
-
-
-class DislikePostView(LoginRequiredMixin, DetailView[Post]):
     http_method_names = ("post",)
     template_name = "ratemymodule/fragments/like-dislike-buttons.html"
     context_object_name = "post"
+    REACTION: Reaction
 
     @override
     def get_queryset(self) -> QuerySet[Post]:
-        return Post.filter_by_viewable(request=self.request).all()
+        return Post.filter_by_viewable(request=self.request).only("pk", "user")
 
     # noinspection PyOverrides
     @override
@@ -55,32 +44,30 @@ class DislikePostView(LoginRequiredMixin, DetailView[Post]):
         if not self.request.user.is_authenticated:
             raise RuntimeError
 
-        self.object.user_dislike(self.request.user)
+        reaction_state: PostReactionState = record_post_reaction(
+            post=self.object,
+            user=self.request.user,
+            reaction=self.REACTION,
+        )
 
-        self.object.refresh_from_db()
+        return self.render_to_response(
+            self.get_context_data(object=self.object, reaction_state=reaction_state),
+        )
 
-        return self.render_to_response(self.get_context_data(object=self.object))
 
+class LikePostView(_BasePostReactionView):
+    """View to like a post, as the currently logged-in user."""
 
-class UnlikePostView(LoginRequiredMixin, DetailView[Post]):
-    http_method_names = ("post",)
-    template_name = "ratemymodule/fragments/like-dislike-buttons.html"
-    context_object_name = "post"
+    REACTION = Reaction.LIKE
 
-    @override
-    def get_queryset(self) -> QuerySet[Post]:
-        return Post.filter_by_viewable(request=self.request).all()
 
-    # noinspection PyOverrides
-    @override
-    def post(self, request: HttpRequest, *args: object, **kwargs: object) -> HttpResponse:  # type: ignore[misc]
-        self.object: Post = self.get_object()
+class DislikePostView(_BasePostReactionView):
+    """View to dislike a post, as the currently logged-in user."""
 
-        if not self.request.user.is_authenticated:
-            raise RuntimeError
+    REACTION = Reaction.DISLIKE
 
-        self.object.user_unlike(self.request.user)
 
-        self.object.refresh_from_db()
+class UnlikePostView(_BasePostReactionView):
+    """View to remove any reaction to a post, made by the currently logged-in user."""
 
-        return self.render_to_response(self.get_context_data(object=self.object))
+    REACTION = Reaction.CLEAR
@@ -0,0 +1,40 @@
+"""Pagination classes for the REST API of `RateMyModule` project."""
+
+from collections.abc import Sequence
+
+__all__: Sequence[str] = ("PrefixableViewSetCursorPagination",)
+
+from typing import TYPE_CHECKING, override
+
+from rest_framework.pagination import CursorPagination
+
+if TYPE_CHECKING:
+    from django.db.models import Model, QuerySet
+    from rest_framework.request import Request
+    from rest_framework.views import APIView
+
+
+class PrefixableViewSetCursorPagination(CursorPagination):
+    """
+    Cursor pagination, using each viewset's own page size & cursor ordering.
+
+    Each page is fetched with a single `LIMIT` query, positioned by an indexed column
+    (rather than an `OFFSET` or a `COUNT()` of the whole table),
+    so listing stays just as fast however many rows a table has.
+    Clients can request smaller or larger pages with the `page_size` GET parameter,
+    up to `max_page_size`.
+    """
+
+    ordering = "pk"
+    page_size_query_param = "page_size"
+    max_page_size = 200
+
+    @override
+    def paginate_queryset(self, queryset: "QuerySet[Model]", request: "Request", view: "APIView | None" = None) -> list[object] | None:  # type: ignore[override]  # noqa: E501
+        self.page_size = getattr(view, "PAGE_SIZE", self.page_size)
+
+        return super().paginate_queryset(queryset, request, view)
+
+    @override
+    def get_ordering(self, request: "Request", queryset: "QuerySet[Model]", view: "APIView") -> tuple[str, ...]:  # type: ignore[override]  # noqa: E501
+        return (getattr(view, "CURSOR_ORDERING", self.ordering),)
@@ -12,11 +12,15 @@ __all__: Sequence[str] = (
     "OtherTagSerializer",
     "PostSerializer",
     "ReportSerializer",
+    "DateRangeSerializer",
+    "PostFiltersSerializer",
+    "PostExportFiltersSerializer",
 )
 
-from collections.abc import Callable, Iterable
-from typing import Final, override
+from collections.abc import Callable
+from typing import ClassVar, Final, override
 
+from django.db.models import QuerySet
 from django_stubs_ext import StrOrPromise
 from rest_framework import serializers
 from rest_framework.fields import empty
@@ -27,6 +31,7 @@ from rest_framework.serializers import (
     ModelSerializer,
 )
 
+from ratemymodule.exceptions import UnindexedPostFiltersError
 from ratemymodule.models import (
     BaseTag,
     Course,
@@ -39,14 +44,47 @@ from ratemymodule.models import (
     University,
     User,
 )
-
-from .fields import RelatedOtherTagField, RelatedToolTagField, RelatedTopicTagField
+from ratemymodule.models.post_filters import PostFilters
+from ratemymodule.models.reactions import PostReactionState, annotate_post_reaction_state
+from ratemymodule.utils.post_export import POST_EXPORT_FILE_FORMATS
+
+from .fields import (
+    RelatedOtherTagField,
+    RelatedToolTagField,
+    RelatedTopicTagField,
+    UserUniversityField,
+)
+from .sparse_fieldsets import ExpandableField, PrefetchedField, SparseFieldsetSerializerMixin
 
 
-class UserSerializer(HyperlinkedModelSerializer):
+class UserSerializer(SparseFieldsetSerializerMixin, HyperlinkedModelSerializer):
     """A class for serializing users."""
 
-    university: HyperlinkedRelatedField[University] = HyperlinkedRelatedField(
+    STAFF_FIELD_NAMES = ("url", "password_hash", "is_staff", "last_login")
+    SUPERUSER_FIELD_NAMES = ("is_superuser",)
+
+    PREFETCHED_FIELDS = {  # noqa: RUF012
+        "enrolled_course_set": PrefetchedField("enrolled_course_set"),
+        "liked_post_set": PrefetchedField("liked_post_set"),
+        "disliked_post_set": PrefetchedField("disliked_post_set"),
+        "made_post_set": PrefetchedField("made_post_set", ("pk", "user")),
+        "made_report_set": PrefetchedField("made_report_set", ("pk", "reporter")),
+    }
+    EXPANDABLE_FIELDS = {  # noqa: RUF012
+        "enrolled_course_set": ExpandableField(
+            lambda: CourseSerializer,
+            "enrolled_course_set",
+            many=True,
+        ),
+        "made_post_set": ExpandableField(lambda: PostSerializer, "made_post_set", many=True),
+        "made_report_set": ExpandableField(
+            lambda: ReportSerializer,
+            "made_report_set",
+            many=True,
+        ),
+    }
+
+    university: UserUniversityField = UserUniversityField(
         read_only=True,
         view_name="api_rest:university-detail",
     )
@@ -85,43 +123,34 @@ class UserSerializer(HyperlinkedModelSerializer):
             "made_report_set": {"view_name": "api_rest:report-detail"},
         }
 
-    # noinspection PyOverrides
     @override
-    def __init__(self, instance: User | None = None, data: User | empty = empty, *, partial: bool = False, many: bool = False, context: dict[str, object] | None = None, read_only: bool = False, write_only: bool = False, required: bool | None = None, default: User | empty = empty, initial: User | empty = empty, source: str | None = None, label: StrOrPromise | None = None, help_text: StrOrPromise | None = None, style: dict[str, object] | None = None, error_messages: dict[str, StrOrPromise] | None = None, validators: Sequence[Callable[[object], None]] | None = None, allow_null: bool = False) -> None:  # type: ignore[valid-type] # noqa: E501
-        super().__init__(
-            instance=instance,
-            data=data,
-            partial=partial,
-            many=many,
-            context=context or {},
-            read_only=read_only,
-            write_only=write_only,
-            required=required,
-            default=default,
-            initial=initial,
-            source=source,
-            label=label,
-            help_text=help_text,
-            style=style,
-            error_messages=error_messages,
-            validators=validators,
-            allow_null=allow_null,
-        )
+    def prepare_queryset(self, queryset: QuerySet[User]) -> QuerySet[User]:  # type: ignore[override]
+        """
+        Prefetch & annotate everything needed to serialize the users of the given queryset.
+
+        Each user's university is only annotated if the `university` field is included.
+        """
+        queryset = super().prepare_queryset(queryset)  # type: ignore[arg-type,assignment]
 
-        if not self.context["request"].user.is_superuser:
-            superuser_field_name: str
-            for superuser_field_name in ("is_superuser",):
-                self.fields.pop(superuser_field_name, None)
+        if "university" in self.fields:
+            queryset = User.annotate_university_pk(queryset)
 
-        if not self.context["request"].user.is_staff:
-            staff_field_name: str
-            for staff_field_name in ("url", "password_hash", "is_staff", "last_login"):
-                self.fields.pop(staff_field_name, None)
+        return queryset
 
 
-class UniversitySerializer(HyperlinkedModelSerializer):
+class UniversitySerializer(SparseFieldsetSerializerMixin, HyperlinkedModelSerializer):
     """A class for serializing universities."""
 
+    STAFF_FIELD_NAMES = ("date_time_created",)
+
+    PREFETCHED_FIELDS = {  # noqa: RUF012
+        "course_set": PrefetchedField("course_set", ("pk", "university")),
+        "module_set": PrefetchedField("module_set"),
+    }
+    EXPANDABLE_FIELDS = {  # noqa: RUF012
+        "course_set": ExpandableField(lambda: CourseSerializer, "course_set", many=True),
+    }
+
     module_set: HyperlinkedRelatedField[Module] = HyperlinkedRelatedField(
         many=True,
         read_only=True,
@@ -146,37 +175,20 @@ class UniversitySerializer(HyperlinkedModelSerializer):
             "course_set": {"view_name": "api_rest:course-detail"},
         }
 
-    # noinspection PyOverrides
-    @override
-    def __init__(self, instance: University | None = None, data: University | empty = empty, *, partial: bool = False, many: bool = False, context: dict[str, object] | None = None, read_only: bool = False, write_only: bool = False, required: bool | None = None, default: University | empty = empty, initial: University | empty = empty, source: str | None = None, label: StrOrPromise | None = None, help_text: StrOrPromise | None = None, style: dict[str, object] | None = None, error_messages: dict[str, StrOrPromise] | None = None, validators: Sequence[Callable[[object], None]] | None = None, allow_null: bool = False) -> None:  # type: ignore[valid-type] # noqa: E501
-        super().__init__(
-            instance=instance,
-            data=data,
-            partial=partial,
-            many=many,
-            context=context or {},
-            read_only=read_only,
-            write_only=write_only,
-            required=required,
-            default=default,
-            initial=initial,
-            source=source,
-            label=label,
-            help_text=help_text,
-            style=style,
-            error_messages=error_messages,
-            validators=validators,
-            allow_null=allow_null,
-        )
 
-        if not self.context["request"].user.is_staff:
-            staff_field_name: str
-            for staff_field_name in ("date_time_created",):
-                self.fields.pop(staff_field_name, None)
+class CourseSerializer(SparseFieldsetSerializerMixin, HyperlinkedModelSerializer):
+    """A class for serializing courses."""
 
+    STAFF_FIELD_NAMES = ("enrolled_user_set", "date_time_created")
 
-class CourseSerializer(HyperlinkedModelSerializer):
-    """A class for serializing courses."""
+    PREFETCHED_FIELDS = {  # noqa: RUF012
+        "module_set": PrefetchedField("module_set"),
+        "enrolled_user_set": PrefetchedField("enrolled_user_set"),
+    }
+    EXPANDABLE_FIELDS = {  # noqa: RUF012
+        "university": ExpandableField(lambda: UniversitySerializer, "university"),
+        "module_set": ExpandableField(lambda: ModuleSerializer, "module_set", many=True),
+    }
 
     class Meta:  # noqa: D106
         model = Course
@@ -198,37 +210,19 @@ class CourseSerializer(HyperlinkedModelSerializer):
             "enrolled_user_set": {"view_name": "api_rest:user-detail"},
         }
 
-    # noinspection PyOverrides
-    @override
-    def __init__(self, instance: Course | None = None, data: Course | empty = empty, *, partial: bool = False, many: bool = False, context: dict[str, object] | None = None, read_only: bool = False, write_only: bool = False, required: bool | None = None, default: Course | empty = empty, initial: Course | empty = empty, source: str | None = None, label: StrOrPromise | None = None, help_text: StrOrPromise | None = None, style: dict[str, object] | None = None, error_messages: dict[str, StrOrPromise] | None = None, validators: Sequence[Callable[[object], None]] | None = None, allow_null: bool = False) -> None:  # type: ignore[valid-type] # noqa: E501
-        super().__init__(
-            instance=instance,
-            data=data,
-            partial=partial,
-            many=many,
-            context=context or {},
-            read_only=read_only,
-            write_only=write_only,
-            required=required,
-            default=default,
-            initial=initial,
-            source=source,
-            label=label,
-            help_text=help_text,
-            style=style,
-            error_messages=error_messages,
-            validators=validators,
-            allow_null=allow_null,
-        )
 
-        if not self.context["request"].user.is_staff:
-            staff_field_name: str
-            for staff_field_name in ("enrolled_user_set", "date_time_created"):
-                self.fields.pop(staff_field_name, None)
+class ModuleSerializer(SparseFieldsetSerializerMixin, HyperlinkedModelSerializer):
+    """A class for serializing Modules."""
 
+    STAFF_FIELD_NAMES = ("date_started", "date_time_created")
 
-class ModuleSerializer(HyperlinkedModelSerializer):
-    """A class for serializing Modules."""
+    PREFETCHED_FIELDS = {  # noqa: RUF012
+        "course_set": PrefetchedField("course_set"),
+        "post_set": PrefetchedField("post_set", ("pk", "module")),
+    }
+    EXPANDABLE_FIELDS = {  # noqa: RUF012
+        "course_set": ExpandableField(lambda: CourseSerializer, "course_set", many=True),
+    }
 
     university: HyperlinkedRelatedField[University] = HyperlinkedRelatedField(
         read_only=True,
@@ -262,34 +256,6 @@ class ModuleSerializer(HyperlinkedModelSerializer):
             "post_set": {"view_name": "api_rest:post-detail"},
         }
 
-    # noinspection PyOverrides
-    @override
-    def __init__(self, instance: Module | None = None, data: Module | empty = empty, *, partial: bool = False, many: bool = False, context: dict[str, object] | None = None, read_only: bool = False, write_only: bool = False, required: bool | None = None, default: Module | empty = empty, initial: Module | empty = empty, source: str | None = None, label: StrOrPromise | None = None, help_text: StrOrPromise | None = None, style: dict[str, object] | None = None, error_messages: dict[str, StrOrPromise] | None = None, validators: Sequence[Callable[[object], None]] | None = None, allow_null: bool = False) -> None:  # type: ignore[valid-type] # noqa: E501
-        super().__init__(
-            instance=instance,
-            data=data,
-            partial=partial,
-            many=many,
-            context=context or {},
-            read_only=read_only,
-            write_only=write_only,
-            required=required,
-            default=default,
-            initial=initial,
-            source=source,
-            label=label,
-            help_text=help_text,
-            style=style,
-            error_messages=error_messages,
-            validators=validators,
-            allow_null=allow_null,
-        )
-
-        if not self.context["request"].user.is_staff:
-            staff_field_name: str
-            for staff_field_name in ("date_started", "date_time_created"):
-                self.fields.pop(staff_field_name, None)
-
     # noinspection PyOverrides
     @override
     def get_web_url(self, obj: Module) -> str:  # type: ignore[misc]
@@ -301,37 +267,11 @@ class ModuleSerializer(HyperlinkedModelSerializer):
         return obj.year_started.year
 
 
-class _BaseTagSerializer(ModelSerializer[BaseTag]):
-    # noinspection PyOverrides
-    @override
-    def __init__(self, instance: BaseTag | None = None, data: BaseTag | empty = empty, *, partial: bool = False, many: bool = False, context: dict[str, object] | None = None, read_only: bool = False, write_only: bool = False, required: bool | None = None, default: BaseTag | empty = empty, initial: BaseTag | empty = empty, source: str | None = None, label: StrOrPromise | None = None, help_text: StrOrPromise | None = None, style: dict[str, object] | None = None, error_messages: dict[str, StrOrPromise] | None = None, validators: Sequence[Callable[[object], None]] | None = None, allow_null: bool = False) -> None:  # type: ignore[valid-type] # noqa: E501
-        super().__init__(
-            instance=instance,
-            data=data,
-            partial=partial,
-            many=many,
-            context=context or {},
-            read_only=read_only,
-            write_only=write_only,
-            required=required,
-            default=default,
-            initial=initial,
-            source=source,
-            label=label,
-            help_text=help_text,
-            style=style,
-            error_messages=error_messages,
-            validators=validators,
-            allow_null=allow_null,
-        )
-
-        if not self.context["request"].user.is_staff:
-            staff_field_name: str
-            for staff_field_name in ("is_verified",):
-                self.fields.pop(staff_field_name, None)
+class _BaseTagSerializer(SparseFieldsetSerializerMixin, ModelSerializer[BaseTag]):
+    STAFF_FIELD_NAMES = ("is_verified",)
 
 
-class ToolTagSerializer(HyperlinkedModelSerializer):
+class ToolTagSerializer(SparseFieldsetSerializerMixin, HyperlinkedModelSerializer):
     """A class for serializing Tool Tags."""
 
     class Meta:  # noqa: D106
@@ -346,7 +286,7 @@ class ToolTagSerializer(HyperlinkedModelSerializer):
         extra_kwargs = {"url": {"view_name": "api_rest:tooltag-detail"}}  # noqa: RUF012
 
 
-class TopicTagSerializer(HyperlinkedModelSerializer):
+class TopicTagSerializer(SparseFieldsetSerializerMixin, HyperlinkedModelSerializer):
     """A class for serializing topic tags."""
 
     class Meta:  # noqa: D106
@@ -361,7 +301,7 @@ class TopicTagSerializer(HyperlinkedModelSerializer):
         extra_kwargs = {"url": {"view_name": "api_rest:topictag-detail"}}  # noqa: RUF012
 
 
-class OtherTagSerializer(HyperlinkedModelSerializer):
+class OtherTagSerializer(SparseFieldsetSerializerMixin, HyperlinkedModelSerializer):
     """A class for serializing other tags."""
 
     class Meta:  # noqa: D106
@@ -376,15 +316,56 @@ class OtherTagSerializer(HyperlinkedModelSerializer):
         extra_kwargs = {"url": {"view_name": "api_rest:othertag-detail"}}  # noqa: RUF012
 
 
-class PostSerializer(HyperlinkedModelSerializer):
+class PostSerializer(SparseFieldsetSerializerMixin, HyperlinkedModelSerializer):
     """A class for serializing Posts."""
 
+    STAFF_FIELD_NAMES = (
+        "user_url",
+        "likes_count",
+        "dislikes_count",
+        "liked_user_set",
+        "disliked_user_set",
+        "report_set",
+        "hidden",
+    )
+
+    PREFETCHED_FIELDS = {  # noqa: RUF012
+        "tool_tag_set": PrefetchedField("tool_tag_set", ("pk", "name")),
+        "topic_tag_set": PrefetchedField("topic_tag_set", ("pk", "name")),
+        "other_tag_set": PrefetchedField("other_tag_set", ("pk", "name")),
+        "liked_user_set": PrefetchedField("liked_user_set"),
+        "disliked_user_set": PrefetchedField("disliked_user_set"),
+        "report_set": PrefetchedField("report_set", ("pk", "post")),
+    }
+    EXPANDABLE_FIELDS = {  # noqa: RUF012
+        "module": ExpandableField(lambda: ModuleSerializer, "module"),
+        "user_url": ExpandableField(lambda: UserSerializer, "user"),
+        "report_set": ExpandableField(lambda: ReportSerializer, "report_set", many=True),
+    }
+    REACTION_STATE_FIELD_NAMES: Final[frozenset[str]] = frozenset(
+        {
+            "liked_by_me",
+            "disliked_by_me",
+            "overall_likes_count",
+            "likes_count",
+            "dislikes_count",
+        },
+    )
+    DISPLAY_DETAILS_FIELD_NAMES: Final[frozenset[str]] = frozenset(
+        {"user_display", "is_user_suspicious"},
+    )
+
     user_display: serializers.CharField = serializers.CharField(
         read_only=True,
         source="display_user",
     )
     liked_by_me: serializers.SerializerMethodField = serializers.SerializerMethodField()
     disliked_by_me: serializers.SerializerMethodField = serializers.SerializerMethodField()
+    overall_likes_count: serializers.SerializerMethodField = (
+        serializers.SerializerMethodField()
+    )
+    likes_count: serializers.SerializerMethodField = serializers.SerializerMethodField()
+    dislikes_count: serializers.SerializerMethodField = serializers.SerializerMethodField()
     user_url: HyperlinkedRelatedField[User] = HyperlinkedRelatedField(
         view_name="api_rest:user-detail",
         source="user",
@@ -461,40 +442,80 @@ class PostSerializer(HyperlinkedModelSerializer):
             allow_null=allow_null,
         )
 
-        if not self.context["request"].user.is_staff:
-            STAFF_FIELD_NAMES: Final[Iterable[str]] = (
-                "user_url",
-                "likes_count",
-                "dislikes_count",
-                "liked_user_set",
-                "disliked_user_set",
-                "report_set",
-                "hidden",
-            )
-            staff_field_name: str
-            for staff_field_name in STAFF_FIELD_NAMES:
-                self.fields.pop(staff_field_name, None)
+        self._fetched_reaction_states: dict[int, PostReactionState] = {}
+
+    @override
+    def prepare_queryset(self, queryset: QuerySet[Post]) -> QuerySet[Post]:  # type: ignore[override]
+        """
+        Prefetch & annotate everything needed to serialize the posts of the given queryset.
+
+        The reaction state & creator details are only annotated
+        if a field that needs them is included.
+        """
+        queryset = super().prepare_queryset(queryset)  # type: ignore[arg-type,assignment]
+
+        if self.fields.keys() & self.DISPLAY_DETAILS_FIELD_NAMES:
+            queryset = Post.annotate_display_details(queryset)
+
+        if self.fields.keys() & self.REACTION_STATE_FIELD_NAMES:
+            queryset = annotate_post_reaction_state(queryset, self.context["request"].user)
+
+        return queryset
+
+    def _get_reaction_state(self, obj: Post) -> PostReactionState:
+        """
+        Return the reaction state of a post, from its annotations if it has any.
+
+        Posts that were not retrieved with `annotate_post_reaction_state()`
+        (E.g. newly created posts) have their reaction state fetched with one query.
+        """
+        try:
+            return obj.reaction_state
+        except AttributeError:
+            pass
+
+        if obj.pk not in self._fetched_reaction_states:
+            self._fetched_reaction_states[obj.pk] = annotate_post_reaction_state(
+                Post.objects.filter(pk=obj.pk),
+                self.context["request"].user,
+            ).get().reaction_state
+
+        return self._fetched_reaction_states[obj.pk]
 
     # noinspection PyOverrides
     @override
     def get_liked_by_me(self, obj: Post) -> bool:  # type: ignore[misc]
-        if not self.context["request"].user.is_authenticated:
-            return False
-
-        return self.context["request"].user in obj.liked_user_set.all()
+        return self._get_reaction_state(obj).liked_by_user
 
     # noinspection PyOverrides
     @override
     def get_disliked_by_me(self, obj: Post) -> bool:  # type: ignore[misc]
-        if not self.context["request"].user.is_authenticated:
-            return False
+        return self._get_reaction_state(obj).disliked_by_user
 
-        return self.context["request"].user in obj.disliked_user_set.all()
+    # noinspection PyOverrides
+    @override
+    def get_overall_likes_count(self, obj: Post) -> int:  # type: ignore[misc]
+        return self._get_reaction_state(obj).overall_likes_count
 
+    # noinspection PyOverrides
+    @override
+    def get_likes_count(self, obj: Post) -> int:  # type: ignore[misc]
+        return self._get_reaction_state(obj).likes_count
 
-class ReportSerializer(HyperlinkedModelSerializer):
+    # noinspection PyOverrides
+    @override
+    def get_dislikes_count(self, obj: Post) -> int:  # type: ignore[misc]
+        return self._get_reaction_state(obj).dislikes_count
+
+
+class ReportSerializer(SparseFieldsetSerializerMixin, HyperlinkedModelSerializer):
     """A class for serializing reports."""
 
+    EXPANDABLE_FIELDS = {  # noqa: RUF012
+        "post": ExpandableField(lambda: PostSerializer, "post"),
+        "reporter": ExpandableField(lambda: UserSerializer, "reporter"),
+    }
+
     class Meta:  # noqa: D106
         model = Report
         # noinspection PyUnresolvedReferences
@@ -512,3 +533,90 @@ class ReportSerializer(HyperlinkedModelSerializer):
             "post": {"view_name": "api_rest:post-detail"},
             "reporter": {"view_name": "api_rest:user-detail"},
         }
+
+
+class DateRangeSerializer(serializers.Serializer):  # type: ignore[type-arg]
+    """A class for validating an (inclusive) range of dates given as query parameters."""
+
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+
+    @override
+    def validate(self, attrs: dict[str, object]) -> dict[str, object]:
+        date_from: object = attrs.get("date_from")
+        date_to: object = attrs.get("date_to")
+        if date_from is not None and date_to is not None and date_from > date_to:  # type: ignore[operator]
+            raise serializers.ValidationError(
+                {"date_to": "Must not be before date_from."},
+                code="invalid",
+            )
+
+        return attrs
+
+
+class PostFiltersSerializer(DateRangeSerializer):
+    """
+    A class for validating the query parameters that posts can be filtered by.
+
+    Combinations of filters that cannot be answered using an index are rejected,
+    unless `REQUIRE_INDEXED_FILTERS` is turned off.
+    """
+
+    REQUIRE_INDEXED_FILTERS: ClassVar[bool] = True
+
+    module = serializers.PrimaryKeyRelatedField(queryset=Module.objects.all(), required=False)
+    university = serializers.PrimaryKeyRelatedField(
+        queryset=University.objects.all(),
+        required=False,
+    )
+    overall_rating = serializers.ChoiceField(choices=Post.Ratings.choices, required=False)
+    difficulty_rating = serializers.ChoiceField(choices=Post.Ratings.choices, required=False)
+    assessment_rating = serializers.ChoiceField(choices=Post.Ratings.choices, required=False)
+    teaching_rating = serializers.ChoiceField(choices=Post.Ratings.choices, required=False)
+    academic_year_start = serializers.IntegerField(required=False)
+    tags = serializers.CharField(source="tag_names", required=False)
+    q = serializers.CharField(source="search", required=False, trim_whitespace=False)
+
+    def validate_tags(self, value: str) -> tuple[str, ...]:
+        """Split the comma separated list of tag names."""
+        return tuple(tag.strip() for tag in value.split(",") if tag.strip())
+
+    @override
+    def validate(self, attrs: dict[str, object]) -> dict[str, object]:
+        attrs = super().validate(attrs)
+
+        if self.REQUIRE_INDEXED_FILTERS:
+            try:
+                self.to_post_filters(attrs).ensure_indexed()
+            except UnindexedPostFiltersError as unindexed_post_filters_error:
+                raise serializers.ValidationError(
+                    str(unindexed_post_filters_error),
+                    code="unindexed",
+                ) from unindexed_post_filters_error
+
+        return attrs
+
+    def to_post_filters(self, attrs: dict[str, object] | None = None) -> PostFilters:
+        """Build the post filters from the given (or else the validated) query parameters."""
+        if attrs is None:
+            attrs = self.validated_data
+
+        return PostFilters(
+            **{  # type: ignore[arg-type]
+                field_name: value
+                for field_name, value in attrs.items()
+                if field_name in PostFilters._fields
+            },
+        )
+
+
+class PostExportFiltersSerializer(PostFiltersSerializer):
+    """
+    A class for validating the query parameters of post exports.
+
+    Exports read every matching post in a single pass, so unindexed filters are allowed.
+    """
+
+    REQUIRE_INDEXED_FILTERS = False
+
+    file_format = serializers.ChoiceField(choices=POST_EXPORT_FILE_FORMATS, default="jsonl")
@@ -6,14 +6,15 @@ __all__: Sequence[str] = (
     "RelatedToolTagField",
     "RelatedTopicTagField",
     "RelatedOtherTagField",
+    "UserUniversityField",
 )
 
 from typing import override
 
 from django.db.models import QuerySet
-from rest_framework.relations import SlugRelatedField
+from rest_framework.relations import HyperlinkedRelatedField, PKOnlyObject, SlugRelatedField
 
-from ratemymodule.models import OtherTag, ToolTag, TopicTag
+from ratemymodule.models import OtherTag, ToolTag, TopicTag, University, User
 
 
 class RelatedToolTagField(SlugRelatedField[ToolTag]):
@@ -53,3 +54,19 @@ class RelatedOtherTagField(SlugRelatedField[OtherTag]):
             return OtherTag.objects.filter(is_verified=True)
 
         return OtherTag.objects.all()
+
+
+class UserUniversityField(HyperlinkedRelatedField[University]):
+    """Field for displaying a User's university, matched by their email domain."""
+
+    # noinspection PyOverrides
+    @override
+    def get_attribute(self, instance: User) -> PKOnlyObject | University | None:  # type: ignore[override]
+        """Return the user's university, using its annotated primary key if there is one."""
+        if "annotated_university_pk" not in instance.__dict__:
+            return super().get_attribute(instance)  # type: ignore[no-any-return]
+
+        if instance.annotated_university_pk is None:  # type: ignore[attr-defined]
+            return None
+
+        return PKOnlyObject(pk=instance.annotated_university_pk)  # type: ignore[attr-defined]
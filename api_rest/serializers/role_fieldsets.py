@@ -0,0 +1,95 @@
+"""Per-role caching of the fields that REST API serializers make available."""
+
+from collections.abc import Sequence
+
+__all__: Sequence[str] = ("UserRole", "RoleFieldsetSerializerMixin", "get_user_role")
+
+import copy
+import enum
+from collections.abc import Collection
+from typing import TYPE_CHECKING, ClassVar, override
+
+from rest_framework.serializers import Serializer
+
+if TYPE_CHECKING:
+    from django.contrib.auth.models import AnonymousUser
+    from rest_framework.fields import Field
+    from rest_framework.request import Request
+
+    from ratemymodule.models import User
+
+
+class UserRole(enum.Enum):
+    """Enum of the roles that determine which serializer fields a user can see."""
+
+    ANONYMOUS = "anonymous"
+    AUTHENTICATED = "authenticated"
+    STAFF = "staff"
+    SUPERUSER = "superuser"
+
+
+def get_user_role(user: "User | AnonymousUser") -> UserRole:
+    """
+    Return the most privileged role of the given user.
+
+    Both the superuser & staff roles require the user to be a staff member,
+    so a superuser that is not a staff member only sees the fields of an authenticated user.
+    """
+    if not user.is_authenticated:
+        return UserRole.ANONYMOUS
+
+    if user.is_superuser and user.is_staff:
+        return UserRole.SUPERUSER
+
+    if user.is_staff:
+        return UserRole.STAFF
+
+    return UserRole.AUTHENTICATED
+
+
+class RoleFieldsetSerializerMixin(Serializer):  # type: ignore[type-arg]
+    """
+    Serializer mixin that hides staff & superuser-only fields from less privileged users.
+
+    The fields available to each role are only built (with DRF's model introspection)
+    the first time that role is serialized for, then copied from a class-level cache.
+    """
+
+    STAFF_FIELD_NAMES: ClassVar[Collection[str]] = ()
+    SUPERUSER_FIELD_NAMES: ClassVar[Collection[str]] = ()
+
+    _role_fields_cache: ClassVar[dict[UserRole, dict[str, "Field"]]]  # type: ignore[type-arg]
+
+    @override
+    def __init_subclass__(cls, **kwargs: object) -> None:
+        super().__init_subclass__(**kwargs)
+
+        cls._role_fields_cache = {}
+
+    def get_hidden_field_names(self, role: UserRole) -> Collection[str]:
+        """Return the names of the fields that users with the given role cannot see."""
+        if role is UserRole.SUPERUSER:
+            return ()
+
+        if role is UserRole.STAFF:
+            return self.SUPERUSER_FIELD_NAMES
+
+        return {*self.STAFF_FIELD_NAMES, *self.SUPERUSER_FIELD_NAMES}
+
+    @override
+    def get_fields(self) -> dict[str, "Field"]:  # type: ignore[type-arg]
+        request: Request | None = self.context.get("request")
+        role: UserRole = get_user_role(request.user) if request is not None else UserRole.ANONYMOUS  # noqa: E501
+
+        role_fields: dict[str, Field] | None = self._role_fields_cache.get(role)  # type: ignore[type-arg]
+        if role_fields is None:
+            role_fields = super().get_fields()
+
+            hidden_field_name: str
+            for hidden_field_name in self.get_hidden_field_names(role):
+                role_fields.pop(hidden_field_name, None)
+
+            self._role_fields_cache[role] = role_fields
+
+        # NOTE: Fields get bound to the serializer instance they are used by, so each instance needs its own copies
+        return copy.deepcopy(role_fields)
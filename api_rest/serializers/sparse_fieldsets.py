@@ -0,0 +1,192 @@
+"""
+Sparse fieldsets & inline expansion of related resources, for REST API serializers.
+
+Clients can choose which fields are serialized with the `fields` & `omit` GET parameters
+(E.g. `?fields=url,name` or `?omit=post_set`),
+& can replace a related resource's hyperlink with its full representation
+with the `expand` GET parameter (E.g. `?expand=module`).
+The fields of an expanded resource can be chosen by prefixing them with its field name
+(E.g. `?expand=module&fields=url,module,module.name`).
+"""
+
+from collections.abc import Sequence
+
+__all__: Sequence[str] = (
+    "ExpandableField",
+    "PrefetchedField",
+    "SparseFieldsetSerializerMixin",
+)
+
+from collections.abc import Callable, Mapping
+from typing import TYPE_CHECKING, ClassVar, NamedTuple, override
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Model, Prefetch, QuerySet
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.serializers import ListSerializer, Serializer
+
+from .role_fieldsets import RoleFieldsetSerializerMixin
+
+if TYPE_CHECKING:
+    from rest_framework.fields import Field
+    from rest_framework.request import Request
+
+
+class PrefetchedField(NamedTuple):
+    """A related field, whose related objects are all fetched with one query per page."""
+
+    lookup: str
+    only_fields: tuple[str, ...] = ("pk",)
+
+
+class ExpandableField(NamedTuple):
+    """A related field that can be replaced by the full representation of its objects."""
+
+    get_serializer_class: Callable[[], type["SparseFieldsetSerializerMixin"]]
+    lookup: str
+    many: bool = False
+
+
+def _get_requested_field_names(request: "Request", query_param: str, field_name_prefix: str) -> set[str]:  # noqa: E501
+    field_names: set[str] = set()
+
+    raw_field_name: str
+    for raw_field_name in request.query_params.get(query_param, "").split(","):
+        field_name: str = raw_field_name.strip()
+        if not field_name.startswith(field_name_prefix):
+            continue
+
+        field_name = field_name.removeprefix(field_name_prefix)
+        if field_name and "." not in field_name:
+            field_names.add(field_name)
+
+    return field_names
+
+
+class SparseFieldsetSerializerMixin(RoleFieldsetSerializerMixin):
+    """
+    Serializer mixin that honours the `fields`, `omit` & `expand` GET parameters.
+
+    The requested fields are chosen from the fields available to the requesting user's role.
+    Fields that were not requested are removed before any values are computed,
+    & `prepare_queryset()` only prefetches the related objects of the remaining fields
+    (including the related objects of any expanded fields).
+    Only the top-level resource's fields can be expanded,
+    & the parameters are ignored by write (non-safe) requests.
+    """
+
+    PREFETCHED_FIELDS: ClassVar[Mapping[str, PrefetchedField]] = {}
+    EXPANDABLE_FIELDS: ClassVar[Mapping[str, ExpandableField]] = {}
+
+    # NOTE: Nested serializers share their root serializer's context, so the prefix of an expanded resource's field names is stored on the nested serializer itself
+    field_name_prefix: str = ""
+
+    @override
+    def get_fields(self) -> dict[str, "Field"]:  # type: ignore[type-arg]
+        fields: dict[str, Field] = super().get_fields()  # type: ignore[type-arg]
+
+        request: Request | None = self.context.get("request")
+
+        # NOTE: Write requests must always be validated against every writable field, so only the responses of safe requests can be sparse or expanded
+        if request is None or request.method not in SAFE_METHODS:
+            return fields
+
+        requested_field_names: set[str] = _get_requested_field_names(
+            request,
+            "fields",
+            self.field_name_prefix,
+        )
+        omitted_field_names: set[str] = _get_requested_field_names(
+            request,
+            "omit",
+            self.field_name_prefix,
+        )
+        expanded_field_names: set[str] = (
+            _get_requested_field_names(request, "expand", "") & self.EXPANDABLE_FIELDS.keys()
+            if not self.field_name_prefix
+            else set()
+        )
+
+        if requested_field_names:
+            fields = {
+                field_name: field
+                for field_name, field in fields.items()
+                if field_name in requested_field_names | expanded_field_names
+            }
+
+        omitted_field_name: str
+        for omitted_field_name in omitted_field_names:
+            fields.pop(omitted_field_name, None)
+
+        expanded_field_name: str
+        for expanded_field_name in expanded_field_names & fields.keys():
+            expandable_field: ExpandableField = self.EXPANDABLE_FIELDS[expanded_field_name]
+            expanded_field: Serializer = expandable_field.get_serializer_class()(  # type: ignore[type-arg]
+                many=expandable_field.many,
+                read_only=True,
+                context=self.context,
+                **(
+                    {"source": expandable_field.lookup}
+                    if expandable_field.lookup != expanded_field_name
+                    else {}
+                ),
+            )
+
+            nested_serializer: SparseFieldsetSerializerMixin = (
+                expanded_field.child  # type: ignore[assignment]
+                if isinstance(expanded_field, ListSerializer)
+                else expanded_field
+            )
+            nested_serializer.field_name_prefix = f"{expanded_field_name}."
+
+            fields[expanded_field_name] = expanded_field
+
+        return fields
+
+    def get_prefetches(self) -> list[Prefetch]:  # type: ignore[type-arg]
+        """Return the prefetches needed to serialize the currently included fields."""
+        model: type[Model] = self.Meta.model
+        prefetches: list[Prefetch] = []  # type: ignore[type-arg]
+
+        field_name: str
+        field: Field  # type: ignore[type-arg]
+        for field_name, field in self.fields.items():
+            nested_serializer: object = (
+                field.child if isinstance(field, ListSerializer) else field
+            )
+
+            if isinstance(nested_serializer, SparseFieldsetSerializerMixin):
+                prefetches.append(
+                    Prefetch(
+                        self.EXPANDABLE_FIELDS[field_name].lookup,
+                        queryset=nested_serializer.prepare_queryset(
+                            nested_serializer.Meta.model._default_manager.all(),
+                        ),
+                    ),
+                )
+
+            elif field_name in self.PREFETCHED_FIELDS:
+                prefetched_field: PrefetchedField = self.PREFETCHED_FIELDS[field_name]
+                try:
+                    related_model: type[Model] = model._meta.get_field(  # type: ignore[assignment]
+                        prefetched_field.lookup,
+                    ).related_model
+                except FieldDoesNotExist:
+                    # NOTE: Prefetchable managers that are not model fields (E.g. `University.module_set`) fetch their own related objects
+                    prefetches.append(Prefetch(prefetched_field.lookup))
+                    continue
+
+                prefetches.append(
+                    Prefetch(
+                        prefetched_field.lookup,
+                        queryset=related_model._default_manager.only(
+                            *prefetched_field.only_fields,
+                        ),
+                    ),
+                )
+
+        return prefetches
+
+    def prepare_queryset(self, queryset: QuerySet[Model]) -> QuerySet[Model]:
+        """Prefetch everything needed to serialize the objects of the given queryset."""
+        return queryset.prefetch_related(*self.get_prefetches())
@@ -0,0 +1,72 @@
+"""Test suite for the conditional GET handling of the REST API's list views."""
+
+from collections.abc import Sequence
+
+__all__: Sequence[str] = ()
+
+from typing import TYPE_CHECKING
+
+import django.urls
+from django.test import override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from api_rest.views import PostViewSet
+from ratemymodule.tests.utils import TestCase
+from ratemymodule.utils.benchmarks import seed_benchmark_data
+
+if TYPE_CHECKING:
+    from django.http import HttpResponseBase
+    from rest_framework.request import Request
+
+    from ratemymodule.utils.benchmarks import BenchmarkData
+
+
+@override_settings(DATA_VERSIONS_ENABLED=True)
+class ConditionalListTests(TestCase):
+    @staticmethod
+    def _list_posts(data: "BenchmarkData", **headers: str) -> "HttpResponseBase":
+        request: Request = APIRequestFactory().get(
+            django.urls.reverse("api_rest:post-list"),
+            headers=headers,
+        )
+        force_authenticate(request, user=data.staff_user)
+        return PostViewSet.as_view({"get": "list"})(request)  # type: ignore[no-any-return]
+
+    def test_unchanged_posts_are_not_modified(self) -> None:
+        data: BenchmarkData = seed_benchmark_data(1)
+
+        response: HttpResponseBase = self._list_posts(data)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["ETag"].startswith("W/\""))
+        self.assertIn("Last-Modified", response)
+
+        with self.assertNumQueries(0):
+            not_modified_response: HttpResponseBase = self._list_posts(
+                data,
+                If_None_Match=response["ETag"],
+            )
+
+        self.assertEqual(not_modified_response.status_code, 304)
+        self.assertEqual(not_modified_response["ETag"], response["ETag"])
+
+    def test_changed_posts_are_listed_again(self) -> None:
+        data: BenchmarkData = seed_benchmark_data(1)
+        etag: str = self._list_posts(data)["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            data.post.content = "Updated content."
+            data.post.save()
+
+        response: HttpResponseBase = self._list_posts(data, If_None_Match=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    @override_settings(DATA_VERSIONS_ENABLED=False)
+    def test_process_local_data_versions_are_not_used(self) -> None:
+        data: BenchmarkData = seed_benchmark_data(1)
+
+        response: HttpResponseBase = self._list_posts(data, If_None_Match="*")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("ETag", response)
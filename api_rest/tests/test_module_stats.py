@@ -0,0 +1,80 @@
+"""Test suite for the aggregated rating statistics of the REST API's modules."""
+
+from collections.abc import Sequence
+
+__all__: Sequence[str] = ()
+
+from typing import TYPE_CHECKING
+
+import django.urls
+from django.db.models import Avg
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from api_rest.views import ModuleViewSet
+from ratemymodule.tests.utils import TestCase
+from ratemymodule.utils.benchmarks import seed_benchmark_data
+
+if TYPE_CHECKING:
+    import datetime
+
+    from rest_framework.request import Request
+    from rest_framework.response import Response
+
+    from ratemymodule.utils.benchmarks import BenchmarkData
+
+
+class ModuleStatsTests(TestCase):
+    @staticmethod
+    def _get_module_stats(data: "BenchmarkData", query_string: str = "") -> "Response":
+        request: Request = APIRequestFactory().get(
+            f"{django.urls.reverse("api_rest:module-stats", kwargs={"pk": data.module.pk})}"
+            f"?{query_string}",
+        )
+        force_authenticate(request, user=data.staff_user)
+        response: Response = ModuleViewSet.as_view({"get": "stats"})(
+            request,
+            pk=str(data.module.pk),
+        )
+        response.render()
+        return response
+
+    def test_stats_match_the_module_posts(self) -> None:
+        data: BenchmarkData = seed_benchmark_data(1)
+
+        with self.assertNumQueries(3):
+            response: Response = self._get_module_stats(data)
+
+        self.assertEqual(response.data["posts_count"], data.module.post_set.count())
+        self.assertEqual(
+            response.data["ratings"]["overall_rating"]["counts"],
+            tuple(
+                data.module.post_set.filter(overall_rating=rating).count()
+                for rating in range(1, 6)
+            ),
+        )
+        self.assertAlmostEqual(
+            response.data["ratings"]["overall_rating"]["average"],
+            data.module.post_set.aggregate(average=Avg("overall_rating"))["average"],
+        )
+        self.assertEqual(
+            sum(monthly_stats["posts_count"] for monthly_stats in response.data["monthly"]),
+            response.data["posts_count"],
+        )
+
+    def test_stats_are_limited_to_the_date_range(self) -> None:
+        data: BenchmarkData = seed_benchmark_data(1)
+        date: datetime.date = data.post.date_time_posted.date()
+
+        response: Response = self._get_module_stats(
+            data,
+            f"date_from={date.isoformat()}&date_to={date.isoformat()}",
+        )
+
+        self.assertEqual(
+            response.data["posts_count"],
+            data.module.post_set.filter(date_time_created__date=date).count(),
+        )
+        self.assertEqual(
+            [monthly_stats["month"] for monthly_stats in response.data["monthly"]],
+            [date.strftime("%Y-%m")],
+        )
@@ -0,0 +1,53 @@
+"""Test suite for the cursor pagination of the REST API's viewsets."""
+
+from collections.abc import Sequence
+
+__all__: Sequence[str] = ()
+
+from typing import TYPE_CHECKING
+
+import django.urls
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from api_rest.views import PostViewSet
+from ratemymodule.tests.utils import TestCase
+from ratemymodule.utils.benchmarks import seed_benchmark_data
+
+if TYPE_CHECKING:
+    from rest_framework.request import Request
+    from rest_framework.response import Response
+
+    from ratemymodule.utils.benchmarks import BenchmarkData
+
+
+class CursorPaginationTests(TestCase):
+    @staticmethod
+    def _list_posts(data: "BenchmarkData", url: str) -> "Response":
+        request: Request = APIRequestFactory().get(url)
+        force_authenticate(request, user=data.staff_user)
+        return PostViewSet.as_view({"get": "list"})(request)  # type: ignore[no-any-return]
+
+    def test_post_list_pages_cover_every_post_once(self) -> None:
+        data: BenchmarkData = seed_benchmark_data(1)
+
+        unpaginated_response: Response = self._list_posts(
+            data,
+            f"{django.urls.reverse("api_rest:post-list")}?page_size=200",
+        )
+        all_post_urls: list[str] = [
+            post["url"] for post in unpaginated_response.data["results"]
+        ]
+        self.assertIsNone(unpaginated_response.data["next"])
+        self.assertGreater(len(all_post_urls), 5)
+
+        paginated_post_urls: list[str] = []
+        next_url: str | None = f"{django.urls.reverse("api_rest:post-list")}?page_size=5"
+        while next_url is not None:
+            response: Response = self._list_posts(data, next_url)
+            self.assertLessEqual(len(response.data["results"]), 5)
+            self.assertNotIn("count", response.data)
+
+            paginated_post_urls.extend(post["url"] for post in response.data["results"])
+            next_url = response.data["next"]
+
+        self.assertEqual(paginated_post_urls, all_post_urls)
@@ -0,0 +1,76 @@
+"""Test suite for the streaming post export of the REST API."""
+
+from collections.abc import Sequence
+
+__all__: Sequence[str] = ()
+
+import csv
+import io
+import json
+from typing import TYPE_CHECKING
+
+import django.urls
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from api_rest.views import PostViewSet
+from ratemymodule.models import Post
+from ratemymodule.tests.utils import TestCase
+from ratemymodule.utils.benchmarks import seed_benchmark_data
+from ratemymodule.utils.post_export import POST_EXPORT_COLUMNS
+
+if TYPE_CHECKING:
+    from django.http import StreamingHttpResponse
+    from rest_framework.request import Request
+
+    from ratemymodule.utils.benchmarks import BenchmarkData
+
+
+class PostExportTests(TestCase):
+    @staticmethod
+    def _export_posts(data: "BenchmarkData", query_string: str = "") -> "StreamingHttpResponse":  # noqa: E501
+        request: Request = APIRequestFactory().get(
+            f"{django.urls.reverse("api_rest:post-export")}?{query_string}",
+        )
+        force_authenticate(request, user=data.staff_user)
+        return PostViewSet.as_view({"get": "export"})(request)  # type: ignore[no-any-return]
+
+    def test_posts_are_streamed_as_json_lines(self) -> None:
+        data: BenchmarkData = seed_benchmark_data(1)
+
+        response: StreamingHttpResponse = self._export_posts(data, f"module={data.module.pk}")
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson; charset=utf-8")
+
+        with self.assertNumQueries(1):
+            rows: list[dict[str, object]] = [
+                json.loads(line) for line in b"".join(response.streaming_content).splitlines()
+            ]
+
+        self.assertEqual(
+            [row["id"] for row in rows],
+            list(data.module.post_set.order_by("pk").values_list("pk", flat=True)),
+        )
+        self.assertEqual(set(rows[0]), set(POST_EXPORT_COLUMNS))
+        self.assertEqual(rows[0]["module"], data.module.code)
+
+    def test_posts_are_streamed_as_csv(self) -> None:
+        data: BenchmarkData = seed_benchmark_data(1)
+
+        response: StreamingHttpResponse = self._export_posts(data, "file_format=csv")
+        rows: list[dict[str, str]] = list(
+            csv.DictReader(io.StringIO(b"".join(response.streaming_content).decode())),
+        )
+
+        self.assertEqual(len(rows), Post.objects.count())
+        self.assertEqual(tuple(rows[0]), POST_EXPORT_COLUMNS)
+
+    def test_invalid_date_range_is_rejected(self) -> None:
+        data: BenchmarkData = seed_benchmark_data(1)
+
+        response: StreamingHttpResponse = self._export_posts(
+            data,
+            "date_from=2020-01-02&date_to=2020-01-01",
+        )
+
+        self.assertEqual(response.status_code, 400)
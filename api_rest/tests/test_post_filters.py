@@ -0,0 +1,84 @@
+"""Test suite for the query parameter filtering of the REST API's list of posts."""
+
+from collections.abc import Sequence
+
+__all__: Sequence[str] = ()
+
+from typing import TYPE_CHECKING
+from urllib.parse import urlencode
+
+import django.urls
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from api_rest.views import PostViewSet
+from ratemymodule.models import ToolTag
+from ratemymodule.tests.utils import TestCase
+from ratemymodule.utils.benchmarks import seed_benchmark_data
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from rest_framework.request import Request
+    from rest_framework.response import Response
+
+    from ratemymodule.utils.benchmarks import BenchmarkData
+
+
+class PostFiltersTests(TestCase):
+    @staticmethod
+    def _list_posts(data: "BenchmarkData", query_params: "Mapping[str, object]") -> "Response":
+        request: Request = APIRequestFactory().get(
+            f"{django.urls.reverse("api_rest:post-list")}?{urlencode(query_params)}",
+        )
+        force_authenticate(request, user=data.student)
+        response: Response = PostViewSet.as_view({"get": "list"})(request)
+        response.render()
+        return response
+
+    def test_posts_are_filtered_by_module_ratings_year_and_tags(self) -> None:
+        data: BenchmarkData = seed_benchmark_data(1)
+        tag: ToolTag = ToolTag.objects.filter(post_set=data.post).first()  # type: ignore[assignment]
+
+        response: Response = self._list_posts(
+            data,
+            {
+                "module": data.module.pk,
+                "overall_rating": data.post.overall_rating,
+                "academic_year_start": data.post.academic_year_start,
+                "tags": tag.name,
+                "fields": "url",
+            },
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            len(response.data["results"]),
+            data.module.post_set.filter(
+                overall_rating=data.post.overall_rating,
+                academic_year_start=data.post.academic_year_start,
+                tool_tag_set=tag,
+                hidden=False,
+            ).count(),
+        )
+        self.assertIn(
+            django.urls.reverse("api_rest:post-detail", kwargs={"pk": data.post.pk}),
+            {
+                post["url"].removeprefix("http://testserver")
+                for post in response.data["results"]
+            },
+        )
+
+    def test_unindexed_filters_are_rejected(self) -> None:
+        data: BenchmarkData = seed_benchmark_data(1)
+
+        with self.subTest("rating without module"):
+            self.assertEqual(self._list_posts(data, {"overall_rating": 3}).status_code, 400)
+
+        with self.subTest("search without module"):
+            self.assertEqual(
+                self._list_posts(
+                    data,
+                    {"university": data.university.pk, "q": "module"},
+                ).status_code,
+                400,
+            )
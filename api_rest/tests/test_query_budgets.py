@@ -0,0 +1,60 @@
+"""Test suite for the SQL query budgets of the REST API's viewsets."""
+
+from collections.abc import Sequence
+
+__all__: Sequence[str] = ()
+
+from typing import TYPE_CHECKING
+
+import django.urls
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from api_rest.views import UserViewSet
+from ratemymodule.models import User
+from ratemymodule.tests.utils import TestCase
+from ratemymodule.utils.benchmarks import REST_BENCHMARK_ENDPOINTS, seed_benchmark_data
+
+if TYPE_CHECKING:
+    from rest_framework.request import Request
+    from rest_framework.response import Response
+
+    from ratemymodule.models import University
+    from ratemymodule.utils.benchmarks import BenchmarkData
+
+
+class RESTQueryBudgetTests(TestCase):
+    def test_viewsets_within_query_budgets(self) -> None:
+        self.assertEndpointsWithinQueryBudgets(REST_BENCHMARK_ENDPOINTS)
+
+    def test_annotated_user_universities_match_email_domains(self) -> None:
+        data: BenchmarkData = seed_benchmark_data(1)
+        request: Request = APIRequestFactory().get(
+            f"{django.urls.reverse("api_rest:user-list")}?fields=email,university",
+        )
+        force_authenticate(request, user=data.staff_user)
+
+        response: Response = UserViewSet.as_view({"get": "list"})(request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data["results"])
+
+        serialized_user: dict[str, str | None]
+        for serialized_user in response.data["results"]:
+            with self.subTest(serialized_user=serialized_user):
+                university: University | None = User.objects.get(
+                    email=serialized_user["email"],
+                ).university
+
+                self.assertEqual(
+                    serialized_user["university"],
+                    (
+                        request.build_absolute_uri(
+                            django.urls.reverse(
+                                "api_rest:university-detail",
+                                args=(university.pk,),
+                            ),
+                        )
+                        if university is not None
+                        else None
+                    ),
+                )
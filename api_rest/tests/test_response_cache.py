@@ -0,0 +1,65 @@
+"""Test suite for the read-through response cache of the REST API's catalogue views."""
+
+from collections.abc import Sequence
+
+__all__: Sequence[str] = ()
+
+from typing import TYPE_CHECKING
+
+import django.urls
+from django.contrib.auth.models import AnonymousUser
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from api_rest.views import ModuleViewSet
+from ratemymodule.tests.utils import TestCase
+from ratemymodule.utils.benchmarks import seed_benchmark_data
+
+if TYPE_CHECKING:
+    from rest_framework.request import Request
+    from rest_framework.response import Response
+
+    from ratemymodule.models import User
+    from ratemymodule.utils.benchmarks import BenchmarkData
+
+
+@override_settings(DATA_VERSIONS_ENABLED=True)
+class ResponseCacheTests(TestCase):
+    @staticmethod
+    def _list_modules(user: "User | AnonymousUser") -> "Response":
+        request: Request = APIRequestFactory().get(django.urls.reverse("api_rest:module-list"))
+        force_authenticate(request, user=user)
+        response: Response = ModuleViewSet.as_view({"get": "list"})(request)
+        response.render()
+        return response
+
+    def test_repeated_anonymous_requests_are_served_from_the_cache(self) -> None:
+        seed_benchmark_data(1)
+        response: Response = self._list_modules(AnonymousUser())
+
+        with self.assertNumQueries(0):
+            cached_response: Response = self._list_modules(AnonymousUser())
+
+        self.assertEqual(cached_response.status_code, 200)
+        self.assertEqual(cached_response.content, response.content)
+
+    def test_changed_modules_are_serialized_again(self) -> None:
+        data: BenchmarkData = seed_benchmark_data(1)
+        self._list_modules(AnonymousUser())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            data.module.name = "Renamed Module"
+            data.module.save()
+
+        self.assertIn(b"Renamed Module", self._list_modules(AnonymousUser()).content)
+
+    def test_staff_requests_bypass_the_cache(self) -> None:
+        data: BenchmarkData = seed_benchmark_data(1)
+        self._list_modules(data.staff_user)
+
+        with CaptureQueriesContext(connection) as captured_queries:
+            self._list_modules(data.staff_user)
+
+        self.assertGreater(len(captured_queries), 0)
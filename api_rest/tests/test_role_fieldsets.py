@@ -0,0 +1,90 @@
+"""Test suite for the per-role field caching of the REST API's serializers."""
+
+from collections.abc import Sequence
+
+__all__: Sequence[str] = ()
+
+from unittest import mock
+
+from django.contrib.auth.models import AnonymousUser
+from rest_framework.request import Request
+from rest_framework.serializers import HyperlinkedModelSerializer
+from rest_framework.test import APIRequestFactory
+
+from api_rest.serializers import UserSerializer
+from api_rest.serializers.role_fieldsets import UserRole, get_user_role
+from ratemymodule.models import User
+from ratemymodule.tests.utils import TestCase, TestDataGenerator
+
+
+class RoleFieldsetTests(TestCase):
+    @staticmethod
+    def _create_request(user: User | AnonymousUser) -> Request:
+        request: Request = Request(APIRequestFactory().get("/"))
+        request.user = user
+        return request
+
+    def test_fields_are_only_built_once_per_role(self) -> None:
+        UserSerializer._role_fields_cache.clear()  # noqa: SLF001
+        staff_request: Request = self._create_request(
+            User.objects.create_user(
+                email=TestDataGenerator.create_user_email(),
+                is_staff=True,
+            ),
+        )
+
+        with mock.patch.object(
+            HyperlinkedModelSerializer,
+            "get_fields",
+            autospec=True,
+            side_effect=HyperlinkedModelSerializer.get_fields,
+        ) as mock_get_fields:
+            first_serializer: UserSerializer = UserSerializer(
+                context={"request": staff_request},
+            )
+            second_serializer: UserSerializer = UserSerializer(
+                context={"request": staff_request},
+            )
+
+            self.assertEqual(first_serializer.fields.keys(), second_serializer.fields.keys())
+            self.assertIsNot(first_serializer.fields["url"], second_serializer.fields["url"])
+            mock_get_fields.assert_called_once()
+
+        self.assertEqual(UserSerializer._role_fields_cache.keys(), {UserRole.STAFF})  # noqa: SLF001
+
+    def test_privileged_fields_are_hidden_from_other_roles(self) -> None:
+        staff_fields: set[str] = set(
+            UserSerializer(
+                context={
+                    "request": self._create_request(
+                        User.objects.create_user(
+                            email=TestDataGenerator.create_user_email(),
+                            is_staff=True,
+                        ),
+                    ),
+                },
+            ).fields,
+        )
+        anonymous_fields: set[str] = set(
+            UserSerializer(context={"request": self._create_request(AnonymousUser())}).fields,
+        )
+
+        self.assertIn("password_hash", staff_fields)
+        self.assertNotIn("is_superuser", staff_fields)
+        self.assertFalse(
+            anonymous_fields & {*UserSerializer.STAFF_FIELD_NAMES, *UserSerializer.SUPERUSER_FIELD_NAMES},  # noqa: E501
+        )
+
+    def test_non_staff_superusers_cannot_see_staff_fields(self) -> None:
+        # NOTE: Saving a superuser always makes them a staff member, so this user is only held in memory
+        non_staff_superuser: User = User(
+            email=TestDataGenerator.create_user_email(),
+            is_superuser=True,
+            is_staff=False,
+        )
+
+        self.assertIs(get_user_role(non_staff_superuser), UserRole.AUTHENTICATED)
+        self.assertFalse(
+            set(UserSerializer(context={"request": self._create_request(non_staff_superuser)}).fields)  # noqa: E501
+            & {*UserSerializer.STAFF_FIELD_NAMES, *UserSerializer.SUPERUSER_FIELD_NAMES},
+        )
@@ -0,0 +1,104 @@
+"""Test suite for the sparse fieldsets & inline expansion of the REST API's serializers."""
+
+from collections.abc import Sequence
+
+__all__: Sequence[str] = ()
+
+from typing import TYPE_CHECKING
+
+import django.urls
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from api_rest.views import PostViewSet
+from ratemymodule.tests.utils import TestCase, TestDataGenerator
+from ratemymodule.utils.benchmarks import seed_benchmark_data
+
+if TYPE_CHECKING:
+    from rest_framework.request import Request
+    from rest_framework.response import Response
+
+    from ratemymodule.models import User
+    from ratemymodule.utils.benchmarks import BenchmarkData
+
+
+class SparseFieldsetTests(TestCase):
+    @staticmethod
+    def _list_posts(data: "BenchmarkData", query_string: str) -> "Response":
+        request: Request = APIRequestFactory().get(
+            f"{django.urls.reverse("api_rest:post-list")}?{query_string}",
+        )
+        force_authenticate(request, user=data.staff_user)
+        response: Response = PostViewSet.as_view({"get": "list"})(request)
+        response.render()
+        return response
+
+    def test_only_requested_fields_are_serialized(self) -> None:
+        data: BenchmarkData = seed_benchmark_data(1)
+
+        with CaptureQueriesContext(connection) as captured_queries:
+            response: Response = self._list_posts(data, "fields=url,content")
+
+        self.assertEqual(
+            {frozenset(post) for post in response.data["results"]},
+            {frozenset({"url", "content"})},
+        )
+        self.assertLessEqual(len(captured_queries), 2)
+
+    def test_omitted_fields_are_not_serialized(self) -> None:
+        data: BenchmarkData = seed_benchmark_data(1)
+
+        response: Response = self._list_posts(data, "omit=liked_user_set,disliked_user_set")
+
+        post: dict[str, object]
+        for post in response.data["results"]:
+            self.assertNotIn("liked_user_set", post)
+            self.assertNotIn("disliked_user_set", post)
+            self.assertIn("content", post)
+
+    def test_expanded_fields_are_serialized_inline(self) -> None:
+        data: BenchmarkData = seed_benchmark_data(1)
+
+        response: Response = self._list_posts(
+            data,
+            "fields=url,module,module.name,module.code&expand=module",
+        )
+
+        post: dict[str, object]
+        for post in response.data["results"]:
+            self.assertEqual(set(post), {"url", "module"})
+            self.assertEqual(set(post["module"]), {"name", "code"})  # type: ignore[arg-type]
+
+    def test_write_requests_ignore_sparse_fieldsets(self) -> None:
+        data: BenchmarkData = seed_benchmark_data(1)
+        poster: User = TestDataGenerator.create_enrolled_user(data.module.course_set.get())
+
+        request: Request = APIRequestFactory().post(
+            f"{django.urls.reverse("api_rest:post-list")}?fields=url&omit=content&expand=module",
+            {
+                "module": django.urls.reverse(
+                    "api_rest:module-detail",
+                    args=(data.module.pk,),
+                ),
+                "user_url": django.urls.reverse("api_rest:user-detail", args=(poster.pk,)),
+                "overall_rating": 4,
+                "content": "Written with a sparse fieldset.",
+                "academic_year_start": data.post.academic_year_start,
+                "tool_tag_set": [],
+                "topic_tag_set": [],
+                "other_tag_set": [],
+                "liked_user_set": [],
+                "disliked_user_set": [],
+                "report_set": [],
+            },
+            format="json",
+        )
+        force_authenticate(request, user=data.staff_user)
+
+        response: Response = PostViewSet.as_view({"post": "create"})(request)
+
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertTrue(
+            data.module.post_set.filter(content="Written with a sparse fieldset.").exists(),
+        )
@@ -6,6 +6,8 @@ __all__: Sequence[str] = (
     "CustomAPIRootView",
     "BasePrefixableGenericViewSet",
     "BasePrefixableViewSet",
+    "DataVersionedListMixin",
+    "CachedResponseMixin",
     "UserViewSet",
     "MyUserDetailsView",
     "UniversityViewSet",
@@ -20,11 +22,19 @@ __all__: Sequence[str] = (
 
 import abc
 import contextlib
-from typing import TYPE_CHECKING, Final, TypeVar, override
+from collections.abc import Callable, Iterable
+from typing import TYPE_CHECKING, ClassVar, Final, TypeVar, override
 
 import rest_framework
+from django.apps import apps
+from django.conf import settings
 from django.db.models import Model, QuerySet
+from django.http import StreamingHttpResponse
 from django.urls import NoReverseMatch
+from django.utils.functional import cached_property
+from rest_framework.decorators import action
+from rest_framework.generics import get_object_or_404
+from rest_framework.mixins import ListModelMixin, RetrieveModelMixin
 from rest_framework.permissions import (
     DjangoModelPermissions,
     DjangoModelPermissionsOrAnonReadOnly,
@@ -39,8 +49,11 @@ from rest_framework.viewsets import GenericViewSet, ModelViewSet, ReadOnlyModelV
 
 from api_rest.serializers import (
     CourseSerializer,
+    DateRangeSerializer,
     ModuleSerializer,
     OtherTagSerializer,
+    PostExportFiltersSerializer,
+    PostFiltersSerializer,
     PostSerializer,
     ReportSerializer,
     ToolTagSerializer,
@@ -48,6 +61,9 @@ from api_rest.serializers import (
     UniversitySerializer,
     UserSerializer,
 )
+from api_rest.serializers.role_fieldsets import UserRole, get_user_role
+from api_rest.serializers.sparse_fieldsets import SparseFieldsetSerializerMixin
+from core.cache import CacheNamespace
 from ratemymodule.models import (
     Course,
     Module,
@@ -59,9 +75,18 @@ from ratemymodule.models import (
     University,
     User,
 )
+from ratemymodule.models.data_versions import DataVersion, get_data_version
+from ratemymodule.models.post_filters import PostFilters
+from ratemymodule.models.post_stats import get_post_stats
+from ratemymodule.utils.post_export import (
+    POST_EXPORT_CONTENT_TYPES,
+    get_post_export_queryset,
+    iter_post_export_lines,
+)
 
 if TYPE_CHECKING:
     from django.contrib.auth.models import AnonymousUser
+    from django.http import HttpResponseBase
     from rest_framework import reverse  # noqa: F401
 
 
@@ -127,9 +152,42 @@ class CustomAPIRootView(APIRootView):
 
 
 class BasePrefixableGenericViewSet(GenericViewSet[model_T], abc.ABC):
-    """Base GenericViewSet that also includes the respective router prefix."""
+    """
+    Base GenericViewSet that also includes the respective router prefix.
+
+    Listed objects are paginated in pages of `PAGE_SIZE` objects,
+    using a cursor positioned by the indexed `CURSOR_ORDERING` field.
+    Responses are built only from the data of the `DATA_VERSION_MODELS`.
+    """
 
     PREFIX: str
+    PAGE_SIZE: int = 50
+    CURSOR_ORDERING: str = "pk"
+    DATA_VERSION_MODELS: ClassVar[Sequence[type[Model]]] = ()
+
+    def get_data_version_models(self) -> Iterable[type[Model]]:
+        """Return the models whose data can be included in this request's response."""
+        # NOTE: Expanded resources can include data from any model
+        if "expand" in self.request.query_params:
+            return apps.get_app_config("ratemymodule").get_models()
+
+        return self.DATA_VERSION_MODELS
+
+    @cached_property
+    def data_version(self) -> DataVersion:
+        """Return the combined data version of the models in this request's response."""
+        return get_data_version(self.get_data_version_models())
+
+    @override
+    def get_queryset(self) -> QuerySet[model_T]:
+        """Get the queryset, prefetching everything needed by the serializer's fields."""
+        queryset: QuerySet[model_T] = super().get_queryset()
+
+        serializer: object = self.get_serializer()
+        if isinstance(serializer, SparseFieldsetSerializerMixin):
+            return serializer.prepare_queryset(queryset)  # type: ignore[return-value,arg-type]
+
+        return queryset
 
 
 class BasePrefixableViewSet(ViewSet, abc.ABC):
@@ -138,6 +196,84 @@ class BasePrefixableViewSet(ViewSet, abc.ABC):
     PREFIX: str
 
 
+class DataVersionedListMixin(ListModelMixin):
+    """
+    Viewset mixin that answers conditional list requests from the listed models' data versions.
+
+    A `304 Not Modified` response is returned before any objects are fetched or serialized,
+    when none of the viewset's `DATA_VERSION_MODELS` have changed
+    since the client's copy was built.
+    Nothing is conditional unless `DATA_VERSIONS_ENABLED` is set.
+    """
+
+    @override
+    def list(self, request: Request, *args: object, **kwargs: object) -> "Response | HttpResponseBase":  # type: ignore[override]  # noqa: E501
+        if not settings.DATA_VERSIONS_ENABLED:
+            return super().list(request, *args, **kwargs)
+
+        data_version: DataVersion = self.data_version  # type: ignore[attr-defined]
+        VARIANT_PARTS: Final[Sequence[object]] = (
+            request.user.pk,
+            get_user_role(request.user).value,
+            request.accepted_renderer.format,  # type: ignore[union-attr]
+        )
+
+        not_modified_response: HttpResponseBase | None = (
+            data_version.get_not_modified_response(request, *VARIANT_PARTS)  # type: ignore[arg-type]
+        )
+        if not_modified_response is not None:
+            return not_modified_response
+
+        response: Response = super().list(request, *args, **kwargs)
+        data_version.add_validator_headers(response, *VARIANT_PARTS)
+        return response
+
+
+class CachedResponseMixin(RetrieveModelMixin, ListModelMixin):
+    """
+    Viewset mixin that caches the serialized data of GET responses to non-staff users.
+
+    Cached data is keyed by the full URL, the user's role, the renderer
+    & the data version of the viewset's `DATA_VERSION_MODELS`,
+    so any save or delete of those models' objects invalidates it straight away.
+    Staff users always get freshly serialized data,
+    as does everyone when `DATA_VERSIONS_ENABLED` is not set.
+    Responses must therefore only vary by role, not by individual user.
+    """
+
+    RESPONSE_CACHE: ClassVar[CacheNamespace] = CacheNamespace(
+        "rest-responses",
+        timeout=settings.REST_RESPONSE_CACHE_TIMEOUT,
+    )
+
+    def _get_cached_response(self, get_response: Callable[[], Response]) -> Response:
+        role: UserRole = get_user_role(self.request.user)  # type: ignore[attr-defined]
+        IS_CACHE_DISABLED: Final[bool] = (
+            not settings.DATA_VERSIONS_ENABLED or not settings.REST_RESPONSE_CACHE_TIMEOUT
+        )
+        if role in (UserRole.STAFF, UserRole.SUPERUSER) or IS_CACHE_DISABLED:
+            return get_response()
+
+        return Response(
+            self.RESPONSE_CACHE.get_or_compute(
+                self.data_version.make_key(  # type: ignore[attr-defined]
+                    self.request.build_absolute_uri(),  # type: ignore[attr-defined]
+                    role.value,
+                    self.request.accepted_renderer.format,  # type: ignore[attr-defined]
+                ),
+                compute=lambda: get_response().data,
+            ),
+        )
+
+    @override
+    def list(self, request: Request, *args: object, **kwargs: object) -> Response:
+        return self._get_cached_response(lambda: super(CachedResponseMixin, self).list(request, *args, **kwargs))  # noqa: E501
+
+    @override
+    def retrieve(self, request: Request, *args: object, **kwargs: object) -> Response:
+        return self._get_cached_response(lambda: super(CachedResponseMixin, self).retrieve(request, *args, **kwargs))  # noqa: E501
+
+
 class PrefixableReadOnlyModelViewSet(ReadOnlyModelViewSet[model_T], BasePrefixableGenericViewSet[model_T], abc.ABC):  # noqa: E501
     """Base ReadOnlyModelViewSet that also includes the respective router prefix."""
 
@@ -150,6 +286,7 @@ class UserViewSet(PrefixableReadOnlyModelViewSet[User]):
     """A ViewSet to return Users in the API."""
 
     PREFIX: str = r"users"
+    PAGE_SIZE: int = 25
 
     queryset = User.objects.all()
     serializer_class = UserSerializer
@@ -173,40 +310,78 @@ class MyUserDetailsView(APIView):
         return Response(UserSerializer(user, context={"request": request}).data)
 
 
-class UniversityViewSet(PrefixableModelViewSet[University]):
+class UniversityViewSet(DataVersionedListMixin, CachedResponseMixin, PrefixableModelViewSet[University]):  # noqa: E501
     """A ViewSet to return Universities in the API."""
 
     PREFIX: str = r"universities"
+    DATA_VERSION_MODELS = (University, Course, Module)
 
     queryset = University.objects.all()
     serializer_class = UniversitySerializer
     permission_classes = (DjangoModelPermissionsOrAnonReadOnly,)
 
 
-class CourseViewSet(PrefixableModelViewSet[Course]):
+class CourseViewSet(DataVersionedListMixin, CachedResponseMixin, PrefixableModelViewSet[Course]):  # noqa: E501
     """A ViewSet to return Courses in the API."""
 
     PREFIX: str = r"courses"
+    DATA_VERSION_MODELS = (Course, University, Module, User)
 
     queryset = Course.objects.all()
     serializer_class = CourseSerializer
     permission_classes = (DjangoModelPermissionsOrAnonReadOnly,)
 
 
-class ModuleViewSet(PrefixableModelViewSet[Module]):
+class ModuleViewSet(DataVersionedListMixin, CachedResponseMixin, PrefixableModelViewSet[Module]):  # noqa: E501
     """A ViewSet to return Modules in the API."""
 
     PREFIX: str = r"modules"
+    DATA_VERSION_MODELS = (Module, Course, University, Post)
 
     queryset = Module.objects.all()
     serializer_class = ModuleSerializer
     permission_classes = (DjangoModelPermissionsOrAnonReadOnly,)
 
+    @override
+    def get_data_version_models(self) -> Iterable[type[Model]]:
+        # NOTE: Reports change which posts are visible, so they change the statistics of a module's posts
+        if self.action == "stats":
+            return (Module, Post, Report)
+
+        return super().get_data_version_models()
+
+    @action(detail=True, methods=("get",))
+    def stats(self, request: Request, pk: str | None = None) -> Response:  # noqa: ARG002
+        """
+        Return the rating histograms, averages & monthly time series of a module's posts.
+
+        Only posts made within the (inclusive) `date_from` & `date_to` query parameters
+        are included, & every statistic is calculated with database aggregates.
+        """
+        date_range_serializer: DateRangeSerializer = DateRangeSerializer(
+            data=request.query_params,
+        )
+        date_range_serializer.is_valid(raise_exception=True)
+
+        return self._get_cached_response(
+            lambda: Response(
+                get_post_stats(
+                    PostFilters(
+                        module=get_object_or_404(Module.objects.all(), pk=self.kwargs["pk"]),
+                        date_from=date_range_serializer.validated_data.get("date_from"),
+                        date_to=date_range_serializer.validated_data.get("date_to"),
+                    ).apply(Post.filter_by_viewable(request=request).all()),
+                ).as_dict(),
+            ),
+        )
 
-class ToolTagViewSet(PrefixableModelViewSet[ToolTag]):
+
+class ToolTagViewSet(CachedResponseMixin, PrefixableModelViewSet[ToolTag]):
     """A ViewSet to return Posts in the API."""
 
     PREFIX: str = r"tool-tags"
+    PAGE_SIZE: int = 100
+    DATA_VERSION_MODELS = (ToolTag,)
 
     queryset = ToolTag.objects.all()
     serializer_class = ToolTagSerializer
@@ -219,10 +394,12 @@ class ToolTagViewSet(PrefixableModelViewSet[ToolTag]):
         return super().get_queryset()
 
 
-class TopicTagViewSet(PrefixableModelViewSet[TopicTag]):
+class TopicTagViewSet(CachedResponseMixin, PrefixableModelViewSet[TopicTag]):
     """A ViewSet to return TopicTags in the API."""
 
     PREFIX: str = r"topic-tags"
+    PAGE_SIZE: int = 100
+    DATA_VERSION_MODELS = (TopicTag,)
 
     queryset = TopicTag.objects.all()
     serializer_class = TopicTagSerializer
@@ -235,10 +412,12 @@ class TopicTagViewSet(PrefixableModelViewSet[TopicTag]):
         return super().get_queryset()
 
 
-class OtherTagViewSet(PrefixableModelViewSet[OtherTag]):
+class OtherTagViewSet(CachedResponseMixin, PrefixableModelViewSet[OtherTag]):
     """A ViewSet to return OtherTags in the API."""
 
     PREFIX: str = r"other-tags"
+    PAGE_SIZE: int = 100
+    DATA_VERSION_MODELS = (OtherTag,)
 
     queryset = OtherTag.objects.all()
     serializer_class = OtherTagSerializer
@@ -251,22 +430,84 @@ class OtherTagViewSet(PrefixableModelViewSet[OtherTag]):
         return super().get_queryset()
 
 
-class PostViewSet(PrefixableModelViewSet[Post]):
+class PostViewSet(DataVersionedListMixin, PrefixableModelViewSet[Post]):
     """A ViewSet to return Posts in the API."""
 
     PREFIX: str = r"posts"
+    PAGE_SIZE: int = 20
+    CURSOR_ORDERING: str = "-pk"
+    DATA_VERSION_MODELS = (
+        Post,
+        Report,
+        Course,
+        University,
+        User,
+        ToolTag,
+        TopicTag,
+        OtherTag,
+    )
 
     serializer_class = PostSerializer
 
     def get_queryset(self) -> QuerySet[Post]:
-        """Get viewable posts."""
-        return Post.filter_by_viewable(request=self.request).all()
+        """
+        Get viewable posts, along with everything needed to serialize them.
+
+        Listed posts are filtered by the query parameters of `PostFiltersSerializer`.
+
+        The reaction counts, the requesting user's reactions & the creator's details
+        are annotated, & all related objects are prefetched,
+        so serializing a page of posts makes a constant number of queries.
+        """
+        queryset: QuerySet[Post] = Post.filter_by_viewable(request=self.request).all()
+
+        if self.action == "list":
+            filters_serializer: PostFiltersSerializer = PostFiltersSerializer(
+                data=self.request.query_params,
+            )
+            filters_serializer.is_valid(raise_exception=True)
+            queryset = filters_serializer.to_post_filters().apply(queryset)
+
+        return self.get_serializer().prepare_queryset(queryset)  # type: ignore[no-any-return]
+
+    @action(detail=False, methods=("get",))
+    def export(self, request: Request) -> StreamingHttpResponse:
+        """
+        Stream every viewable post as CSV or JSON Lines, without any pagination.
+
+        Posts can be filtered by the same query parameters as the list of posts,
+        and the `file_format` is either `jsonl` (the default) or `csv`.
+        Rows are streamed as they are read from the database,
+        so memory use stays constant no matter how many posts are exported.
+        """
+        filters_serializer: PostExportFiltersSerializer = PostExportFiltersSerializer(
+            data=request.query_params,
+        )
+        filters_serializer.is_valid(raise_exception=True)
+        file_format: str = str(filters_serializer.validated_data["file_format"])
+
+        response: StreamingHttpResponse = StreamingHttpResponse(
+            iter_post_export_lines(
+                get_post_export_queryset(
+                    filters_serializer.to_post_filters().apply(
+                        Post.filter_by_viewable(request=request).all(),
+                    ),
+                ),
+                file_format,
+            ),
+            content_type=POST_EXPORT_CONTENT_TYPES[file_format],
+        )
+        response.headers["Content-Disposition"] = (
+            f"attachment; filename=\"posts.{file_format}\""
+        )
+        return response
 
 
 class ReportViewSet(PrefixableModelViewSet[Report]):
     """A ViewSet to return Reports in the API."""
 
     PREFIX: str = r"reports"
+    CURSOR_ORDERING: str = "-pk"
 
     queryset = Report.objects.all()
     serializer_class = ReportSerializer
@@ -0,0 +1,163 @@
+"""
+Project-wide cache API, layered on top of the configured Django cache backends.
+
+Cached values are grouped into namespaces, whose keys are prefixed with the namespace name.
+Every namespace has its own version number (stored in the cache itself),
+so all of a namespace's values can be invalidated at once by bumping its version,
+without needing to know which keys were set.
+"""
+
+from collections.abc import Sequence
+
+__all__: Sequence[str] = ("CacheNamespace",)
+
+import time
+import uuid
+from collections.abc import Callable
+from typing import Final, TypeVar
+
+from django.core.cache import BaseCache, caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+
+from core import metrics
+
+T = TypeVar("T")
+
+_MISSING: Final[object] = object()
+
+
+class CacheNamespace:
+    """
+    A named group of cache keys that share a version number.
+
+    Values can be computed with single-flight locking,
+    so only one process/thread computes a missing value at a time,
+    while any others wait for the computed value to appear in the cache.
+    """
+
+    LOCK_TIMEOUT: Final[int] = 30
+    LOCK_WAIT_TIMEOUT: Final[float] = 5.0
+    LOCK_POLL_INTERVAL: Final[float] = 0.05
+
+    def __init__(self, name: str, timeout: float | None | object = DEFAULT_TIMEOUT, cache_alias: str = "default") -> None:  # noqa: E501
+        """Create a new cache namespace, with the given default timeout for its values."""
+        if not name or ":" in name:
+            INVALID_NAME_MESSAGE: Final[str] = (
+                "Cache namespace names must be non-empty & cannot contain \":\"."
+            )
+            raise ValueError(INVALID_NAME_MESSAGE)
+
+        self.name: str = name
+        self.timeout: float | None | object = timeout
+        self.cache_alias: str = cache_alias
+
+    @property
+    def cache(self) -> BaseCache:
+        """The Django cache backend that this namespace stores its values in."""
+        return caches[self.cache_alias]
+
+    @property
+    def _version_key(self) -> str:
+        return f"{self.name}:version"
+
+    @property
+    def version(self) -> int:
+        """
+        The current version of this namespace's values.
+
+        The initial version is based on the current time,
+        so evicting the version key from the cache never makes stale values reappear.
+        """
+        version: object = self.cache.get(self._version_key)
+        if isinstance(version, int):
+            return version
+
+        self.cache.add(self._version_key, time.time_ns(), timeout=None)
+        return self.cache.get(self._version_key, time.time_ns())  # type: ignore[no-any-return]
+
+    def invalidate(self) -> None:
+        """Invalidate every value within this namespace, by bumping its version."""
+        try:
+            self.cache.incr(self._version_key)
+        except ValueError:
+            self.cache.add(self._version_key, time.time_ns(), timeout=None)
+
+    def make_key(self, *key_parts: object) -> str:
+        """Build the (unversioned) cache key of a value within this namespace."""
+        return ":".join((self.name, *(str(key_part) for key_part in key_parts)))
+
+    def get(self, *key_parts: object, default: object = None) -> object:
+        """Retrieve a value within this namespace, or `default` if it is not cached."""
+        value: object = self.cache.get(
+            self.make_key(*key_parts),
+            _MISSING,
+            version=self.version,
+        )
+        self._record_lookup(hit=value is not _MISSING)
+
+        return default if value is _MISSING else value
+
+    def _record_lookup(self, *, hit: bool) -> None:
+        metrics.CACHE_REQUESTS.inc(namespace=self.name, result="hit" if hit else "miss")
+
+    def set(self, *key_parts: object, value: object, timeout: float | None | object = DEFAULT_TIMEOUT) -> None:  # noqa: E501
+        """Store a value within this namespace."""
+        self.cache.set(
+            self.make_key(*key_parts),
+            value,
+            timeout=self.timeout if timeout is DEFAULT_TIMEOUT else timeout,
+            version=self.version,
+        )
+
+    def delete(self, *key_parts: object) -> None:
+        """Remove a single value within this namespace."""
+        self.cache.delete(self.make_key(*key_parts), version=self.version)
+
+    def get_or_compute(self, *key_parts: object, compute: Callable[[], T], timeout: float | None | object = DEFAULT_TIMEOUT) -> T:  # noqa: E501
+        """
+        Retrieve a value within this namespace, computing & storing it if it is not cached.
+
+        Only the caller that acquires the value's lock computes the value.
+        Other callers wait (up to `LOCK_WAIT_TIMEOUT` seconds) for it to be stored,
+        before falling back to computing the value themselves.
+        """
+        version: int = self.version
+        key: str = self.make_key(*key_parts)
+
+        value: object = self.cache.get(key, _MISSING, version=version)
+        self._record_lookup(hit=value is not _MISSING)
+        if value is not _MISSING:
+            return value  # type: ignore[return-value]
+
+        lock_key: str = f"{key}:lock"
+        lock_token: str = uuid.uuid4().hex
+
+        lock_acquired: bool = self.cache.add(
+            lock_key,
+            lock_token,
+            timeout=self.LOCK_TIMEOUT,
+            version=version,
+        )
+        if not lock_acquired:
+            wait_deadline: float = time.monotonic() + self.LOCK_WAIT_TIMEOUT
+            while time.monotonic() < wait_deadline:
+                time.sleep(self.LOCK_POLL_INTERVAL)
+
+                value = self.cache.get(key, _MISSING, version=version)
+                if value is not _MISSING:
+                    return value  # type: ignore[return-value]
+
+            return compute()
+
+        try:
+            computed_value: T = compute()
+            self.cache.set(
+                key,
+                computed_value,
+                timeout=self.timeout if timeout is DEFAULT_TIMEOUT else timeout,
+                version=version,
+            )
+            return computed_value
+        finally:
+            if self.cache.get(lock_key, version=version) == lock_token:
+                self.cache.delete(lock_key, version=version)
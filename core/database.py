@@ -0,0 +1,136 @@
+"""
+Handles the configuration & routing of the project's database connections.
+
+Reads are sent to one of the configured read-replicas (`DATABASE_REPLICAS`)
+only during requests that use a safe HTTP method.
+Every other read (& every write) is sent to the primary (`default`) database.
+Once a request has written to the primary database, that user's following requests
+stick to the primary database for `DATABASE_REPLICA_STICKY_SECONDS`,
+so they always read their own writes (E.g. their own likes, posts & reports).
+"""
+
+from collections.abc import Sequence
+
+__all__: Sequence[str] = (
+    "ready",
+    "STICKY_PRIMARY_DATABASE_COOKIE_NAME",
+    "ReadReplicaRouter",
+    "ReadReplicaMiddleware",
+)
+
+import random
+from collections.abc import Callable
+from contextvars import ContextVar, Token
+from typing import Final
+
+from django import dispatch
+from django.conf import settings
+from django.db import models
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.backends.signals import connection_created
+from django.http import HttpRequest, HttpResponseBase
+
+STICKY_PRIMARY_DATABASE_COOKIE_NAME: Final[str] = "use_primary_database"
+SAFE_HTTP_METHODS: Final[frozenset[str]] = frozenset({"GET", "HEAD", "OPTIONS", "TRACE"})
+
+_use_primary_database: ContextVar[bool] = ContextVar("use_primary_database", default=True)
+_has_written_to_primary_database: ContextVar[bool] = ContextVar(
+    "has_written_to_primary_database",
+    default=False,
+)
+
+
+def ready() -> None:
+    """Initialise this module when importing & starting signal listeners."""
+
+
+@dispatch.receiver(connection_created)
+def apply_sqlite_pragmas(connection: BaseDatabaseWrapper, **_kwargs: object) -> None:
+    """
+    Apply the configured `SQLITE_PRAGMAS` to every newly opened SQLite connection.
+
+    SQLite pragmas (other than `journal_mode`) only last for the lifetime of a connection,
+    so they must be set again whenever a connection is opened.
+    """
+    if connection.vendor != "sqlite":
+        return
+
+    with connection.cursor() as cursor:
+        pragma_name: str
+        pragma_value: str | int
+        for pragma_name, pragma_value in settings.SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {pragma_name} = {pragma_value}")
+
+
+class ReadReplicaRouter:
+    """Database router to send safe reads to a random read-replica & all writes to primary."""
+
+    # noinspection PyUnusedLocal
+    def db_for_read(self, model: type[models.Model], **_hints: object) -> str | None:  # noqa: ARG002
+        """Suggest the database to read from, for objects of the given model type."""
+        if _use_primary_database.get() or not settings.DATABASE_REPLICAS:
+            return None
+
+        return random.choice(settings.DATABASE_REPLICAS)
+
+    # noinspection PyUnusedLocal
+    def db_for_write(self, model: type[models.Model], **_hints: object) -> str | None:  # noqa: ARG002
+        """
+        Suggest the database to write to, for objects of the given model type.
+
+        All later reads within the current context are also sent to the primary database.
+        """
+        _use_primary_database.set(True)
+        _has_written_to_primary_database.set(True)
+
+        return "default"
+
+    # noinspection PyUnusedLocal
+    def allow_relation(self, obj1: models.Model, obj2: models.Model, **_hints: object) -> bool:  # noqa: ARG002
+        """Allow any relation, because every replica holds the same data as the primary."""
+        return True
+
+    # noinspection PyUnusedLocal
+    def allow_migrate(self, db: str, app_label: str, **_hints: object) -> bool:  # noqa: ARG002
+        """Only allow migrations to be applied to the primary database."""
+        return db == "default"
+
+
+class ReadReplicaMiddleware:
+    """
+    Middleware to decide whether each request's reads may be sent to a read-replica.
+
+    Requests using unsafe HTTP methods, or from users that have recently written,
+    always use the primary database.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponseBase]) -> None:
+        """Store the next middleware (or view) in the request processing chain."""
+        self.get_response: Callable[[HttpRequest], HttpResponseBase] = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponseBase:
+        """Process a single request, setting the sticky-primary cookie if a write occurred."""
+        use_primary_database_token: Token[bool] = _use_primary_database.set(
+            request.method not in SAFE_HTTP_METHODS
+            or STICKY_PRIMARY_DATABASE_COOKIE_NAME in request.COOKIES,
+        )
+        has_written_token: Token[bool] = _has_written_to_primary_database.set(False)
+
+        try:
+            response: HttpResponseBase = self.get_response(request)
+
+            if _has_written_to_primary_database.get() and settings.DATABASE_REPLICAS:
+                response.set_cookie(
+                    STICKY_PRIMARY_DATABASE_COOKIE_NAME,
+                    "1",
+                    max_age=settings.DATABASE_REPLICA_STICKY_SECONDS,
+                    secure=request.is_secure(),
+                    httponly=True,
+                    samesite="Lax",
+                )
+
+            return response
+
+        finally:
+            _has_written_to_primary_database.reset(has_written_token)
+            _use_primary_database.reset(use_primary_database_token)
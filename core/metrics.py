@@ -0,0 +1,496 @@
+"""
+In-process application metrics, exposed in the Prometheus text exposition format.
+
+Each process stores its metric values in its own memory-mapped file
+within `METRICS_DIRECTORY`, so the `/metrics` endpoint (served by any one gunicorn worker)
+can aggregate the values recorded by every worker.
+The files of stopped workers are merged into a single archive file when metrics are read,
+so counters never go backwards, without the directory growing with every restarted worker.
+`METRICS_DIRECTORY` must therefore only be shared by processes on the same host.
+When `METRICS_DIRECTORY` is not set, values are only held in memory by the current process.
+"""
+
+from collections.abc import Sequence
+
+__all__: Sequence[str] = (
+    "Counter",
+    "Histogram",
+    "MetricsRegistry",
+    "REGISTRY",
+    "HTTP_REQUESTS",
+    "HTTP_REQUEST_DURATION",
+    "HTTP_REQUEST_DB_QUERIES",
+    "HTTP_REQUEST_DB_DURATION",
+    "STAGE_DURATION",
+    "CACHE_REQUESTS",
+    "POST_REACTIONS",
+    "REACTION_BUFFER_WRITES",
+    "PROMETHEUS_CONTENT_TYPE",
+)
+
+import contextlib
+import fcntl
+import json
+import math
+import mmap
+import os
+import re
+import struct
+import threading
+import uuid
+from collections import Counter as CollectionsCounter
+from collections.abc import Iterable, Iterator, Mapping
+from pathlib import Path
+from typing import Final, override
+
+from django.conf import settings
+
+PROMETHEUS_CONTENT_TYPE: Final[str] = "text/plain; version=0.0.4; charset=utf-8"
+_ARCHIVE_FILE_NAME: Final[str] = "metrics-archive.db"
+_LOCK_FILE_NAME: Final[str] = "metrics.lock"
+_WORKER_FILE_NAME_PATTERN: Final[re.Pattern[str]] = re.compile(r"metrics-(\d+)-[0-9a-f]+\.db")
+
+_SampleKey = tuple[str, str, tuple[tuple[str, str], ...]]
+
+
+def _encode_sample_key(sample_key: _SampleKey) -> bytes:
+    return json.dumps(sample_key, separators=(",", ":")).encode()
+
+
+def _decode_sample_key(encoded_sample_key: bytes) -> _SampleKey:
+    family_name: str
+    sample_name: str
+    labels: list[list[str]]
+    family_name, sample_name, labels = json.loads(encoded_sample_key)
+    return family_name, sample_name, tuple((name, value) for name, value in labels)
+
+
+class _InMemoryValueStore:
+    """Sample values held only in the memory of the current process."""
+
+    def __init__(self) -> None:
+        self._values: dict[_SampleKey, float] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def increment(self, sample_key: _SampleKey, amount: float) -> None:
+        with self._lock:
+            self._values[sample_key] = self._values.get(sample_key, 0.0) + amount
+
+    def read_values(self) -> Mapping[_SampleKey, float]:
+        with self._lock:
+            return dict(self._values)
+
+
+class _FileValueStore(_InMemoryValueStore):
+    """
+    Sample values held in a memory-mapped file, so other processes can read them.
+
+    The file starts with the number of bytes used, followed by one entry per sample:
+    the length of the encoded sample key, the key itself (padded to 8 bytes)
+    and the sample's value.
+    Only the owning process ever writes to its file.
+    """
+
+    INITIAL_SIZE: Final[int] = 64 * 1024
+    _USED_BYTES_FORMAT: Final[struct.Struct] = struct.Struct("<Q")
+    _KEY_LENGTH_FORMAT: Final[struct.Struct] = struct.Struct("<I")
+    _VALUE_FORMAT: Final[struct.Struct] = struct.Struct("<d")
+
+    @override
+    def __init__(self, path: Path) -> None:
+        super().__init__()
+
+        self.path: Path = path
+        self._value_offsets: dict[_SampleKey, int] = {}
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("wb") as file:
+            file.truncate(self.INITIAL_SIZE)
+        self._file_descriptor: int = os.open(self.path, os.O_RDWR)
+        self._mmap: mmap.mmap = mmap.mmap(self._file_descriptor, self.INITIAL_SIZE)
+        self._USED_BYTES_FORMAT.pack_into(self._mmap, 0, self._USED_BYTES_FORMAT.size)
+
+    @override
+    def increment(self, sample_key: _SampleKey, amount: float) -> None:
+        with self._lock:
+            value_offset: int | None = self._value_offsets.get(sample_key)
+            if value_offset is None:
+                value_offset = self._add_entry(sample_key)
+
+            current_value: float = self._VALUE_FORMAT.unpack_from(self._mmap, value_offset)[0]
+            self._VALUE_FORMAT.pack_into(self._mmap, value_offset, current_value + amount)
+
+    def _add_entry(self, sample_key: _SampleKey) -> int:
+        encoded_sample_key: bytes = _encode_sample_key(sample_key)
+        padded_key_length: int = math.ceil(
+            (self._KEY_LENGTH_FORMAT.size + len(encoded_sample_key)) / 8,
+        ) * 8
+        used_bytes: int = self._USED_BYTES_FORMAT.unpack_from(self._mmap, 0)[0]
+        entry_end: int = used_bytes + padded_key_length + self._VALUE_FORMAT.size
+
+        if entry_end > len(self._mmap):
+            new_size: int = max(entry_end, len(self._mmap) * 2)
+            os.ftruncate(self._file_descriptor, new_size)
+            self._mmap.close()
+            self._mmap = mmap.mmap(self._file_descriptor, new_size)
+
+        self._KEY_LENGTH_FORMAT.pack_into(self._mmap, used_bytes, len(encoded_sample_key))
+        key_offset: int = used_bytes + self._KEY_LENGTH_FORMAT.size
+        self._mmap[key_offset:key_offset + len(encoded_sample_key)] = encoded_sample_key
+        value_offset: int = used_bytes + padded_key_length
+        self._VALUE_FORMAT.pack_into(self._mmap, value_offset, 0.0)
+
+        # NOTE: The used size is only updated once the entry is complete, so readers never see a partially written entry
+        self._USED_BYTES_FORMAT.pack_into(self._mmap, 0, entry_end)
+        self._value_offsets[sample_key] = value_offset
+
+        return value_offset
+
+    @override
+    def read_values(self) -> Mapping[_SampleKey, float]:
+        with self._lock:
+            return dict(self.read_file(self._mmap))
+
+    @classmethod
+    def read_file(cls, data: bytes | mmap.mmap) -> Iterator[tuple[_SampleKey, float]]:
+        """Parse every sample stored within the contents of a metrics file."""
+        if len(data) < cls._USED_BYTES_FORMAT.size:
+            return
+
+        used_bytes: int = min(cls._USED_BYTES_FORMAT.unpack_from(data, 0)[0], len(data))
+        offset: int = cls._USED_BYTES_FORMAT.size
+        while offset < used_bytes:
+            key_length: int = cls._KEY_LENGTH_FORMAT.unpack_from(data, offset)[0]
+            key_offset: int = offset + cls._KEY_LENGTH_FORMAT.size
+            value_offset: int = math.ceil((key_offset + key_length) / 8) * 8
+
+            yield (
+                _decode_sample_key(data[key_offset:key_offset + key_length]),
+                cls._VALUE_FORMAT.unpack_from(data, value_offset)[0],
+            )
+
+            offset = value_offset + cls._VALUE_FORMAT.size
+
+    @classmethod
+    def encode_file(cls, values: Mapping[_SampleKey, float]) -> bytes:
+        """Build the contents of a metrics file holding the given samples."""
+        data: bytearray = bytearray(cls._USED_BYTES_FORMAT.size)
+
+        sample_key: _SampleKey
+        value: float
+        for sample_key, value in values.items():
+            encoded_sample_key: bytes = _encode_sample_key(sample_key)
+            data += cls._KEY_LENGTH_FORMAT.pack(len(encoded_sample_key)) + encoded_sample_key
+            data += bytes(-len(data) % 8)
+            data += cls._VALUE_FORMAT.pack(value)
+
+        cls._USED_BYTES_FORMAT.pack_into(data, 0, len(data))
+        return bytes(data)
+
+
+_value_store_lock: threading.Lock = threading.Lock()
+_value_stores: dict[tuple[int, str], _InMemoryValueStore] = {}
+
+
+def _get_value_store() -> _InMemoryValueStore:
+    # NOTE: Stores are per-process (with a unique file name), so a forked worker never writes into its parent's file & a reused process ID never overwrites an old worker's values
+    store_key: tuple[int, str] = (os.getpid(), settings.METRICS_DIRECTORY)
+
+    with _value_store_lock:
+        value_store: _InMemoryValueStore | None = _value_stores.get(store_key)
+        if value_store is None:
+            value_store = (
+                _FileValueStore(
+                    Path(settings.METRICS_DIRECTORY)
+                    / f"metrics-{os.getpid()}-{uuid.uuid4().hex}.db",
+                )
+                if settings.METRICS_DIRECTORY
+                else _InMemoryValueStore()
+            )
+            _value_stores[store_key] = value_store
+
+        return value_store
+
+
+def _is_process_running(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+
+    return True
+
+
+@contextlib.contextmanager
+def _lock_metrics_directory(metrics_directory: Path) -> Iterator[None]:
+    lock_file_descriptor: int = os.open(
+        metrics_directory / _LOCK_FILE_NAME,
+        os.O_RDWR | os.O_CREAT,
+    )
+    try:
+        fcntl.flock(lock_file_descriptor, fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(lock_file_descriptor)
+
+
+def _read_values_file(metrics_file_path: Path) -> CollectionsCounter[_SampleKey]:
+    values: CollectionsCounter[_SampleKey] = CollectionsCounter()
+
+    sample_key: _SampleKey
+    value: float
+    for sample_key, value in _FileValueStore.read_file(metrics_file_path.read_bytes()):
+        values[sample_key] += value
+
+    return values
+
+
+def _archive_stopped_workers(metrics_directory: Path) -> None:
+    """Merge the files of workers that are no longer running into the archive file."""
+    stopped_worker_file_paths: list[Path] = [
+        metrics_file_path
+        for metrics_file_path in metrics_directory.glob("metrics-*.db")
+        if (match := _WORKER_FILE_NAME_PATTERN.fullmatch(metrics_file_path.name))
+        and not _is_process_running(int(match.group(1)))
+    ]
+    if not stopped_worker_file_paths:
+        return
+
+    archive_file_path: Path = metrics_directory / _ARCHIVE_FILE_NAME
+    archived_values: CollectionsCounter[_SampleKey] = (
+        _read_values_file(archive_file_path)
+        if archive_file_path.exists()
+        else CollectionsCounter()
+    )
+
+    stopped_worker_file_path: Path
+    for stopped_worker_file_path in stopped_worker_file_paths:
+        archived_values.update(_read_values_file(stopped_worker_file_path))
+
+    # NOTE: The archive is replaced atomically, so a crash part-way through never loses the values already archived
+    temporary_archive_file_path: Path = archive_file_path.with_suffix(".tmp")
+    temporary_archive_file_path.write_bytes(_FileValueStore.encode_file(archived_values))
+    temporary_archive_file_path.replace(archive_file_path)
+
+    for stopped_worker_file_path in stopped_worker_file_paths:
+        stopped_worker_file_path.unlink(missing_ok=True)
+
+
+def _read_all_values() -> Mapping[_SampleKey, float]:
+    if not settings.METRICS_DIRECTORY:
+        return _get_value_store().read_values()
+
+    metrics_directory: Path = Path(settings.METRICS_DIRECTORY)
+    metrics_directory.mkdir(parents=True, exist_ok=True)
+
+    values: CollectionsCounter[_SampleKey] = CollectionsCounter()
+
+    # NOTE: Reads are serialised with archiving, so a stopped worker's values are never counted both in its own file & the archive
+    with _lock_metrics_directory(metrics_directory):
+        _archive_stopped_workers(metrics_directory)
+
+        metrics_file_path: Path
+        for metrics_file_path in sorted(metrics_directory.glob("metrics-*.db")):
+            values.update(_read_values_file(metrics_file_path))
+
+    return values
+
+
+class _BaseMetric:
+    TYPE: str = "untyped"
+
+    def __init__(self, name: str, documentation: str, label_names: Iterable[str] = (), *, registry: "MetricsRegistry | None" = None) -> None:  # noqa: E501
+        self.name: str = name
+        self.documentation: str = documentation
+        self.label_names: tuple[str, ...] = tuple(label_names)
+
+        (REGISTRY if registry is None else registry).register(self)
+
+    def _get_labels(self, labels: Mapping[str, object]) -> tuple[tuple[str, str], ...]:
+        if set(labels) != set(self.label_names):
+            INCORRECT_LABELS_MESSAGE: Final[str] = (
+                f"Metric {self.name!r} requires exactly the labels: {self.label_names!r}."
+            )
+            raise ValueError(INCORRECT_LABELS_MESSAGE)
+
+        return tuple((label_name, str(labels[label_name])) for label_name in self.label_names)
+
+    def _increment(self, sample_name: str, labels: tuple[tuple[str, str], ...], amount: float) -> None:  # noqa: E501
+        _get_value_store().increment((self.name, sample_name, labels), amount)
+
+
+class Counter(_BaseMetric):
+    """A metric whose value only ever goes up (E.g. the number of requests served)."""
+
+    TYPE: str = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: object) -> None:
+        """Increase this counter's value for the given labels."""
+        if not settings.METRICS_ENABLED:
+            return
+
+        if amount < 0:
+            NEGATIVE_AMOUNT_MESSAGE: Final[str] = "Counters can only be increased."
+            raise ValueError(NEGATIVE_AMOUNT_MESSAGE)
+
+        self._increment(self.name, self._get_labels(labels), amount)
+
+
+class Histogram(_BaseMetric):
+    """A metric that counts observed values (E.g. durations) within cumulative buckets."""
+
+    TYPE: str = "histogram"
+    DEFAULT_BUCKETS: Final[tuple[float, ...]] = (
+        0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0,
+    )
+
+    @override
+    def __init__(self, name: str, documentation: str, label_names: Iterable[str] = (), *, buckets: Iterable[float] = DEFAULT_BUCKETS, registry: "MetricsRegistry | None" = None) -> None:  # noqa: E501
+        self.buckets: tuple[float, ...] = tuple(sorted(buckets))
+        if not self.buckets:
+            NO_BUCKETS_MESSAGE: Final[str] = "Histograms require at least one bucket."
+            raise ValueError(NO_BUCKETS_MESSAGE)
+
+        super().__init__(name, documentation, label_names, registry=registry)
+
+    def observe(self, value: float, **labels: object) -> None:
+        """Record a single observed value for the given labels."""
+        if not settings.METRICS_ENABLED:
+            return
+
+        sample_labels: tuple[tuple[str, str], ...] = self._get_labels(labels)
+
+        bucket: float
+        for bucket in (*self.buckets, math.inf):
+            self._increment(
+                f"{self.name}_bucket",
+                (*sample_labels, ("le", _format_value(bucket))),
+                1 if value <= bucket else 0,
+            )
+
+        self._increment(f"{self.name}_sum", sample_labels, value)
+        self._increment(f"{self.name}_count", sample_labels, 1)
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+
+    if value == int(value):
+        return f"{int(value)}.0"
+
+    return repr(value)
+
+
+def _escape_label_value(label_value: str) -> str:
+    return label_value.replace("\\", r"\\").replace("\n", r"\n").replace("\"", r"\"")
+
+
+class MetricsRegistry:
+    """The collection of metrics that are exposed together."""
+
+    def __init__(self) -> None:
+        """Create a new registry, without any metrics."""
+        self._metrics: dict[str, _BaseMetric] = {}
+
+    def register(self, metric: _BaseMetric) -> None:
+        """Add a metric to this registry, so that it is included in the exposed output."""
+        if metric.name in self._metrics:
+            DUPLICATE_METRIC_MESSAGE: Final[str] = (
+                f"A metric named {metric.name!r} has already been registered."
+            )
+            raise ValueError(DUPLICATE_METRIC_MESSAGE)
+
+        self._metrics[metric.name] = metric
+
+    def generate_latest(self) -> str:
+        """Render the current value of every registered metric in Prometheus text format."""
+        family_samples: dict[str, list[tuple[str, tuple[tuple[str, str], ...], float]]] = {}
+
+        sample_key: _SampleKey
+        value: float
+        for sample_key, value in _read_all_values().items():
+            family_name: str
+            sample_name: str
+            labels: tuple[tuple[str, str], ...]
+            family_name, sample_name, labels = sample_key
+            family_samples.setdefault(family_name, []).append((sample_name, labels, value))
+
+        lines: list[str] = []
+
+        metric: _BaseMetric
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.TYPE}")
+
+            for sample_name, labels, value in sorted(
+                family_samples.get(metric.name, []),
+                key=lambda sample: _get_sample_sort_key(*sample[:2]),
+            ):
+                formatted_labels: str = ",".join(
+                    f"{label_name}=\"{_escape_label_value(label_value)}\""
+                    for label_name, label_value in labels
+                )
+                lines.append(
+                    f"{sample_name}{f"{{{formatted_labels}}}" if formatted_labels else ""} "
+                    f"{_format_value(value)}",
+                )
+
+        return "\n".join(lines) + "\n"
+
+
+def _get_sample_sort_key(sample_name: str, labels: tuple[tuple[str, str], ...]) -> tuple[object, ...]:  # noqa: E501
+    non_bucket_labels: tuple[tuple[str, str], ...] = tuple(
+        label for label in labels if label[0] != "le"
+    )
+    bucket: float = next(
+        (float(label_value) for label_name, label_value in labels if label_name == "le"),
+        math.inf,
+    )
+    return non_bucket_labels, not sample_name.endswith("_bucket"), bucket, sample_name
+
+
+REGISTRY: Final[MetricsRegistry] = MetricsRegistry()
+
+HTTP_REQUESTS: Final[Counter] = Counter(
+    "ratemymodule_http_requests_total",
+    "The number of HTTP requests served, by URL name, method & response status code.",
+    ("url_name", "method", "status"),
+)
+HTTP_REQUEST_DURATION: Final[Histogram] = Histogram(
+    "ratemymodule_http_request_duration_seconds",
+    "The total time taken to serve each HTTP request, by URL name.",
+    ("url_name",),
+)
+HTTP_REQUEST_DB_QUERIES: Final[Histogram] = Histogram(
+    "ratemymodule_http_request_db_queries",
+    "The number of database queries made by each HTTP request, by URL name.",
+    ("url_name",),
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000),
+)
+HTTP_REQUEST_DB_DURATION: Final[Histogram] = Histogram(
+    "ratemymodule_http_request_db_duration_seconds",
+    "The time spent in the database by each HTTP request, by URL name.",
+    ("url_name",),
+)
+STAGE_DURATION: Final[Histogram] = Histogram(
+    "ratemymodule_stage_duration_seconds",
+    "The time taken by each named stage (E.g. rendering a graph), by stage & function name.",
+    ("stage", "function"),
+)
+CACHE_REQUESTS: Final[Counter] = Counter(
+    "ratemymodule_cache_requests_total",
+    "The number of cache lookups, by cache namespace & whether the value was found.",
+    ("namespace", "result"),
+)
+POST_REACTIONS: Final[Counter] = Counter(
+    "ratemymodule_post_reactions_total",
+    "The number of like/dislike reactions made to posts, by reaction & how they were written.",
+    ("reaction", "mode"),
+)
+REACTION_BUFFER_WRITES: Final[Counter] = Counter(
+    "ratemymodule_reaction_buffer_written_total",
+    "The number of buffered post reactions written to the database.",
+)
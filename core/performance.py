@@ -0,0 +1,252 @@
+"""
+Per-request performance instrumentation.
+
+`RequestTimingMiddleware` measures the total time of each request,
+along with the time spent (& number of queries made) in the database,
+the time spent rendering templates & the time spent in any other named stages
+(E.g. generating graphs) that have been wrapped with `record_timing()`.
+The measurements are sent back in a `Server-Timing` header
+(so they are shown in browser developer tools) & are logged as a structured log line.
+Requests slower than `SLOW_REQUEST_THRESHOLD` also have their full SQL logged.
+Every measurement is also recorded in the application metrics (see `core.metrics`).
+"""
+
+from collections.abc import Sequence
+
+__all__: Sequence[str] = (
+    "RequestTimings",
+    "RequestTimingMiddleware",
+    "record_timing",
+)
+
+import contextlib
+import functools
+import logging
+import time
+from collections import defaultdict
+from collections.abc import Callable, Iterator, Mapping
+from contextvars import ContextVar, Token
+from typing import Final, ParamSpec, TypeVar
+
+from django.conf import settings
+from django.db import connections
+from django.http import HttpRequest, HttpResponseBase
+from django.template.response import SimpleTemplateResponse
+
+from core import metrics
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+logger: logging.Logger = logging.getLogger("ratemymodule.performance")
+
+_current_request_timings: ContextVar["RequestTimings | None"] = ContextVar(
+    "current_request_timings",
+    default=None,
+)
+
+
+class RequestTimings:
+    """The durations (in seconds) of each measured stage of a single request."""
+
+    def __init__(self, *, capture_queries: bool = False) -> None:
+        """Create a new empty set of timings, optionally storing every executed SQL query."""
+        self.start_time: float = time.perf_counter()
+        self.durations: defaultdict[str, float] = defaultdict(float)
+        self.query_count: int = 0
+        self.capture_queries: bool = capture_queries
+        self.captured_queries: list[tuple[str, float]] = []
+
+    @property
+    def total_duration(self) -> float:
+        """The number of seconds since this request started being processed."""
+        return time.perf_counter() - self.start_time
+
+    def __call__(self, execute: Callable[..., object], sql: str, params: object, many: bool, context: Mapping[str, object]) -> object:  # noqa: E501, FBT001
+        """Measure the duration of a single database query (used as an execute wrapper)."""
+        start_time: float = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration: float = time.perf_counter() - start_time
+            self.durations["db"] += duration
+            self.query_count += 1
+
+            if self.capture_queries:
+                self.captured_queries.append((sql, duration))
+
+    def get_server_timing_header(self, total_duration: float) -> str:
+        """Format these timings as the value of a `Server-Timing` HTTP header."""
+        return ", ".join(
+            (
+                f"total;dur={total_duration * 1000:.1f}",
+                (
+                    f"db;dur={self.durations["db"] * 1000:.1f};"
+                    f"desc=\"{self.query_count} queries\""
+                ),
+                *(
+                    f"{stage_name};dur={duration * 1000:.1f}"
+                    for stage_name, duration in self.durations.items()
+                    if stage_name != "db"
+                ),
+            ),
+        )
+
+
+@contextlib.contextmanager
+def _measure_stage(stage_name: str) -> Iterator[None]:
+    request_timings: RequestTimings | None = _current_request_timings.get()
+    if request_timings is None:
+        yield
+        return
+
+    start_time: float = time.perf_counter()
+    try:
+        yield
+    finally:
+        request_timings.durations[stage_name] += time.perf_counter() - start_time
+
+
+def record_timing(stage_name: str) -> Callable[[Callable[P, T]], Callable[P, T]]:
+    """
+    Decorate a function so its duration is added to the current request's named stage.
+
+    Calls made outside a request (or with the middleware disabled)
+    are only recorded in the application metrics.
+    """
+    def decorator(func: Callable[P, T]) -> Callable[P, T]:
+        @functools.wraps(func)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            start_time: float = time.perf_counter()
+            try:
+                with _measure_stage(stage_name):
+                    return func(*args, **kwargs)
+            finally:
+                metrics.STAGE_DURATION.observe(
+                    time.perf_counter() - start_time,
+                    stage=stage_name,
+                    function=func.__name__,
+                )
+
+        return wrapper
+
+    return decorator
+
+
+class RequestTimingMiddleware:
+    """
+    Middleware to measure where the time of each request is spent.
+
+    This middleware should be first in `MIDDLEWARE`, so the total time includes every other
+    middleware.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponseBase]) -> None:
+        """Store the next middleware (or view) in the request processing chain."""
+        self.get_response: Callable[[HttpRequest], HttpResponseBase] = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponseBase:
+        """Process a single request, measuring its stages & reporting the timings."""
+        request_timings: RequestTimings = RequestTimings(
+            capture_queries=bool(settings.SLOW_REQUEST_THRESHOLD),
+        )
+        request_timings_token: Token[RequestTimings | None] = _current_request_timings.set(
+            request_timings,
+        )
+
+        try:
+            with contextlib.ExitStack() as exit_stack:
+                connection_alias: str
+                for connection_alias in connections:
+                    exit_stack.enter_context(
+                        connections[connection_alias].execute_wrapper(request_timings),
+                    )
+
+                response: HttpResponseBase = self.get_response(request)
+
+        finally:
+            _current_request_timings.reset(request_timings_token)
+
+        total_duration: float = request_timings.total_duration
+
+        if settings.SERVER_TIMING_ENABLED:
+            response["Server-Timing"] = request_timings.get_server_timing_header(
+                total_duration,
+            )
+
+        self._log_request_timings(request, response, request_timings, total_duration)
+        self._record_request_metrics(request, response, request_timings, total_duration)
+
+        return response
+
+    # noinspection PyMethodMayBeStatic
+    def process_template_response(self, request: HttpRequest, response: SimpleTemplateResponse) -> SimpleTemplateResponse:  # noqa: E501, ARG002
+        """Measure the time spent rendering the response's template."""
+        request_timings: RequestTimings | None = _current_request_timings.get()
+        if request_timings is None:
+            return response
+
+        original_render: Callable[[], SimpleTemplateResponse] = response.render
+
+        def timed_render() -> SimpleTemplateResponse:
+            with _measure_stage("template"):
+                return original_render()
+
+        response.render = timed_render  # type: ignore[method-assign]
+
+        return response
+
+    @staticmethod
+    def _record_request_metrics(request: HttpRequest, response: HttpResponseBase, request_timings: RequestTimings, total_duration: float) -> None:  # noqa: E501
+        url_name: str = (
+            request.resolver_match.view_name
+            if request.resolver_match is not None
+            else "unresolved"
+        )
+
+        metrics.HTTP_REQUESTS.inc(
+            url_name=url_name,
+            method=request.method,
+            status=response.status_code,
+        )
+        metrics.HTTP_REQUEST_DURATION.observe(total_duration, url_name=url_name)
+        metrics.HTTP_REQUEST_DB_QUERIES.observe(request_timings.query_count, url_name=url_name)
+        metrics.HTTP_REQUEST_DB_DURATION.observe(
+            request_timings.durations["db"],
+            url_name=url_name,
+        )
+
+    @staticmethod
+    def _log_request_timings(request: HttpRequest, response: HttpResponseBase, request_timings: RequestTimings, total_duration: float) -> None:  # noqa: E501
+        log_message: str = " ".join(
+            (
+                f"method={request.method}",
+                f"path={request.path}",
+                f"status={response.status_code}",
+                f"total_ms={total_duration * 1000:.1f}",
+                f"db_ms={request_timings.durations["db"] * 1000:.1f}",
+                f"queries={request_timings.query_count}",
+                *(
+                    f"{stage_name}_ms={duration * 1000:.1f}"
+                    for stage_name, duration in request_timings.durations.items()
+                    if stage_name != "db"
+                ),
+            ),
+        )
+
+        SLOW_REQUEST: Final[bool] = bool(
+            settings.SLOW_REQUEST_THRESHOLD
+            and total_duration >= settings.SLOW_REQUEST_THRESHOLD  # noqa: COM812
+        )
+        if not SLOW_REQUEST:
+            logger.info(log_message)
+            return
+
+        logger.warning(
+            "slow_request %s\n%s",
+            log_message,
+            "\n".join(
+                f"  [{duration * 1000:.1f}ms] {sql}"
+                for sql, duration in request_timings.captured_queries
+            ),
+        )
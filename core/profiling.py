@@ -0,0 +1,266 @@
+"""
+On-demand profiling of single requests, triggered by staff users.
+
+A staff user can profile any request by adding the `profile_request` GET parameter
+(or sending the `X-Profile-Request` header).
+That request is then run under `cProfile`, while its call stack is periodically sampled
+& every SQL query it makes is captured.
+The results are saved within `REQUEST_PROFILES_DIRECTORY` as a `.prof` file (for pstats),
+a collapsed-stack `.collapsed` file (for flamegraph tools) & a `.sql` file,
+which are all listed on the "admin/request-profiles/" page.
+The captured SQL queries include their parameters,
+so the profiles directory & its files are only readable by the owning user.
+"""
+
+from collections.abc import Sequence
+
+__all__: Sequence[str] = (
+    "RequestProfile",
+    "RequestProfilerMiddleware",
+    "PROFILE_FILE_EXTENSIONS",
+    "get_request_profiles",
+    "get_request_profile_file_path",
+)
+
+import contextlib
+import cProfile
+import json
+import marshal
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from collections.abc import Callable, Mapping
+from pathlib import Path
+from typing import TYPE_CHECKING, Final, NamedTuple, override
+
+from django.conf import settings
+from django.db import connections
+from django.http import HttpRequest, HttpResponseBase
+from django.utils import timezone
+
+if TYPE_CHECKING:
+    from types import FrameType
+
+PROFILE_FILE_EXTENSIONS: Final[Sequence[str]] = ("prof", "collapsed", "sql")
+MAX_STORED_PROFILES: Final[int] = 50
+PROFILES_DIRECTORY_MODE: Final[int] = 0o700
+PROFILE_FILE_MODE: Final[int] = 0o600
+SAMPLE_INTERVAL: Final[float] = 0.001
+
+_PROFILE_ID_REGEX: Final[re.Pattern[str]] = re.compile(r"\A\d{8}-\d{6}-[0-9a-f]{8}\Z")
+
+# NOTE: Only one cProfile profiler can be active at a time, so concurrent profiling requests are served without being profiled
+_profiler_lock: threading.Lock = threading.Lock()
+
+
+class RequestProfile(NamedTuple):
+    """The details of a single profiled request."""
+
+    profile_id: str
+    method: str
+    path: str
+    user: str
+    status_code: int
+    duration: float
+    query_count: int
+    date_time_created: str
+
+
+class _StackSampler(threading.Thread):
+    """Background thread that counts how often each call stack of another thread is seen."""
+
+    @override
+    def __init__(self, thread_id: int) -> None:
+        super().__init__(name="request-profiler-sampler", daemon=True)
+
+        self.thread_id: int = thread_id
+        self.stacks: Counter[str] = Counter()
+        self._stop_sampling: threading.Event = threading.Event()
+
+    @override
+    def run(self) -> None:
+        while not self._stop_sampling.wait(SAMPLE_INTERVAL):
+            # noinspection PyProtectedMember
+            frame: FrameType | None = sys._current_frames().get(self.thread_id)  # noqa: SLF001
+
+            frame_names: list[str] = []
+            while frame is not None:
+                frame_names.append(
+                    f"{frame.f_globals.get("__name__", "?")}.{frame.f_code.co_qualname}",
+                )
+                frame = frame.f_back
+
+            if frame_names:
+                self.stacks[";".join(reversed(frame_names))] += 1
+
+    def stop(self) -> None:
+        """Stop sampling, waiting for the final sample to be taken."""
+        self._stop_sampling.set()
+        self.join()
+
+
+class _QueryCapture:
+    """Execute wrapper that stores every SQL query made, along with its duration."""
+
+    def __init__(self) -> None:
+        self.queries: list[tuple[str, object, float]] = []
+
+    def __call__(self, execute: Callable[..., object], sql: str, params: object, many: bool, context: Mapping[str, object]) -> object:  # noqa: E501, FBT001
+        start_time: float = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, params, time.perf_counter() - start_time))
+
+
+def _get_profiles_directory() -> Path:
+    return Path(settings.REQUEST_PROFILES_DIRECTORY)
+
+
+def _write_private_file(file_path: Path, data: bytes) -> None:
+    file_descriptor: int = os.open(
+        file_path,
+        os.O_WRONLY | os.O_CREAT | os.O_TRUNC,
+        PROFILE_FILE_MODE,
+    )
+    with os.fdopen(file_descriptor, "wb") as file:
+        file.write(data)
+
+
+def get_request_profiles() -> Sequence[RequestProfile]:
+    """Return every stored request profile, newest first."""
+    profiles_directory: Path = _get_profiles_directory()
+    if not profiles_directory.is_dir():
+        return []
+
+    return [
+        RequestProfile(**json.loads(profile_details_path.read_text()))
+        for profile_details_path
+        in sorted(profiles_directory.glob("*.json"), reverse=True)
+    ]
+
+
+def get_request_profile_file_path(profile_id: str, extension: str) -> Path | None:
+    """Return the path of one of a stored profile's files, or `None` if it does not exist."""
+    if extension not in PROFILE_FILE_EXTENSIONS or not _PROFILE_ID_REGEX.match(profile_id):
+        return None
+
+    profile_file_path: Path = _get_profiles_directory() / f"{profile_id}.{extension}"
+    return profile_file_path if profile_file_path.is_file() else None
+
+
+class RequestProfilerMiddleware:
+    """
+    Middleware to profile single requests, when asked to by a staff user.
+
+    This middleware must come after `AuthenticationMiddleware` in `MIDDLEWARE`,
+    so the requesting user is known.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponseBase]) -> None:
+        """Store the next middleware (or view) in the request processing chain."""
+        self.get_response: Callable[[HttpRequest], HttpResponseBase] = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponseBase:
+        """Process a single request, profiling it if requested."""
+        if not self._should_profile(request) or not _profiler_lock.acquire(blocking=False):
+            return self.get_response(request)
+
+        try:
+            return self._profile_request(request)
+        finally:
+            _profiler_lock.release()
+
+    @staticmethod
+    def _should_profile(request: HttpRequest) -> bool:
+        if not settings.REQUEST_PROFILER_ENABLED:
+            return False
+
+        PROFILE_REQUESTED: Final[bool] = bool(
+            "profile_request" in request.GET
+            or request.headers.get("X-Profile-Request")  # noqa: COM812
+        )
+        return PROFILE_REQUESTED and request.user.is_authenticated and request.user.is_staff
+
+    def _profile_request(self, request: HttpRequest) -> HttpResponseBase:
+        profiler: cProfile.Profile = cProfile.Profile()
+        query_capture: _QueryCapture = _QueryCapture()
+        stack_sampler: _StackSampler = _StackSampler(threading.get_ident())
+
+        start_time: float = time.perf_counter()
+        stack_sampler.start()
+        try:
+            with contextlib.ExitStack() as exit_stack:
+                connection_alias: str
+                for connection_alias in connections:
+                    exit_stack.enter_context(
+                        connections[connection_alias].execute_wrapper(query_capture),
+                    )
+
+                profiler.enable()
+                try:
+                    response: HttpResponseBase = self.get_response(request)
+                finally:
+                    profiler.disable()
+        finally:
+            stack_sampler.stop()
+
+        request_profile: RequestProfile = RequestProfile(
+            profile_id=f"{timezone.now():%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:8]}",
+            method=request.method or "",
+            path=request.get_full_path(),
+            user=str(request.user),
+            status_code=response.status_code,
+            duration=time.perf_counter() - start_time,
+            query_count=len(query_capture.queries),
+            date_time_created=timezone.now().isoformat(),
+        )
+        self._save_request_profile(request_profile, profiler, stack_sampler, query_capture)
+
+        response["X-Request-Profile"] = request_profile.profile_id
+
+        return response
+
+    @staticmethod
+    def _save_request_profile(request_profile: RequestProfile, profiler: cProfile.Profile, stack_sampler: _StackSampler, query_capture: _QueryCapture) -> None:  # noqa: E501
+        profiles_directory: Path = _get_profiles_directory()
+        profiles_directory.mkdir(mode=PROFILES_DIRECTORY_MODE, parents=True, exist_ok=True)
+        # NOTE: The directory may already exist, or have been created with a mode reduced by the umask, so its mode is always set explicitly
+        profiles_directory.chmod(PROFILES_DIRECTORY_MODE)
+
+        profile_path_prefix: str = str(profiles_directory / request_profile.profile_id)
+
+        # NOTE: This is equivalent to `profiler.dump_stats()`, which cannot restrict the mode of the file it creates
+        profiler.create_stats()
+        _write_private_file(
+            Path(f"{profile_path_prefix}.prof"),
+            marshal.dumps(profiler.stats),  # type: ignore[attr-defined]
+        )
+        _write_private_file(
+            Path(f"{profile_path_prefix}.collapsed"),
+            "".join(
+                f"{stack} {sample_count}\n"
+                for stack, sample_count in stack_sampler.stacks.most_common()
+            ).encode(),
+        )
+        _write_private_file(
+            Path(f"{profile_path_prefix}.sql"),
+            "".join(
+                f"-- [{duration * 1000:.1f}ms] params: {params!r}\n{sql};\n\n"
+                for sql, params, duration in query_capture.queries
+            ).encode(),
+        )
+        _write_private_file(
+            Path(f"{profile_path_prefix}.json"),
+            json.dumps(request_profile._asdict()).encode(),
+        )
+
+        old_profile_details_path: Path
+        for old_profile_details_path in sorted(profiles_directory.glob("*.json"), reverse=True)[MAX_STORED_PROFILES:]:  # noqa: E501
+            extension: str
+            for extension in (*PROFILE_FILE_EXTENSIONS, "json"):
+                old_profile_details_path.with_suffix(f".{extension}").unlink(missing_ok=True)
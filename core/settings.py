@@ -11,6 +11,7 @@ __all__: Sequence[str] = ("BASE_DIR", "LOG_LEVEL_CHOICES")
 import inspect
 import re
 import sys
+import tempfile
 from pathlib import Path
 from typing import Final
 
@@ -41,6 +42,7 @@ RUNNING_IN_CI: Final[bool] = (
     or "migrate" in sys.argv
     or "makemigrations" in sys.argv
     or "test" in sys.argv
+    or "run_benchmarks" in sys.argv
 )
 
 EnvClass: type[Env] = CIPipelineEnv if RUNNING_IN_CI else FileAwareEnv  # type: ignore[no-any-unimported]
@@ -55,6 +57,31 @@ env: Env = EnvClass(  # type: ignore[no-any-unimported]
     EMAIL_USE_TLS=(bool, False),
     EMAIL_USE_SSL=(bool, False),
     SITE_ID=(int, 1),
+    CACHE_URL=(str, "locmemcache://ratemymodule"),
+    REST_RESPONSE_CACHE_TIMEOUT=(int, 3600),
+    DATABASE_URL=(str, f"sqlite:///{BASE_DIR / "core.db"}"),
+    DATABASE_CONN_MAX_AGE=(int, 60),
+    DATABASE_CONN_HEALTH_CHECKS=(bool, True),
+    DATABASE_REPLICA_URLS=(list, []),
+    DATABASE_REPLICA_STICKY_SECONDS=(int, 10),
+    DATABASE_INTEGRITY_BACKEND=(str, "python"),
+    SQLITE_JOURNAL_MODE=(str, "WAL"),
+    SQLITE_SYNCHRONOUS=(str, "NORMAL"),
+    SQLITE_MMAP_SIZE=(int, 134217728),
+    SQLITE_CACHE_SIZE=(int, -20000),
+    SQLITE_BUSY_TIMEOUT=(int, 5000),
+    REACTION_BUFFER_ENABLED=(bool, False),
+    REACTION_BUFFER_FLUSH_INTERVAL=(float, 2.0),
+    SERVER_TIMING_ENABLED=(bool, True),
+    SLOW_REQUEST_THRESHOLD=(float, 0.0),
+    METRICS_ENABLED=(bool, True),
+    METRICS_DIRECTORY=(str, ""),
+    METRICS_BEARER_TOKEN=(str, ""),
+    REQUEST_PROFILER_ENABLED=(bool, False),
+    REQUEST_PROFILES_DIRECTORY=(
+        str,
+        str(Path(tempfile.gettempdir()) / "ratemymodule-request-profiles"),
+    ),
 )
 
 
@@ -303,11 +330,14 @@ INSTALLED_APPS = [
 ]
 # noinspection PyUnresolvedReferences
 MIDDLEWARE = [
+    "core.performance.RequestTimingMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "core.database.ReadReplicaMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "core.profiling.RequestProfilerMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "django.contrib.sites.middleware.CurrentSiteMiddleware",
@@ -420,16 +450,182 @@ TEMPLATES = [
 ]
 
 
+# REST API Settings
+
+REST_FRAMEWORK = {
+    "DEFAULT_PAGINATION_CLASS": "api_rest.pagination.PrefixableViewSetCursorPagination",
+    "PAGE_SIZE": 50,
+}
+
+
 # Database Settings
 
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "core.db",
-    },
+DATABASES = {"default": env.db_url("DATABASE_URL")}
+
+if DATABASES["default"]["ENGINE"] not in {
+    "django.db.backends.sqlite3",
+    "django.db.backends.postgresql",
+}:
+    INVALID_DATABASE_ENGINE_MESSAGE: Final[str] = (
+        "DATABASE_URL must point to either an SQLite or a PostgreSQL database."
+    )
+    raise ImproperlyConfigured(INVALID_DATABASE_ENGINE_MESSAGE)
+
+if env("DATABASE_CONN_MAX_AGE") < 0:
+    INVALID_DATABASE_CONN_MAX_AGE_MESSAGE: Final[str] = (
+        "DATABASE_CONN_MAX_AGE must be a non-negative number of seconds."
+    )
+    raise ImproperlyConfigured(INVALID_DATABASE_CONN_MAX_AGE_MESSAGE)
+DATABASES["default"]["CONN_MAX_AGE"] = env("DATABASE_CONN_MAX_AGE")
+DATABASES["default"]["CONN_HEALTH_CHECKS"] = env("DATABASE_CONN_HEALTH_CHECKS")
+
+replica_index: int
+replica_database_url: str
+for replica_index, replica_database_url in enumerate(env("DATABASE_REPLICA_URLS")):
+    DATABASES[f"replica_{replica_index}"] = {
+        **env.db_url_config(replica_database_url.strip()),
+        "CONN_MAX_AGE": DATABASES["default"]["CONN_MAX_AGE"],
+        "CONN_HEALTH_CHECKS": DATABASES["default"]["CONN_HEALTH_CHECKS"],
+        "TEST": {"MIRROR": "default"},
+    }
+
+    if DATABASES[f"replica_{replica_index}"]["ENGINE"] != DATABASES["default"]["ENGINE"]:
+        INVALID_DATABASE_REPLICA_ENGINE_MESSAGE: Final[str] = (
+            "Every URL in DATABASE_REPLICA_URLS must use the same database engine "
+            "as DATABASE_URL."
+        )
+        raise ImproperlyConfigured(INVALID_DATABASE_REPLICA_ENGINE_MESSAGE)
+
+DATABASE_REPLICAS: Sequence[str] = tuple(
+    database_alias for database_alias in DATABASES if database_alias != "default"
+)
+DATABASE_ROUTERS = ["core.database.ReadReplicaRouter"]
+
+if env("DATABASE_REPLICA_STICKY_SECONDS") < 0:
+    INVALID_DATABASE_REPLICA_STICKY_SECONDS_MESSAGE: Final[str] = (
+        "DATABASE_REPLICA_STICKY_SECONDS must be a non-negative number of seconds."
+    )
+    raise ImproperlyConfigured(INVALID_DATABASE_REPLICA_STICKY_SECONDS_MESSAGE)
+DATABASE_REPLICA_STICKY_SECONDS = env("DATABASE_REPLICA_STICKY_SECONDS")
+
+SQLITE_JOURNAL_MODE_CHOICES: Final[Sequence[str]] = (
+    "DELETE",
+    "TRUNCATE",
+    "PERSIST",
+    "MEMORY",
+    "WAL",
+    "OFF",
+)
+raw_sqlite_journal_mode: str = env("SQLITE_JOURNAL_MODE").upper().strip()
+if raw_sqlite_journal_mode not in SQLITE_JOURNAL_MODE_CHOICES:
+    INVALID_SQLITE_JOURNAL_MODE_MESSAGE: Final[str] = (
+        f"SQLITE_JOURNAL_MODE must be one of {
+            ",".join(
+                f"{journal_mode_choice!r}"
+                for journal_mode_choice in SQLITE_JOURNAL_MODE_CHOICES[:-1]
+            )
+        } or \"{
+            SQLITE_JOURNAL_MODE_CHOICES[-1]
+        }\"."
+    )
+    raise ImproperlyConfigured(INVALID_SQLITE_JOURNAL_MODE_MESSAGE)
+
+SQLITE_SYNCHRONOUS_CHOICES: Final[Sequence[str]] = ("OFF", "NORMAL", "FULL", "EXTRA")
+raw_sqlite_synchronous: str = env("SQLITE_SYNCHRONOUS").upper().strip()
+if raw_sqlite_synchronous not in SQLITE_SYNCHRONOUS_CHOICES:
+    INVALID_SQLITE_SYNCHRONOUS_MESSAGE: Final[str] = (
+        f"SQLITE_SYNCHRONOUS must be one of {
+            ",".join(
+                f"{synchronous_choice!r}"
+                for synchronous_choice in SQLITE_SYNCHRONOUS_CHOICES[:-1]
+            )
+        } or \"{
+            SQLITE_SYNCHRONOUS_CHOICES[-1]
+        }\"."
+    )
+    raise ImproperlyConfigured(INVALID_SQLITE_SYNCHRONOUS_MESSAGE)
+
+if env("SQLITE_MMAP_SIZE") < 0 or env("SQLITE_BUSY_TIMEOUT") < 0:
+    INVALID_SQLITE_SIZE_MESSAGE: Final[str] = (
+        "SQLITE_MMAP_SIZE & SQLITE_BUSY_TIMEOUT must be non-negative integers."
+    )
+    raise ImproperlyConfigured(INVALID_SQLITE_SIZE_MESSAGE)
+
+SQLITE_PRAGMAS: dict[str, str | int] = {
+    "journal_mode": raw_sqlite_journal_mode,
+    "synchronous": raw_sqlite_synchronous,
+    "mmap_size": env("SQLITE_MMAP_SIZE"),
+    "cache_size": env("SQLITE_CACHE_SIZE"),
+    "busy_timeout": env("SQLITE_BUSY_TIMEOUT"),
 }
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+DATABASE_INTEGRITY_BACKEND_CHOICES: Final[Sequence[str]] = ("python", "database")
+DATABASE_INTEGRITY_BACKEND: str = env("DATABASE_INTEGRITY_BACKEND").lower().strip()
+if DATABASE_INTEGRITY_BACKEND not in DATABASE_INTEGRITY_BACKEND_CHOICES:
+    INVALID_DATABASE_INTEGRITY_BACKEND_MESSAGE: Final[str] = (
+        f"DATABASE_INTEGRITY_BACKEND must be one of {
+            ",".join(
+                f"{integrity_backend_choice!r}"
+                for integrity_backend_choice in DATABASE_INTEGRITY_BACKEND_CHOICES[:-1]
+            )
+        } or \"{
+            DATABASE_INTEGRITY_BACKEND_CHOICES[-1]
+        }\"."
+    )
+    raise ImproperlyConfigured(INVALID_DATABASE_INTEGRITY_BACKEND_MESSAGE)
+
+
+# Cache Settings
+
+CACHES = {"default": env.cache_url("CACHE_URL")}
+CACHES["default"].setdefault("KEY_PREFIX", "ratemymodule")
+
+if env("REST_RESPONSE_CACHE_TIMEOUT") < 0:
+    INVALID_REST_RESPONSE_CACHE_TIMEOUT_MESSAGE: Final[str] = (
+        "REST_RESPONSE_CACHE_TIMEOUT must be a non-negative number of seconds."
+    )
+    raise ImproperlyConfigured(INVALID_REST_RESPONSE_CACHE_TIMEOUT_MESSAGE)
+REST_RESPONSE_CACHE_TIMEOUT = env("REST_RESPONSE_CACHE_TIMEOUT")
+
+# NOTE: Data versions (& so ETags & cached responses) are only correct when every process, including management commands, bumps the same shared versions
+PROCESS_LOCAL_CACHE_BACKENDS: Final[Sequence[str]] = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+DATA_VERSIONS_ENABLED = CACHES["default"]["BACKEND"] not in PROCESS_LOCAL_CACHE_BACKENDS
+
+
+# Reaction Buffer Settings
+
+REACTION_BUFFER_ENABLED = env("REACTION_BUFFER_ENABLED")
+
+if env("REACTION_BUFFER_FLUSH_INTERVAL") <= 0:
+    INVALID_REACTION_BUFFER_FLUSH_INTERVAL_MESSAGE: Final[str] = (
+        "REACTION_BUFFER_FLUSH_INTERVAL must be a positive number of seconds."
+    )
+    raise ImproperlyConfigured(INVALID_REACTION_BUFFER_FLUSH_INTERVAL_MESSAGE)
+REACTION_BUFFER_FLUSH_INTERVAL = env("REACTION_BUFFER_FLUSH_INTERVAL")
+
+
+# Performance Instrumentation Settings
+
+SERVER_TIMING_ENABLED = env("SERVER_TIMING_ENABLED")
+
+if env("SLOW_REQUEST_THRESHOLD") < 0:
+    INVALID_SLOW_REQUEST_THRESHOLD_MESSAGE: Final[str] = (
+        "SLOW_REQUEST_THRESHOLD must be a non-negative number of seconds."
+    )
+    raise ImproperlyConfigured(INVALID_SLOW_REQUEST_THRESHOLD_MESSAGE)
+SLOW_REQUEST_THRESHOLD = env("SLOW_REQUEST_THRESHOLD")
+
+METRICS_ENABLED = env("METRICS_ENABLED")
+METRICS_DIRECTORY = env("METRICS_DIRECTORY")
+METRICS_BEARER_TOKEN = env("METRICS_BEARER_TOKEN")
+
+REQUEST_PROFILER_ENABLED = env("REQUEST_PROFILER_ENABLED")
+REQUEST_PROFILES_DIRECTORY = env("REQUEST_PROFILES_DIRECTORY")
+
 
 # Internationalization, Language & Time Settings
 
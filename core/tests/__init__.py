@@ -0,0 +1,5 @@
+"""Automated test suite for `core` project package."""
+
+from collections.abc import Sequence
+
+__all__: Sequence[str] = ()
@@ -0,0 +1,56 @@
+"""Test suite for the project-wide cache API."""
+
+from collections.abc import Sequence
+
+__all__: Sequence[str] = ()
+
+from django.core.cache import cache
+
+from core.cache import CacheNamespace
+from ratemymodule.tests.utils import TestCase
+
+
+class CacheNamespaceTests(TestCase):
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cache.clear()
+        super().tearDownClass()
+
+    def test_get_or_compute_only_computes_once(self) -> None:
+        namespace: CacheNamespace = CacheNamespace("test-compute-once")
+        compute_calls: list[int] = []
+
+        def compute() -> int:
+            compute_calls.append(1)
+            return 42
+
+        self.assertEqual(namespace.get_or_compute("answer", compute=compute), 42)
+        self.assertEqual(namespace.get_or_compute("answer", compute=compute), 42)
+        self.assertEqual(len(compute_calls), 1)
+
+    def test_invalidate_removes_all_values(self) -> None:
+        namespace: CacheNamespace = CacheNamespace("test-invalidate")
+        namespace.set("first", value=1)
+        namespace.set("second", value=2)
+
+        namespace.invalidate()
+
+        self.assertIsNone(namespace.get("first"))
+        self.assertIsNone(namespace.get("second"))
+        self.assertEqual(namespace.get_or_compute("first", compute=lambda: 3), 3)
+
+    def test_namespaces_do_not_share_keys(self) -> None:
+        CacheNamespace("test-first-namespace").set("key", value="first")
+
+        self.assertIsNone(CacheNamespace("test-second-namespace").get("key"))
+
+    def test_locked_key_waits_then_computes(self) -> None:
+        namespace: CacheNamespace = CacheNamespace("test-locked")
+        namespace.LOCK_WAIT_TIMEOUT = 0.1  # type: ignore[misc]
+        namespace.cache.add(
+            f"{namespace.make_key("key")}:lock",
+            "other-token",
+            version=namespace.version,
+        )
+
+        self.assertEqual(namespace.get_or_compute("key", compute=lambda: "value"), "value")
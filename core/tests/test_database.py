@@ -0,0 +1,76 @@
+"""Test suite for the database connection configuration & routing."""
+
+from collections.abc import Sequence
+
+__all__: Sequence[str] = ()
+
+import unittest
+
+from django.conf import settings
+from django.db import connection
+from django.http import HttpRequest, HttpResponse, HttpResponseBase
+from django.test import RequestFactory, override_settings
+
+from core.database import (
+    STICKY_PRIMARY_DATABASE_COOKIE_NAME,
+    ReadReplicaMiddleware,
+    ReadReplicaRouter,
+)
+from ratemymodule.models import Post
+from ratemymodule.tests.utils import TestCase
+
+
+@unittest.skipUnless(connection.vendor == "sqlite", "Only SQLite connections set pragmas.")
+class SQLitePragmasTests(TestCase):
+    def test_pragmas_set_on_connection(self) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA busy_timeout")
+            busy_timeout: int = cursor.fetchone()[0]
+            cursor.execute("PRAGMA cache_size")
+            cache_size: int = cursor.fetchone()[0]
+
+        self.assertEqual(busy_timeout, settings.SQLITE_PRAGMAS["busy_timeout"])
+        self.assertEqual(cache_size, settings.SQLITE_PRAGMAS["cache_size"])
+
+
+@override_settings(DATABASE_REPLICAS=("replica_0",), DATABASE_REPLICA_STICKY_SECONDS=10)
+class ReadReplicaRoutingTests(TestCase):
+    @staticmethod
+    def _route_request(request: HttpRequest, *, write: bool = False) -> tuple[HttpResponseBase, str | None]:  # noqa: E501
+        read_database: list[str | None] = []
+
+        def get_response(_request: HttpRequest) -> HttpResponseBase:
+            if write:
+                ReadReplicaRouter().db_for_write(Post)
+
+            read_database.append(ReadReplicaRouter().db_for_read(Post))
+            return HttpResponse()
+
+        return ReadReplicaMiddleware(get_response)(request), read_database[0]
+
+    def test_reads_outside_requests_use_primary(self) -> None:
+        self.assertIsNone(ReadReplicaRouter().db_for_read(Post))
+
+    def test_safe_request_reads_use_replica(self) -> None:
+        response: HttpResponseBase
+        read_database: str | None
+        response, read_database = self._route_request(RequestFactory().get("/"))
+
+        self.assertEqual(read_database, "replica_0")
+        self.assertNotIn(STICKY_PRIMARY_DATABASE_COOKIE_NAME, response.cookies)
+
+    def test_unsafe_request_reads_use_primary(self) -> None:
+        self.assertIsNone(self._route_request(RequestFactory().post("/"))[1])
+
+    def test_write_makes_later_requests_stick_to_primary(self) -> None:
+        response: HttpResponseBase
+        read_database: str | None
+        response, read_database = self._route_request(RequestFactory().get("/"), write=True)
+
+        self.assertIsNone(read_database)
+        self.assertIn(STICKY_PRIMARY_DATABASE_COOKIE_NAME, response.cookies)
+
+        sticky_request: HttpRequest = RequestFactory().get("/")
+        sticky_request.COOKIES[STICKY_PRIMARY_DATABASE_COOKIE_NAME] = "1"
+
+        self.assertIsNone(self._route_request(sticky_request)[1])
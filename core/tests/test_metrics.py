@@ -0,0 +1,132 @@
+"""Test suite for the application metrics & their Prometheus endpoint."""
+
+from collections.abc import Sequence
+
+__all__: Sequence[str] = ()
+
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.exceptions import PermissionDenied
+from django.http import HttpRequest, HttpResponse
+from django.test import RequestFactory, override_settings
+
+from core.metrics import Counter, Histogram, MetricsRegistry, _FileValueStore
+from core.views import MetricsView
+from ratemymodule.models import User
+from ratemymodule.tests.utils import TestCase, TestDataGenerator
+
+
+class MetricsRegistryTests(TestCase):
+    def test_metrics_are_aggregated_across_processes(self) -> None:
+        registry: MetricsRegistry = MetricsRegistry()
+        requests_counter: Counter = Counter(
+            "test_requests_total",
+            "Test requests.",
+            ("url_name",),
+            registry=registry,
+        )
+        duration_histogram: Histogram = Histogram(
+            "test_duration_seconds",
+            "Test durations.",
+            buckets=(0.1, 1),
+            registry=registry,
+        )
+
+        with tempfile.TemporaryDirectory() as metrics_directory:
+            other_worker_store: _FileValueStore = _FileValueStore(
+                Path(metrics_directory) / "metrics-other.db",
+            )
+            other_worker_store.increment(
+                ("test_requests_total", "test_requests_total", (("url_name", "home"),)),
+                2,
+            )
+
+            with override_settings(METRICS_ENABLED=True, METRICS_DIRECTORY=metrics_directory):
+                requests_counter.inc(url_name="home")
+                duration_histogram.observe(0.5)
+
+                exposition: str = registry.generate_latest()
+
+        self.assertEqual(
+            exposition,
+            "# HELP test_requests_total Test requests.\n"
+            "# TYPE test_requests_total counter\n"
+            "test_requests_total{url_name=\"home\"} 3.0\n"
+            "# HELP test_duration_seconds Test durations.\n"
+            "# TYPE test_duration_seconds histogram\n"
+            "test_duration_seconds_bucket{le=\"0.1\"} 0.0\n"
+            "test_duration_seconds_bucket{le=\"1.0\"} 1.0\n"
+            "test_duration_seconds_bucket{le=\"+Inf\"} 1.0\n"
+            "test_duration_seconds_count 1.0\n"
+            "test_duration_seconds_sum 0.5\n",
+        )
+
+    def test_stopped_workers_are_archived(self) -> None:
+        registry: MetricsRegistry = MetricsRegistry()
+        Counter("test_archived_total", "Test archived.", registry=registry)
+
+        stopped_process: subprocess.CompletedProcess[bytes] = subprocess.run(
+            [sys.executable, "-c", "import os; print(os.getpid())"],  # noqa: S603
+            capture_output=True,
+            check=True,
+        )
+        stopped_pid: int = int(stopped_process.stdout)
+
+        with tempfile.TemporaryDirectory() as metrics_directory:
+            stopped_worker_file_path: Path = (
+                Path(metrics_directory) / f"metrics-{stopped_pid}-abc123.db"
+            )
+            _FileValueStore(stopped_worker_file_path).increment(
+                ("test_archived_total", "test_archived_total", ()),
+                4,
+            )
+
+            with override_settings(METRICS_ENABLED=True, METRICS_DIRECTORY=metrics_directory):
+                first_exposition: str = registry.generate_latest()
+                second_exposition: str = registry.generate_latest()
+
+            self.assertFalse(stopped_worker_file_path.exists())
+            self.assertTrue((Path(metrics_directory) / "metrics-archive.db").exists())
+
+        self.assertIn("test_archived_total 4.0\n", first_exposition)
+        self.assertEqual(first_exposition, second_exposition)
+
+
+@override_settings(METRICS_ENABLED=True, METRICS_DIRECTORY="", METRICS_BEARER_TOKEN="secret")  # noqa: S106
+class MetricsViewTests(TestCase):
+    @staticmethod
+    def _get_metrics(user: User | AnonymousUser, **headers: str) -> HttpResponse:
+        request: HttpRequest = RequestFactory().get("/metrics", headers=headers)
+        request.user = user
+        return MetricsView.as_view()(request)  # type: ignore[no-any-return]
+
+    def test_anonymous_users_are_forbidden(self) -> None:
+        with self.assertRaises(PermissionDenied):
+            self._get_metrics(AnonymousUser())
+
+    def test_staff_users_can_view_metrics(self) -> None:
+        response: HttpResponse = self._get_metrics(
+            User.objects.create_user(
+                email=TestDataGenerator.create_user_email(),
+                is_staff=True,
+            ),
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain; version=0.0.4"))
+        self.assertIn(
+            "# TYPE ratemymodule_http_requests_total counter\n",
+            response.content.decode(),
+        )
+
+    def test_bearer_token_allows_scraping(self) -> None:
+        response: HttpResponse = self._get_metrics(
+            AnonymousUser(),
+            Authorization="Bearer secret",
+        )
+
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,57 @@
+"""Test suite for the per-request performance instrumentation."""
+
+from collections.abc import Sequence
+
+__all__: Sequence[str] = ()
+
+import re
+
+from django.http import HttpRequest, HttpResponse, HttpResponseBase
+from django.test import RequestFactory, override_settings
+
+from core.performance import RequestTimingMiddleware, record_timing
+from ratemymodule.models import University
+from ratemymodule.tests.utils import TestCase
+
+
+@record_timing("graphs")
+def _count_universities() -> int:
+    return University.objects.count() + University.objects.filter(name="").count()
+
+
+def _view(_request: HttpRequest) -> HttpResponseBase:
+    return HttpResponse(str(_count_universities()))
+
+
+class RequestTimingMiddlewareTests(TestCase):
+    @override_settings(SERVER_TIMING_ENABLED=True, SLOW_REQUEST_THRESHOLD=0)
+    def test_server_timing_header_includes_stages(self) -> None:
+        with self.assertLogs("ratemymodule.performance", level="INFO") as captured_logs:
+            response: HttpResponseBase = RequestTimingMiddleware(_view)(
+                RequestFactory().get("/"),
+            )
+
+        self.assertRegex(
+            response["Server-Timing"],
+            r"\Atotal;dur=[\d.]+, db;dur=[\d.]+;desc=\"2 queries\", graphs;dur=[\d.]+\Z",
+        )
+        self.assertRegex(
+            captured_logs.output[0],
+            r"method=GET path=/ status=200 total_ms=[\d.]+ db_ms=[\d.]+ queries=2 graphs_ms=",
+        )
+
+    @override_settings(SERVER_TIMING_ENABLED=False, SLOW_REQUEST_THRESHOLD=1e-9)
+    def test_slow_request_logs_sql(self) -> None:
+        with self.assertLogs("ratemymodule.performance", level="WARNING") as captured_logs:
+            response: HttpResponseBase = RequestTimingMiddleware(_view)(
+                RequestFactory().get("/"),
+            )
+
+        self.assertNotIn("Server-Timing", response)
+        self.assertEqual(
+            2,
+            len(re.findall(r"SELECT COUNT\(\*\)", captured_logs.output[0])),
+        )
+
+    def test_record_timing_outside_request(self) -> None:
+        self.assertEqual(0, _count_universities())
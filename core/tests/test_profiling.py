@@ -0,0 +1,108 @@
+"""Test suite for the on-demand request profiler."""
+
+from collections.abc import Sequence
+
+__all__: Sequence[str] = ()
+
+import pstats
+import stat
+import tempfile
+import time
+from pathlib import Path
+from typing import override
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpRequest, HttpResponse, HttpResponseBase
+from django.test import RequestFactory, override_settings
+
+from core.profiling import (
+    RequestProfile,
+    RequestProfilerMiddleware,
+    get_request_profile_file_path,
+    get_request_profiles,
+)
+from ratemymodule.models import University, User
+from ratemymodule.tests.utils import TestCase, TestDataGenerator
+
+
+def _slow_view(_request: HttpRequest) -> HttpResponseBase:
+    time.sleep(0.05)
+    return HttpResponse(str(University.objects.count()))
+
+
+class RequestProfilerMiddlewareTests(TestCase):
+    @override
+    def setUp(self) -> None:
+        super().setUp()
+
+        profiles_directory: tempfile.TemporaryDirectory[str] = tempfile.TemporaryDirectory()
+        self.addCleanup(profiles_directory.cleanup)
+
+        settings_override: override_settings = override_settings(
+            REQUEST_PROFILER_ENABLED=True,
+            REQUEST_PROFILES_DIRECTORY=profiles_directory.name,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_staff_request_is_profiled(self) -> None:
+        request: HttpRequest = RequestFactory().get("/?profile_request")
+        request.user = User.objects.create_user(
+            email=TestDataGenerator.create_user_email(),
+            is_staff=True,
+        )
+
+        response: HttpResponseBase = RequestProfilerMiddleware(_slow_view)(request)
+
+        request_profiles: Sequence[RequestProfile] = get_request_profiles()
+        self.assertEqual(len(request_profiles), 1)
+        self.assertEqual(response["X-Request-Profile"], request_profiles[0].profile_id)
+        self.assertEqual(request_profiles[0].query_count, 1)
+
+        collapsed_stacks_path: Path | None = get_request_profile_file_path(
+            request_profiles[0].profile_id,
+            "collapsed",
+        )
+        if collapsed_stacks_path is None:
+            self.fail("Collapsed stacks file was not saved.")
+        self.assertIn(f"{__name__}._slow_view", collapsed_stacks_path.read_text())
+
+        sql_path: Path | None = get_request_profile_file_path(
+            request_profiles[0].profile_id,
+            "sql",
+        )
+        if sql_path is None:
+            self.fail("SQL file was not saved.")
+        self.assertIn("COUNT(*)", sql_path.read_text())
+
+    def test_profiles_are_only_accessible_by_owner(self) -> None:
+        request: HttpRequest = RequestFactory().get("/?profile_request")
+        request.user = User.objects.create_user(
+            email=TestDataGenerator.create_user_email(),
+            is_staff=True,
+        )
+
+        RequestProfilerMiddleware(_slow_view)(request)
+
+        profiles_directory: Path = Path(settings.REQUEST_PROFILES_DIRECTORY)
+        self.assertEqual(0o700, stat.S_IMODE(profiles_directory.stat().st_mode))
+
+        profile_file_path: Path
+        for profile_file_path in profiles_directory.iterdir():
+            with self.subTest(profile_file_path=profile_file_path):
+                self.assertEqual(0o600, stat.S_IMODE(profile_file_path.stat().st_mode))
+
+        pstats.Stats(str(next(profiles_directory.glob("*.prof"))))
+
+    def test_anonymous_request_is_not_profiled(self) -> None:
+        request: HttpRequest = RequestFactory().get(
+            "/",
+            headers={"X-Profile-Request": "1"},
+        )
+        request.user = AnonymousUser()
+
+        response: HttpResponseBase = RequestProfilerMiddleware(_slow_view)(request)
+
+        self.assertNotIn("X-Request-Profile", response)
+        self.assertFalse(get_request_profiles())
@@ -13,7 +13,13 @@ from django.http import JsonResponse
 from django.urls import URLPattern, URLResolver
 from django.views.generic import RedirectView
 
-from core.views import AdminDocsRedirectView, AdminLoginRedirectView
+from core.views import (
+    AdminDocsRedirectView,
+    AdminLoginRedirectView,
+    MetricsView,
+    RequestProfileDownloadView,
+    RequestProfileListView,
+)
 
 urlpatterns: MutableSequence[URLResolver | URLPattern] = [
     django.urls.path(
@@ -45,7 +51,18 @@ urlpatterns: MutableSequence[URLResolver | URLPattern] = [
         AdminLoginRedirectView.as_view(),
         name="admin_login_redirect",
     ),
+    django.urls.path(
+        r"admin/request-profiles/",
+        admin.site.admin_view(RequestProfileListView.as_view()),
+        name="request_profile_list",
+    ),
+    django.urls.path(
+        r"admin/request-profiles/<str:profile_id>.<str:extension>",
+        admin.site.admin_view(RequestProfileDownloadView.as_view()),
+        name="request_profile_download",
+    ),
     django.urls.path(r"admin/", admin.site.urls),
+    django.urls.path(r"metrics", MetricsView.as_view(), name="metrics"),
     django.urls.path(r"api/htmx/", django.urls.include("api_htmx.urls")),
     django.urls.path(r"api/rest/", django.urls.include("api_rest.urls")),
     django.urls.path(r"", django.urls.include("web.urls")),
@@ -23,6 +23,7 @@ from typing import TypeVar, override
 from urllib.parse import urlparse
 
 import django.urls
+from django.core.management.utils import get_random_secret_key
 from django.http import QueryDict
 from django.utils.functional import lazy
 from environ import Env, FileAwareEnv, ImproperlyConfigured, environ
@@ -53,6 +54,10 @@ class CIPipelineEnv(FileAwareEnv):  # type: ignore[no-any-unimported,misc]
             if var == "TEST_DATA_JSON_FILE_PATH":
                 raise improperly_configured_error from improperly_configured_error
 
+            if var == "SECRET_KEY":
+                # NOTE: Sessions (E.g. those of the test client) must be signed, so a throwaway key is generated for every process
+                return self.parse_value(get_random_secret_key(), cast)  # type: ignore[no-any-return]
+
             if var == "OAUTH_GOOGLE_CLIENT_ID":
                 # noinspection SpellCheckingInspection
                 return self.parse_value(  # type: ignore[no-any-return]
@@ -5,15 +5,31 @@ from collections.abc import Sequence
 __all__: Sequence[str] = (
     "AdminDocsRedirectView",
     "AdminLoginRedirectView",
+    "MetricsView",
+    "RequestProfileDownloadView",
+    "RequestProfileListView",
 )
 
 import abc
-from typing import Final, override
+import hmac
+from typing import TYPE_CHECKING, Final, override
 
 import django.urls
 from django.conf import settings
-from django.http import QueryDict
-from django.views.generic import RedirectView
+from django.contrib import admin
+from django.core.exceptions import PermissionDenied
+from django.http import FileResponse, Http404, HttpRequest, HttpResponse, QueryDict
+from django.views.generic import RedirectView, TemplateView, View
+
+from core import metrics
+from core.profiling import (
+    PROFILE_FILE_EXTENSIONS,
+    get_request_profile_file_path,
+    get_request_profiles,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
 
 
 class _BaseAdminDocsRedirectView(RedirectView, abc.ABC):
@@ -104,3 +120,80 @@ class AdminLoginRedirectView(_BaseAdminDocsRedirectView):
         get_params.update(self._CORE_PARAMS)  # type: ignore[arg-type]
         get_params.setdefault("next", "/admin/")
         return get_params
+
+
+class MetricsView(View):
+    """
+    The current application metrics, in Prometheus text format.
+
+    Only staff users (or requests with the configured `METRICS_BEARER_TOKEN`)
+    are allowed to view the metrics.
+    """
+
+    http_method_names = ("get", "head", "options")
+
+    def _is_allowed(self, request: HttpRequest) -> bool:
+        if request.user.is_authenticated and request.user.is_staff:
+            return True
+
+        if not settings.METRICS_BEARER_TOKEN:
+            return False
+
+        return hmac.compare_digest(
+            request.headers.get("Authorization", ""),
+            f"Bearer {settings.METRICS_BEARER_TOKEN}",
+        )
+
+    @override
+    def get(self, *args: object, **kwargs: object) -> HttpResponse:
+        """Render the metrics aggregated from every worker process."""
+        if not settings.METRICS_ENABLED:
+            raise Http404
+
+        if not self._is_allowed(self.request):
+            raise PermissionDenied
+
+        return HttpResponse(
+            metrics.REGISTRY.generate_latest(),
+            content_type=metrics.PROMETHEUS_CONTENT_TYPE,
+        )
+
+
+class RequestProfileListView(TemplateView):
+    """Admin page listing every stored request profile, with links to download its files."""
+
+    template_name = "admin/request_profiles.html"
+
+    @override
+    def get_context_data(self, **kwargs: object) -> dict[str, object]:
+        return {
+            **super().get_context_data(**kwargs),
+            **admin.site.each_context(self.request),
+            "title": "Request profiles",
+            "request_profiles": get_request_profiles(),
+            "profile_file_extensions": PROFILE_FILE_EXTENSIONS,
+        }
+
+
+class RequestProfileDownloadView(View):
+    """Download one of the files of a stored request profile."""
+
+    http_method_names = ("get", "head", "options")
+
+    @override
+    def get(self, *args: object, **kwargs: object) -> FileResponse:
+        """Send the requested profile file as an attachment."""
+        extension: str = self.kwargs["extension"]
+        profile_file_path: Path | None = get_request_profile_file_path(
+            self.kwargs["profile_id"],
+            extension,
+        )
+        if profile_file_path is None:
+            raise Http404
+
+        return FileResponse(
+            profile_file_path.open("rb"),
+            as_attachment=True,
+            filename=profile_file_path.name,
+            content_type="text/plain" if extension != "prof" else "application/octet-stream",
+        )
@@ -18,7 +18,12 @@ class RateMyModuleConfig(AppConfig):
         """
         Ensure the signal handlers within this app are loaded and waiting for signals.
 
+        The project's database connection signal handlers are also loaded here,
+        because the `core` package is not an installed app.
+
         This ready function should be called whenever this config class is imported.
         """
+        from core import database
         from ratemymodule.models import signals
+        database.ready()
         signals.ready()
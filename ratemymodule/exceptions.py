@@ -2,7 +2,7 @@
 
 from collections.abc import Sequence
 
-__all__: Sequence[str] = ("NotEnoughTestDataError",)
+__all__: Sequence[str] = ("NotEnoughTestDataError", "UnindexedPostFiltersError")
 
 from typing import override
 
@@ -33,3 +33,7 @@ class NotEnoughTestDataError(StopIteration):
         return (
             f"{self.message} (model_name={self.model_name!r}, field_name={self.field_name!r})"
         )
+
+
+class UnindexedPostFiltersError(ValueError):
+    """The given combination of post filters cannot be answered using an index."""
@@ -0,0 +1,5 @@
+"""Custom `manage.py` commands & their helpers for the `ratemymodule` app."""
+
+from collections.abc import Sequence
+
+__all__: Sequence[str] = ()
@@ -0,0 +1,184 @@
+"""Management command to stream every post & its ratings into a CSV or JSON Lines file."""
+
+from collections.abc import Sequence
+
+__all__: Sequence[str] = ("Command",)
+
+import datetime
+from collections.abc import Iterable
+from pathlib import Path
+from typing import IO, Final, override
+
+from django.core.management import BaseCommand, CommandError, CommandParser
+
+from ratemymodule.models import Module, Post, University
+from ratemymodule.models.post_filters import PostFilters
+from ratemymodule.utils.post_export import (
+    POST_EXPORT_FILE_FORMATS,
+    get_post_export_queryset,
+    iter_post_export_lines,
+)
+
+
+class Command(BaseCommand):
+    """
+    Stream posts from the database into a CSV or JSON Lines file.
+
+    See `ratemymodule.utils.post_export` for the columns of each exported row.
+    Unlike the REST API's export, hidden & reported posts are included.
+    """
+
+    help = (
+        "Export posts & their ratings to a CSV or JSON Lines file, "
+        "reading them from the database in chunks."
+    )
+
+    @override
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "file",
+            nargs="?",
+            default="-",
+            help="Path of the file to export to, or \"-\" to write to stdout. (Default: -)",
+        )
+        parser.add_argument(
+            "--format",
+            choices=POST_EXPORT_FILE_FORMATS,
+            dest="file_format",
+            help=(
+                "Format of the exported file. "
+                "Inferred from the file extension if not given, otherwise jsonl."
+            ),
+        )
+        parser.add_argument(
+            "--university",
+            help="Only export posts about modules of the university with this email domain.",
+        )
+        parser.add_argument(
+            "--module",
+            help="Only export posts about the module with this code. (Requires --university)",
+        )
+        parser.add_argument(
+            "--date-from",
+            type=datetime.date.fromisoformat,
+            help="Only export posts made on or after this date. (YYYY-MM-DD)",
+        )
+        parser.add_argument(
+            "--date-to",
+            type=datetime.date.fromisoformat,
+            help="Only export posts made on or before this date. (YYYY-MM-DD)",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=2000,
+            help="Number of posts to read from the database at once. (Default: 2000)",
+        )
+
+    def _get_file_format(self, file_path: str, file_format: str | None) -> str:
+        if file_format:
+            return file_format
+
+        suffix: str = Path(file_path).suffix.lower().removeprefix(".")
+        if suffix in ("json", "ndjson"):
+            suffix = "jsonl"
+
+        return suffix if suffix in POST_EXPORT_FILE_FORMATS else "jsonl"
+
+    def _get_university(self, email_domain: str | None) -> University | None:
+        if email_domain is None:
+            return None
+
+        try:
+            return University.objects.get(email_domain=email_domain)
+        except University.DoesNotExist:
+            UNKNOWN_UNIVERSITY_MESSAGE: Final[str] = (
+                f"No university has the email domain {email_domain!r}."
+            )
+            raise CommandError(UNKNOWN_UNIVERSITY_MESSAGE) from None
+
+    def _get_module(self, code: str | None, university: University | None) -> Module | None:
+        if code is None:
+            return None
+
+        if university is None:
+            MISSING_UNIVERSITY_MESSAGE: Final[str] = "--module requires --university."
+            raise CommandError(MISSING_UNIVERSITY_MESSAGE)
+
+        try:
+            return Module.objects.filter(course_set__university=university).distinct().get(
+                code=code,
+            )
+        except Module.DoesNotExist:
+            UNKNOWN_MODULE_MESSAGE: Final[str] = (
+                f"{university.short_name} has no module with the code {code!r}."
+            )
+            raise CommandError(UNKNOWN_MODULE_MESSAGE) from None
+
+    def _write_lines(self, file: IO[str], lines: Iterable[str]) -> int:
+        rows_count: int = 0
+
+        line: str
+        for line in lines:
+            file.write(line)
+            rows_count += 1
+
+        return rows_count
+
+    @override
+    def handle(self, *args: object, **options: object) -> None:
+        file_path: str = str(options["file"])
+        chunk_size: object = options["chunk_size"]
+
+        if not isinstance(chunk_size, int) or chunk_size < 1:
+            INVALID_CHUNK_SIZE_MESSAGE: Final[str] = "--chunk-size must be a positive integer."
+            raise CommandError(INVALID_CHUNK_SIZE_MESSAGE)
+
+        date_from: object = options["date_from"]
+        date_to: object = options["date_to"]
+        if date_from is not None and date_to is not None and date_from > date_to:  # type: ignore[operator]
+            INVALID_DATE_RANGE_MESSAGE: Final[str] = (
+                "--date-to must not be before --date-from."
+            )
+            raise CommandError(INVALID_DATE_RANGE_MESSAGE)
+
+        file_format: str = self._get_file_format(
+            file_path,
+            str(options["file_format"]) if options["file_format"] else None,
+        )
+        university: University | None = self._get_university(
+            str(options["university"]) if options["university"] else None,
+        )
+        module: Module | None = self._get_module(
+            str(options["module"]) if options["module"] else None,
+            university,
+        )
+
+        lines: Iterable[str] = iter_post_export_lines(
+            get_post_export_queryset(
+                PostFilters(
+                    module=module,
+                    university=university,
+                    date_from=date_from,  # type: ignore[arg-type]
+                    date_to=date_to,  # type: ignore[arg-type]
+                ).apply(Post.objects.all()),
+            ),
+            file_format,
+            chunk_size,
+        )
+
+        rows_count: int
+        if file_path == "-":
+            rows_count = self._write_lines(self.stdout, lines)  # type: ignore[arg-type]
+        else:
+            try:
+                file: IO[str]
+                with Path(file_path).open("w", newline="", encoding="utf-8") as file:
+                    rows_count = self._write_lines(file, lines)
+            except OSError as os_error:
+                raise CommandError(str(os_error)) from os_error
+
+        if file_format == "csv":
+            rows_count -= 1
+
+        self.stderr.write(self.style.SUCCESS(f"Export complete: {rows_count} posts exported."))
@@ -0,0 +1,113 @@
+"""Management command to bulk import a catalogue of universities, modules & posts."""
+
+from collections.abc import Sequence
+
+__all__: Sequence[str] = ("Command",)
+
+import sys
+from pathlib import Path
+from typing import IO, Final, override
+
+from django.core.management import BaseCommand, CommandError, CommandParser
+
+from ratemymodule.utils.catalogue_import import (
+    CATALOGUE_FILE_FORMATS,
+    CatalogueImporter,
+    CatalogueImportResult,
+    CatalogueRowError,
+)
+
+
+class Command(BaseCommand):
+    """
+    Stream a CSV or JSON Lines catalogue file into the database.
+
+    See `ratemymodule.utils.catalogue_import` for the columns each row type requires.
+    """
+
+    help = (
+        "Import universities, courses, modules & posts from a CSV or JSON Lines file, "
+        "in batched transactions."
+    )
+    stealth_options = ("stdin",)
+
+    @override
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "file",
+            help="Path of the catalogue file to import, or \"-\" to read from stdin.",
+        )
+        parser.add_argument(
+            "--format",
+            choices=CATALOGUE_FILE_FORMATS,
+            dest="file_format",
+            help=(
+                "Format of the catalogue file. "
+                "Inferred from the file extension if not given."
+            ),
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of rows to write within each transaction. (Default: 500)",
+        )
+
+    def _get_file_format(self, file_path: str, file_format: str | None) -> str:
+        if file_format:
+            return file_format
+
+        suffix: str = Path(file_path).suffix.lower().removeprefix(".")
+        if suffix in ("json", "ndjson"):
+            suffix = "jsonl"
+
+        if suffix not in CATALOGUE_FILE_FORMATS:
+            UNKNOWN_FORMAT_MESSAGE: Final[str] = (
+                "Could not infer the catalogue file format, please provide --format."
+            )
+            raise CommandError(UNKNOWN_FORMAT_MESSAGE)
+
+        return suffix
+
+    def _write_progress(self, result: CatalogueImportResult) -> None:
+        self.stdout.write(str(result))
+
+    def _write_row_error(self, row_error: CatalogueRowError) -> None:
+        self.stderr.write(f"Row {row_error.row_number}: {row_error.message}")
+
+    @override
+    def handle(self, *args: object, **options: object) -> None:
+        file_path: str = str(options["file"])
+        batch_size: object = options["batch_size"]
+
+        if not isinstance(batch_size, int) or batch_size < 1:
+            INVALID_BATCH_SIZE_MESSAGE: Final[str] = "--batch-size must be a positive integer."
+            raise CommandError(INVALID_BATCH_SIZE_MESSAGE)
+
+        file_format: str = self._get_file_format(
+            file_path,
+            str(options["file_format"]) if options["file_format"] else None,
+        )
+
+        importer: CatalogueImporter = CatalogueImporter(
+            batch_size=batch_size,
+            on_progress=self._write_progress,
+            on_row_error=self._write_row_error,
+        )
+
+        result: CatalogueImportResult
+        if file_path == "-":
+            result = importer.import_file(
+                options.get("stdin") or sys.stdin,  # type: ignore[arg-type]
+                file_format,
+            )
+        else:
+            try:
+                file: IO[str]
+                with Path(file_path).open(newline="", encoding="utf-8") as file:
+                    result = importer.import_file(file, file_format)
+            except OSError as os_error:
+                raise CommandError(str(os_error)) from os_error
+
+        self.stdout.write(self.style.SUCCESS(f"Import complete: {result}"))
+
@@ -0,0 +1,68 @@
+"""Management command to populate the database with synthetic load-testing data."""
+
+from collections.abc import Sequence
+
+__all__: Sequence[str] = ("Command",)
+
+import time
+from typing import Final, override
+
+from django.core.management import BaseCommand, CommandError, CommandParser
+
+from ratemymodule.utils.populate_data import populate_load_test_database
+
+
+class Command(BaseCommand):
+    """Bulk insert a large, realistic volume of users, modules, posts & reactions."""
+
+    help = (
+        "Populate the database with synthetic universities, courses, modules, users, "
+        "posts & reactions, for load testing."
+    )
+
+    SIZE_ARGUMENTS: Final[Sequence[tuple[str, int, str]]] = (
+        ("universities", 2, "Number of universities to create."),
+        ("courses-per-university", 2, "Number of courses to create within each university."),
+        ("modules-per-course", 5, "Number of modules to create within each course."),
+        ("years-back", 5, "Number of years of posts to create for each module."),
+        ("reviews-per-month", 5, "Number of posts to create for each module, per month."),
+        ("reactions-per-post", 3, "Average number of likes/dislikes for each post."),
+    )
+
+    @override
+    def add_arguments(self, parser: CommandParser) -> None:
+        argument_name: str
+        default: int
+        help_text: str
+        for argument_name, default, help_text in self.SIZE_ARGUMENTS:
+            parser.add_argument(
+                f"--{argument_name}",
+                type=int,
+                default=default,
+                help=f"{help_text} (Default: {default})",
+            )
+
+    @override
+    def handle(self, *args: object, **options: object) -> None:
+        sizes: dict[str, int] = {}
+
+        argument_name: str
+        for argument_name, _, _ in self.SIZE_ARGUMENTS:
+            size: object = options[argument_name.replace("-", "_")]
+            minimum_size: int = 0 if argument_name == "reactions-per-post" else 1
+            if not isinstance(size, int) or size < minimum_size:
+                INVALID_SIZE_MESSAGE: Final[str] = (
+                    f"--{argument_name} must be an integer of at least {minimum_size}."
+                )
+                raise CommandError(INVALID_SIZE_MESSAGE)
+
+            sizes[argument_name.replace("-", "_")] = size
+
+        start_time: float = time.perf_counter()
+        posts_count: int = populate_load_test_database(on_progress=self.stdout.write, **sizes)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {posts_count} posts in {time.perf_counter() - start_time:.1f}s.",
+            ),
+        )
@@ -0,0 +1,133 @@
+"""Management command to benchmark every endpoint & enforce their SQL query budgets."""
+
+from collections.abc import Sequence
+
+__all__: Sequence[str] = ("Command",)
+
+from typing import Final, override
+
+from django.core.management import BaseCommand, CommandError, CommandParser
+from django.db import transaction
+from django.test.utils import (
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+    teardown_test_environment,
+)
+
+from ratemymodule.utils.benchmarks import (
+    BENCHMARK_ENDPOINTS,
+    BenchmarkData,
+    BenchmarkEndpoint,
+    BenchmarkResult,
+    run_endpoint_benchmark,
+    seed_benchmark_data,
+)
+
+
+class Command(BaseCommand):
+    """
+    Benchmark every endpoint against freshly seeded test databases of several sizes.
+
+    The benchmarks run against a separate test database, so existing data is never changed.
+    The command fails if any endpoint exceeds its query budget.
+    """
+
+    help = (
+        "Benchmark the latency, SQL query count & response size of every endpoint, "
+        "failing if any endpoint exceeds its query budget."
+    )
+
+    @override
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--sizes",
+            nargs="+",
+            type=int,
+            default=[1, 5, 20],
+            help=(
+                "Sizes of seeded data to benchmark against, "
+                "as the number of posts about each module per month. (Default: 1 5 20)"
+            ),
+        )
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=10,
+            help="Number of requests to make to each endpoint. (Default: 10)",
+        )
+        parser.add_argument(
+            "--endpoint",
+            action="append",
+            dest="endpoint_names",
+            choices=[endpoint.name for endpoint in BENCHMARK_ENDPOINTS],
+            help="Only benchmark the given endpoint. (Can be given multiple times)",
+        )
+
+    @override
+    def handle(self, *args: object, **options: object) -> None:
+        sizes: object = options["sizes"]
+        iterations: object = options["iterations"]
+
+        INVALID_NUMBERS: Final[bool] = (
+            not isinstance(sizes, list)
+            or not isinstance(iterations, int)
+            or iterations < 1
+            or any(size < 1 for size in sizes)
+        )
+        if INVALID_NUMBERS:
+            INVALID_NUMBERS_MESSAGE: Final[str] = (
+                "--sizes & --iterations must be positive integers."
+            )
+            raise CommandError(INVALID_NUMBERS_MESSAGE)
+
+        endpoint_names: object = options["endpoint_names"]
+        endpoints: Sequence[BenchmarkEndpoint] = [
+            endpoint
+            for endpoint in BENCHMARK_ENDPOINTS
+            if not endpoint_names or endpoint.name in endpoint_names  # type: ignore[operator]
+        ]
+
+        setup_test_environment()
+        old_database_config: object = setup_databases(
+            verbosity=0,
+            interactive=False,
+            aliases={"default"},
+        )
+
+        over_budget_results: list[tuple[int, BenchmarkResult]] = []
+        try:
+            size: int
+            for size in sizes:  # type: ignore[union-attr]
+                self.stdout.write(self.style.MIGRATE_HEADING(f"Size {size}:"))
+
+                with transaction.atomic():
+                    data: BenchmarkData = seed_benchmark_data(size)
+
+                    endpoint: BenchmarkEndpoint
+                    for endpoint in endpoints:
+                        result: BenchmarkResult = run_endpoint_benchmark(
+                            endpoint,
+                            data,
+                            iterations,  # type: ignore[arg-type]
+                        )
+
+                        if result.exceeds_query_budget:
+                            over_budget_results.append((size, result))
+                            self.stdout.write(self.style.ERROR(f"  {result}"))
+                        else:
+                            self.stdout.write(f"  {result}")
+
+                    transaction.set_rollback(True)
+
+        finally:
+            teardown_databases(old_database_config, verbosity=0)  # type: ignore[arg-type]
+            teardown_test_environment()
+
+        if over_budget_results:
+            OVER_BUDGET_MESSAGE: Final[str] = "Query budgets exceeded:\n" + "\n".join(
+                f"  size {size}: {result}" for size, result in over_budget_results
+            )
+            raise CommandError(OVER_BUDGET_MESSAGE)
+
+        self.stdout.write(self.style.SUCCESS("All endpoints are within their query budgets."))
@@ -0,0 +1,45 @@
+# Generated by Django 4.2.30 on 2026-10-19 01:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ratemymodule', '0006_alter_course_name_alter_course_student_type_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='module',
+            index=models.Index(fields=['code'], name='module_code_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='othertag',
+            index=models.Index(condition=models.Q(('is_verified', True)), fields=['name'], name='othertag_verified_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('hidden', False)), fields=['module', '-date_time_created'], name='post_module_visible_new_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['module', 'academic_year_start', 'overall_rating'], name='post_module_year_rating_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='report',
+            index=models.Index(condition=models.Q(('is_solved', False)), fields=['post'], name='report_post_unsolved_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='report',
+            index=models.Index(condition=models.Q(('is_solved', False)), fields=['-date_time_created'], name='report_unsolved_new_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tooltag',
+            index=models.Index(condition=models.Q(('is_verified', True)), fields=['name'], name='tooltag_verified_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='topictag',
+            index=models.Index(condition=models.Q(('is_verified', True)), fields=['name'], name='topictag_verified_name_idx'),
+        ),
+    ]
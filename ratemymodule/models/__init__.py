@@ -35,13 +35,17 @@ from django.core.validators import (
 )
 from django.db import models
 from django.db.models import Manager
+from django.db.models.functions import Coalesce
+from django.db.models.lookups import EndsWith
 from django.http import HttpRequest, QueryDict
+from django.utils.functional import cached_property
 from django.utils.text import Truncator
 from django.utils.translation import gettext_lazy as _
 from django_stubs_ext.db.models.manager import RelatedManager
 
 from core.utils import reverse_url_with_get_params
 
+from .integrity import is_enforced_by_database
 from .managers import (
     ModuleOrRequestVisiblePostsManager,
     PostFilteredByTagManager,
@@ -49,6 +53,8 @@ from .managers import (
     UserManager,
     UserPossibleModuleManager,
 )
+from .reaction_buffer import overlay_post_reaction_state
+from .reactions import PostReactionState, Reaction, apply_post_reaction
 from .utils import AttributeDeleter, CustomBaseModel
 from .validators import (
     ConfusableEmailValidator,
@@ -166,6 +172,22 @@ class User(CustomBaseModel, AbstractBaseUser, PermissionsMixin):
             is_staff=any((self.is_staff, self.is_superuser)),
         )
 
+    @classmethod
+    def annotate_university_pk(cls, queryset: models.QuerySet["User"]) -> models.QuerySet["User"]:  # noqa: E501
+        """
+        Annotate every user in the queryset with the primary key of their university.
+
+        The university is matched by email domain with a subquery,
+        so serializing `university` does not make any extra queries per user.
+        """
+        return queryset.annotate(
+            annotated_university_pk=models.Subquery(
+                University.objects.filter(
+                    EndsWith(models.OuterRef("email"), models.F("email_domain")),
+                ).order_by("pk").values("pk")[:1],
+            ),
+        )
+
     @property
     def short_username(self) -> str:
         """Shortcut accessor to the short truncated username of this user."""
@@ -219,9 +241,6 @@ class User(CustomBaseModel, AbstractBaseUser, PermissionsMixin):
             update_fields=update_fields,
         )
 
-        self.liked_post_set.add(*self.made_post_set.all())
-        self.disliked_post_set.through.objects.filter(post__user=self).delete()  # type: ignore[attr-defined]
-
     def _validate_email_not_already_exists(self) -> None:
         local: str
         domain: str
@@ -259,20 +278,17 @@ class User(CustomBaseModel, AbstractBaseUser, PermissionsMixin):
     def _get_proxy_field_names(cls) -> ImmutableSet[str]:
         return super()._get_proxy_field_names() | {"date_time_joined"}
 
-    def like_post(self, post: "Post") -> None:
+    def like_post(self, post: "Post") -> PostReactionState:
         """Like a given post, by this user, ensuring it's not disliked at the same time."""
-        self.unlike_post(post=post)
-        self.liked_post_set.add(post)
+        return apply_post_reaction(post=post, user=self, reaction=Reaction.LIKE)
 
-    def dislike_post(self, post: "Post") -> None:
+    def dislike_post(self, post: "Post") -> PostReactionState:
         """Dislike a given post, by this user, ensuring it's not liked at the same time."""
-        self.unlike_post(post=post)
-        self.liked_post_set.add(post)
+        return apply_post_reaction(post=post, user=self, reaction=Reaction.DISLIKE)
 
-    def unlike_post(self, post: "Post") -> None:
+    def unlike_post(self, post: "Post") -> PostReactionState:
         """Remove like and dislike from a given post, for this user."""
-        self.liked_post_set.remove(post)
-        self.disliked_post_set.remove(post)
+        return apply_post_reaction(post=post, user=self, reaction=Reaction.CLEAR)
 
 
 class University(CustomBaseModel):
@@ -347,11 +363,11 @@ class University(CustomBaseModel):
             update_fields=update_fields,
         )
 
-    @override
-    def __init__(self, *args: object, **kwargs: object) -> None:
-        super().__init__(*args, **kwargs)
-
-        self.module_set: UniversityModuleManager = UniversityModuleManager(self, Module)
+    # NOTE: A class-level attribute (rather than one set in `__init__()`) lets `prefetch_related()` find the manager's `get_prefetch_queryset()`
+    @cached_property
+    def module_set(self) -> UniversityModuleManager:
+        """Return a manager of the modules linked to this university through its courses."""
+        return UniversityModuleManager(self, Module)
 
     @override
     def __str__(self) -> str:
@@ -457,6 +473,7 @@ class Module(CustomBaseModel):
 
     class Meta:  # noqa: D106
         verbose_name = _("Module")
+        indexes = (models.Index(fields=("code",), name="module_code_idx"),)
 
     @override
     def clean(self) -> None:
@@ -515,6 +532,13 @@ class BaseTag(CustomBaseModel):
 
     class Meta:  # noqa: D106
         abstract = True
+        indexes = (
+            models.Index(
+                fields=("name",),
+                name="%(class)s_verified_name_idx",
+                condition=models.Q(is_verified=True),
+            ),
+        )
 
     @override
     def __str__(self) -> str:
@@ -524,7 +548,7 @@ class BaseTag(CustomBaseModel):
 class ToolTag(BaseTag):
     """Model class for tags about the tools used in a module, that can be added to posts."""
 
-    class Meta:  # noqa: D106
+    class Meta(BaseTag.Meta):  # noqa: D106
 
         verbose_name = _("Tool Tag")
 
@@ -549,7 +573,7 @@ class ToolTag(BaseTag):
 class TopicTag(BaseTag):
     """Model class for tags about the topics within a module, that can be added to posts."""
 
-    class Meta:  # noqa: D106
+    class Meta(BaseTag.Meta):  # noqa: D106
 
         verbose_name = _("Topic Tag")
 
@@ -574,7 +598,7 @@ class TopicTag(BaseTag):
 class OtherTag(BaseTag):
     """Model class for other tags describing a module, that can be added to posts."""
 
-    class Meta:  # noqa: D106
+    class Meta(BaseTag.Meta):  # noqa: D106
 
         verbose_name = _("Other Tag")
 
@@ -688,6 +712,17 @@ class Post(CustomBaseModel):
 
     class Meta:  # noqa: D106
         verbose_name = _("Post")
+        indexes = (
+            models.Index(
+                fields=("module", "-date_time_created"),
+                name="post_module_visible_new_idx",
+                condition=models.Q(hidden=False),
+            ),
+            models.Index(
+                fields=("module", "academic_year_start", "overall_rating"),
+                name="post_module_year_rating_idx",
+            ),
+        )
         constraints = (
             models.UniqueConstraint(
                 fields=("user", "module"),
@@ -710,6 +745,13 @@ class Post(CustomBaseModel):
 
     @override
     def save(self, *, force_insert: bool = False, force_update: bool = False, using: str | None = None, update_fields: Iterable[str] | None = None) -> None:  # type: ignore[override]  # noqa: E501
+        IS_NEW_POST: Final[bool] = self._state.adding
+        CREATOR_MAY_HAVE_CHANGED: Final[bool] = (
+            IS_NEW_POST
+            or update_fields is None
+            or "user" in update_fields
+        )
+
         super().save(
             force_insert=force_insert,
             force_update=force_update,
@@ -717,11 +759,21 @@ class Post(CustomBaseModel):
             update_fields=update_fields,
         )
 
-        if self.user not in self.liked_user_set.all():
-            self.liked_user_set.add(self.user)
+        if CREATOR_MAY_HAVE_CHANGED and not is_enforced_by_database():
+            self._ensure_creator_likes_post(is_new_post=IS_NEW_POST)
 
-        if self.user in self.disliked_user_set.all():
-            self.disliked_user_set.remove(self.user)
+    def _ensure_creator_likes_post(self, *, is_new_post: bool) -> None:
+        """
+        Ensure the creator of this post has liked it & has not disliked it.
+
+        Each check only touches the single through-table row belonging to the creator,
+        so the cost stays constant no matter how many users have reacted to this post.
+        """
+        if is_new_post or not self.liked_user_set.filter(pk=self.user_id).exists():
+            self.liked_user_set.add(self.user_id)
+
+        if not is_new_post and self.disliked_user_set.filter(pk=self.user_id).exists():
+            self.disliked_user_set.remove(self.user_id)
 
     @override
     def clean(self) -> None:
@@ -769,36 +821,58 @@ class Post(CustomBaseModel):
         """The overall number of Likes this post has."""
         return self.likes_count - self.dislikes_count
 
+    @property
+    def reaction_state(self) -> PostReactionState:
+        """
+        The reaction counts & user's reaction, of a post fetched with its reaction state.
+
+        Posts must have been retrieved from a queryset
+        that was passed through `annotate_post_reaction_state()`.
+        Any buffered reactions that have not yet been written are included.
+        """
+        return overlay_post_reaction_state(
+            self.pk,
+            getattr(self, "reaction_user_pk", None),
+            PostReactionState.from_annotated_post(self),
+        )
+
     # Methods to handle post liking and unliking logic
-    def user_like(self, user: User) -> None:
+    def user_like(self, user: User) -> PostReactionState:
         """Like this post, for a given user, ensuring it's not disliked at the same time."""
-        self.user_unlike(user=user)
-        self.liked_user_set.add(user)
+        return apply_post_reaction(post=self, user=user, reaction=Reaction.LIKE)
 
-    def user_dislike(self, user: User) -> None:
+    def user_dislike(self, user: User) -> PostReactionState:
         """Dislike this post, for a given user, ensuring it's not liked at the same time."""
-        self.user_unlike(user=user)
-        self.disliked_user_set.add(user)
+        return apply_post_reaction(post=self, user=user, reaction=Reaction.DISLIKE)
 
-    def user_unlike(self, user: User) -> None:
+    def user_unlike(self, user: User) -> PostReactionState:
         """Remove like and dislike from this post, for a given user."""
-        self.liked_user_set.remove(user)
-        self.disliked_user_set.remove(user)
+        return apply_post_reaction(post=self, user=user, reaction=Reaction.CLEAR)
 
     @property
     def student_type(self) -> str:
-        """The formatted type of student that wrote this post."""
-        first_course: Course | None = self.module.course_set.filter(
-            pk__in=self.user.enrolled_course_set.values_list("pk", flat=True),
-        ).first()
+        """
+        The formatted type of student that wrote this post.
 
-        if not first_course:
+        Posts retrieved from a queryset passed through `annotate_display_details()`
+        do not need any extra queries.
+        """
+        creator_student_type: str | None
+        if "creator_student_type" in self.__dict__:
+            creator_student_type = self.creator_student_type  # type: ignore[attr-defined]
+        else:
+            first_course: Course | None = self.module.course_set.filter(
+                pk__in=self.user.enrolled_course_set.values_list("pk", flat=True),
+            ).first()
+            creator_student_type = first_course.student_type if first_course else None
+
+        if not creator_student_type:
             if self.user.is_staff:
                 return "an Administrator"
 
             raise Course.DoesNotExist
 
-        return first_course.student_type
+        return creator_student_type
 
     def report(self, reporter: User, reason: "_Reasons") -> None:
         """Report this post by the given user."""
@@ -820,6 +894,43 @@ class Post(CustomBaseModel):
         """
         return PostFilteredByTagManager(tag_names=tag_names, post_model=cls)
 
+    @classmethod
+    def annotate_display_details(cls, queryset: models.QuerySet["Post"]) -> models.QuerySet["Post"]:  # noqa: E501
+        """
+        Annotate every post in the queryset with the details shown about its creator.
+
+        The creator's student type (from their first enrolled course that includes the module),
+        the short name of the module's university
+        & the number of unsolved reports across all the creator's posts are each fetched
+        with a subquery, so `student_type`, `display_user` & `is_user_suspicious`
+        do not make any extra queries per post.
+        The creator is also fetched with the same query.
+        """
+        return queryset.select_related("user").annotate(
+            module_university_short_name=models.Subquery(
+                Course.objects.filter(
+                    module_set=models.OuterRef("module_id"),
+                ).order_by("pk").values("university__short_name")[:1],
+            ),
+            creator_student_type=models.Subquery(
+                Course.objects.filter(
+                    module_set=models.OuterRef("module_id"),
+                    enrolled_user_set=models.OuterRef("user_id"),
+                ).order_by("pk").values("student_type")[:1],
+            ),
+            creator_unsolved_reports_count=Coalesce(
+                models.Subquery(
+                    Report.objects.filter(
+                        post__user=models.OuterRef("user_id"),
+                        is_solved=False,
+                    ).values("post__user").annotate(
+                        unsolved_reports_count=models.Count("*"),
+                    ).values("unsolved_reports_count")[:1],
+                ),
+                0,
+            ),
+        )
+
     @classmethod
     def filter_by_viewable(cls, module: Module | None = None, request: HttpRequest | None = None) -> Manager["Post"]:  # noqa: E501
         """Return only viewable posts."""
@@ -831,12 +942,31 @@ class Post(CustomBaseModel):
 
     @property
     def display_user(self) -> str:
-        """Returns the formatted display value for this post's creator."""
-        return f"From {self.student_type} | {self.module.university.short_name}"
+        """
+        Returns the formatted display value for this post's creator.
+
+        Posts retrieved from a queryset passed through `annotate_display_details()`
+        do not need any extra queries.
+        """
+        if "module_university_short_name" not in self.__dict__:
+            return f"From {self.student_type} | {self.module.university.short_name}"
+
+        if self.module_university_short_name is None:  # type: ignore[attr-defined]
+            raise Course.DoesNotExist
+
+        return f"From {self.student_type} | {self.module_university_short_name}"  # type: ignore[attr-defined]
 
     @property
     def is_user_suspicious(self) -> bool:
-        """Flag for whether the given user has suspicious activity associated with them."""
+        """
+        Flag for whether the given user has suspicious activity associated with them.
+
+        Posts retrieved from a queryset passed through `annotate_display_details()`
+        do not need any extra queries.
+        """
+        if "creator_unsolved_reports_count" in self.__dict__:
+            return self.creator_unsolved_reports_count >= 3  # type: ignore[no-any-return]
+
         unsolved_reports_count: int = 0
 
         # Iterate over posts made by the user
@@ -896,6 +1026,18 @@ class Report(CustomBaseModel):
 
     class Meta:  # noqa: D106
         verbose_name = _("Report")
+        indexes = (
+            models.Index(
+                fields=("post",),
+                name="report_post_unsolved_idx",
+                condition=models.Q(is_solved=False),
+            ),
+            models.Index(
+                fields=("-date_time_created",),
+                name="report_unsolved_new_idx",
+                condition=models.Q(is_solved=False),
+            ),
+        )
         constraints = (
             models.CheckConstraint(
                 name="ensure_reason_valid_choice",
@@ -0,0 +1,130 @@
+"""
+Data versions of this app's models, used to answer conditional GET requests cheaply.
+
+Every model has a version number (stored in the default cache),
+which is bumped whenever any of its objects (or their many-to-many relations)
+are saved or deleted.
+Versions are the nanosecond timestamp of the model's latest change,
+so they double as the `Last-Modified` time of any response built from that model's data.
+
+Bulk writes (E.g. `bulk_create()`) send no signals,
+so they must call `bump_data_versions()` themselves.
+Versions are only used when `DATA_VERSIONS_ENABLED` is set,
+which requires a cache shared by every process (including management commands),
+because a process-local cache can never see the changes made by other processes.
+"""
+
+from collections.abc import Sequence
+
+__all__: Sequence[str] = ("DataVersion", "bump_data_versions", "get_data_version")
+
+import datetime
+import hashlib
+import time
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, Final, NamedTuple
+
+from django.core.cache import caches
+from django.db import models, transaction
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+if TYPE_CHECKING:
+    from django.http import HttpRequest, HttpResponseBase
+
+CACHE_KEY_PREFIX: Final[str] = "data-version"
+
+
+class DataVersion(NamedTuple):
+    """The combined versions of a set of models, at the moment they were read."""
+
+    versions: tuple[int, ...]
+
+    @property
+    def last_modified(self) -> datetime.datetime:
+        """The time of the latest change to any of the versioned models."""
+        return datetime.datetime.fromtimestamp(max(self.versions) / 1e9, tz=datetime.UTC)
+
+    def make_key(self, *variant_parts: object) -> str:
+        """Build a short key from these versions & any other parts a response varies on."""
+        return hashlib.sha256(
+            ":".join(str(part) for part in (*self.versions, *variant_parts)).encode(),
+        ).hexdigest()[:32]
+
+    def make_etag(self, *variant_parts: object) -> str:
+        """
+        Build a weak entity tag from these versions & any other parts the response varies on.
+
+        The tag is weak because responses built from the same data
+        can still differ byte-for-byte (E.g. because of masked CSRF tokens).
+        """
+        return f"W/\"{self.make_key(*variant_parts)}\""
+
+    def get_not_modified_response(self, request: "HttpRequest", *variant_parts: object) -> "HttpResponseBase | None":  # noqa: E501
+        """
+        Return a `304 Not Modified` response, if the client's copy is still current.
+
+        `None` is returned when the full response needs to be built.
+        """
+        not_modified_response: HttpResponseBase | None = get_conditional_response(
+            request,
+            etag=self.make_etag(*variant_parts),
+            last_modified=int(self.last_modified.timestamp()),
+        )
+        if not_modified_response is not None:
+            self.add_validator_headers(not_modified_response, *variant_parts)
+
+        return not_modified_response
+
+    def add_validator_headers(self, response: "HttpResponseBase", *variant_parts: object) -> None:  # noqa: E501
+        """Add the `ETag` & `Last-Modified` headers for these versions to a response."""
+        response.headers["ETag"] = self.make_etag(*variant_parts)
+        response.headers["Last-Modified"] = http_date(self.last_modified.timestamp())
+
+
+def _get_cache_key(model: type[models.Model]) -> str:
+    return f"{CACHE_KEY_PREFIX}:{model._meta.label_lower}"
+
+
+def get_data_version(versioned_models: Iterable[type[models.Model]]) -> DataVersion:
+    """
+    Return the current combined version of the given models.
+
+    A model without a stored version (E.g. because it was evicted from the cache)
+    gets a new one based on the current time,
+    so stale responses can never be validated against a forgotten version.
+    """
+    cache_keys: list[str] = sorted({_get_cache_key(model) for model in versioned_models})
+    versions: dict[str, int] = caches["default"].get_many(cache_keys)
+
+    missing_cache_key: str
+    for missing_cache_key in set(cache_keys) - versions.keys():
+        caches["default"].add(missing_cache_key, time.time_ns(), timeout=None)
+        versions[missing_cache_key] = caches["default"].get(missing_cache_key, time.time_ns())
+
+    return DataVersion(tuple(versions[cache_key] for cache_key in cache_keys))
+
+
+def _bump_data_versions_now(versioned_models: Iterable[type[models.Model]]) -> None:
+    cache_keys: set[str] = {_get_cache_key(model) for model in versioned_models}
+    previous_versions: dict[str, int] = caches["default"].get_many(cache_keys)
+    now: int = time.time_ns()
+
+    # NOTE: Versions never decrease, even if this process's clock is behind whichever process made the previous change
+    caches["default"].set_many(
+        {
+            cache_key: max(now, previous_versions.get(cache_key, 0) + 1)
+            for cache_key in cache_keys
+        },
+        timeout=None,
+    )
+
+
+def bump_data_versions(*versioned_models: type[models.Model]) -> None:
+    """
+    Mark the data of the given models as changed.
+
+    Within a transaction, the versions are only bumped once it has been committed,
+    so the new versions can never be paired with the old (uncommitted) data.
+    """
+    transaction.on_commit(lambda: _bump_data_versions_now(versioned_models))
@@ -0,0 +1,371 @@
+"""
+Optional database-enforced integrity backend, replacing the Python signal receivers.
+
+When `DATABASE_INTEGRITY_BACKEND` is set to `"database"`, SQL triggers are installed
+(after every run of `manage.py migrate`) that enforce the same invariants as the Python
+`m2m_changed` receivers & `Post.save()`, so those no longer need to make extra queries:
+    * Users can only be enrolled in courses at their own university.
+    * A module's courses must all be at the same university.
+    * The creator of a post always likes their own post & can never dislike it.
+    * Non-staff users must keep at least one course & modules must keep at least one course.
+
+The last invariant can only be checked once all of a transaction's cascading deletes
+have happened, which requires deferred constraint triggers.
+These only exist in PostgreSQL, so the Python receivers still check removals on SQLite.
+
+The Python receivers are only turned off once the triggers are found in the database
+(checked once per database connection), so changing the setting without re-running
+`manage.py migrate` never leaves the invariants unenforced.
+"""
+
+from collections.abc import Sequence
+
+__all__: Sequence[str] = (
+    "is_enforced_by_database",
+    "install_integrity_triggers",
+    "remove_integrity_triggers",
+    "forget_installed_integrity_triggers",
+)
+
+import weakref
+from collections.abc import Mapping
+from typing import Final
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connection as default_connection
+from django.db import connections
+from django.db.backends.base.base import BaseDatabaseWrapper
+
+_TRIGGER_NAMES: Final[Mapping[str, str]] = {
+    "ratemymodule_enrolment_same_university": "enrolled_course",
+    "ratemymodule_module_course_same_university": "module_course",
+    "ratemymodule_post_creator_likes_post_insert": "post",
+    "ratemymodule_post_creator_likes_post_update": "post",
+    "ratemymodule_post_creator_cannot_dislike": "disliked_post",
+    "ratemymodule_user_keeps_course": "enrolled_course",
+    "ratemymodule_module_keeps_course": "module_course",
+}
+_DEFERRED_TRIGGER_NAMES: Final[frozenset[str]] = frozenset(
+    {"ratemymodule_user_keeps_course", "ratemymodule_module_keeps_course"},
+)
+
+_installed_triggers_cache: weakref.WeakKeyDictionary[BaseDatabaseWrapper, bool] = (
+    weakref.WeakKeyDictionary()
+)
+
+USER_MULTIPLE_UNIVERSITIES_MESSAGE: Final[str] = (
+    "VALIDATION constraint failed: "
+    "user cannot be enrolled in courses across multiple universities."
+)
+MODULE_MULTIPLE_UNIVERSITIES_MESSAGE: Final[str] = (
+    "VALIDATION constraint failed: "
+    "module cannot be attached to courses across multiple universities."
+)
+USER_NO_COURSES_MESSAGE: Final[str] = (
+    "NOTNULL constraint failed: user_enrolled_course_set cannot be empty."
+)
+MODULE_NO_COURSES_MESSAGE: Final[str] = (
+    "NOTNULL constraint failed: module_course_set cannot be empty."
+)
+
+
+def is_enforced_by_database(*, requires_deferred_checks: bool = False, connection: BaseDatabaseWrapper = default_connection) -> bool:  # noqa: E501
+    """
+    Return whether the database enforces the integrity invariants, instead of Python.
+
+    Invariants that must be checked after cascading deletes have happened
+    (`requires_deferred_checks`) are only enforced by PostgreSQL databases,
+    & no invariants are enforced by a database until its triggers have been installed.
+    """
+    if settings.DATABASE_INTEGRITY_BACKEND != "database":
+        return False
+
+    if requires_deferred_checks and connection.vendor != "postgresql":
+        return False
+
+    return _are_integrity_triggers_installed(connection)
+
+
+def _are_integrity_triggers_installed(connection: BaseDatabaseWrapper) -> bool:
+    # NOTE: `django.db.connection` is a proxy shared by every thread, so the cache is keyed by the current thread's actual connection
+    connection = connections[connection.alias]
+
+    are_triggers_installed: bool | None = _installed_triggers_cache.get(connection)
+    if are_triggers_installed is not None:
+        return are_triggers_installed
+
+    trigger_names: set[str] = (
+        set(_TRIGGER_NAMES)
+        if connection.vendor == "postgresql"
+        else set(_TRIGGER_NAMES) - _DEFERRED_TRIGGER_NAMES
+    )
+
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+        elif connection.vendor == "postgresql":
+            cursor.execute("SELECT tgname FROM pg_trigger WHERE NOT tgisinternal")
+        else:
+            _installed_triggers_cache[connection] = False
+            return False
+
+        are_triggers_installed = trigger_names <= {row[0] for row in cursor.fetchall()}
+
+    _installed_triggers_cache[connection] = are_triggers_installed
+    return are_triggers_installed
+
+
+def forget_installed_integrity_triggers(connection: BaseDatabaseWrapper) -> None:
+    """Make the next integrity check on the given connection look for the triggers again."""
+    _installed_triggers_cache.pop(connections[connection.alias], None)
+
+
+def _get_table_names(connection: BaseDatabaseWrapper) -> Mapping[str, str]:
+    user_model = apps.get_model("ratemymodule", "User")
+    module_model = apps.get_model("ratemymodule", "Module")
+
+    return {
+        table_key: connection.ops.quote_name(model._meta.db_table)
+        for table_key, model in {
+            "user": user_model,
+            "university": apps.get_model("ratemymodule", "University"),
+            "course": apps.get_model("ratemymodule", "Course"),
+            "module": module_model,
+            "post": apps.get_model("ratemymodule", "Post"),
+            "enrolled_course": user_model.enrolled_course_set.through,
+            "module_course": module_model.course_set.through,
+            "liked_post": user_model.liked_post_set.through,
+            "disliked_post": user_model.disliked_post_set.through,
+        }.items()
+    }
+
+
+def _get_sqlite_trigger_statements(tables: Mapping[str, str]) -> Sequence[str]:
+    return (
+        f"""
+        CREATE TRIGGER IF NOT EXISTS ratemymodule_enrolment_same_university
+        BEFORE INSERT ON {tables["enrolled_course"]}
+        WHEN EXISTS (
+            SELECT 1 FROM {tables["user"]} AS user_
+            INNER JOIN {tables["course"]} AS course ON course.id = NEW.course_id
+            INNER JOIN {tables["university"]} AS university
+                ON university.id = course.university_id
+            WHERE user_.id = NEW.user_id
+                AND user_.email NOT LIKE '%' || university.email_domain
+                AND EXISTS (
+                    SELECT 1 FROM {tables["university"]} AS other_university
+                    WHERE user_.email LIKE '%' || other_university.email_domain
+                )
+        )
+        BEGIN SELECT RAISE(ABORT, '{USER_MULTIPLE_UNIVERSITIES_MESSAGE}'); END
+        """,  # noqa: S608
+        f"""
+        CREATE TRIGGER IF NOT EXISTS ratemymodule_module_course_same_university
+        BEFORE INSERT ON {tables["module_course"]}
+        WHEN EXISTS (
+            SELECT 1 FROM {tables["module_course"]} AS module_course
+            INNER JOIN {tables["course"]} AS course ON course.id = module_course.course_id
+            INNER JOIN {tables["course"]} AS new_course ON new_course.id = NEW.course_id
+            WHERE module_course.module_id = NEW.module_id
+                AND course.university_id != new_course.university_id
+        )
+        BEGIN SELECT RAISE(ABORT, '{MODULE_MULTIPLE_UNIVERSITIES_MESSAGE}'); END
+        """,  # noqa: S608
+        *(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS ratemymodule_post_creator_likes_post_{trigger_event}
+            AFTER {trigger_event.upper()}{" OF user_id" if trigger_event == "update" else ""}
+            ON {tables["post"]}
+            BEGIN
+                DELETE FROM {tables["disliked_post"]}
+                WHERE user_id = NEW.user_id AND post_id = NEW.id;
+                INSERT OR IGNORE INTO {tables["liked_post"]} (user_id, post_id)
+                VALUES (NEW.user_id, NEW.id);
+            END
+            """  # noqa: S608
+            for trigger_event in ("insert", "update")
+        ),
+        f"""
+        CREATE TRIGGER IF NOT EXISTS ratemymodule_post_creator_cannot_dislike
+        BEFORE INSERT ON {tables["disliked_post"]}
+        WHEN NEW.user_id = (SELECT user_id FROM {tables["post"]} WHERE id = NEW.post_id)
+        BEGIN SELECT RAISE(IGNORE); END
+        """,  # noqa: S608
+    )
+
+
+def _get_postgresql_trigger_statements(tables: Mapping[str, str]) -> Sequence[str]:
+    trigger_statements: list[str] = []
+
+    trigger_name: str
+    trigger_definition: str
+    function_body: str
+    for trigger_name, trigger_definition, function_body in (
+        (
+            "ratemymodule_enrolment_same_university",
+            f"BEFORE INSERT ON {tables["enrolled_course"]} FOR EACH ROW",
+            f"""
+            IF EXISTS (
+                SELECT 1 FROM {tables["user"]} AS user_
+                INNER JOIN {tables["course"]} AS course ON course.id = NEW.course_id
+                INNER JOIN {tables["university"]} AS university
+                    ON university.id = course.university_id
+                WHERE user_.id = NEW.user_id
+                    AND user_.email NOT LIKE '%' || university.email_domain
+                    AND EXISTS (
+                        SELECT 1 FROM {tables["university"]} AS other_university
+                        WHERE user_.email LIKE '%' || other_university.email_domain
+                    )
+            ) THEN
+                RAISE EXCEPTION '{USER_MULTIPLE_UNIVERSITIES_MESSAGE}'
+                    USING ERRCODE = 'integrity_constraint_violation';
+            END IF;
+            RETURN NEW;
+            """,  # noqa: S608
+        ),
+        (
+            "ratemymodule_module_course_same_university",
+            f"BEFORE INSERT ON {tables["module_course"]} FOR EACH ROW",
+            f"""
+            IF EXISTS (
+                SELECT 1 FROM {tables["module_course"]} AS module_course
+                INNER JOIN {tables["course"]} AS course
+                    ON course.id = module_course.course_id
+                INNER JOIN {tables["course"]} AS new_course ON new_course.id = NEW.course_id
+                WHERE module_course.module_id = NEW.module_id
+                    AND course.university_id != new_course.university_id
+            ) THEN
+                RAISE EXCEPTION '{MODULE_MULTIPLE_UNIVERSITIES_MESSAGE}'
+                    USING ERRCODE = 'integrity_constraint_violation';
+            END IF;
+            RETURN NEW;
+            """,  # noqa: S608
+        ),
+        *(
+            (
+                f"ratemymodule_post_creator_likes_post_{trigger_event}",
+                (
+                    f"AFTER {trigger_event.upper()}"
+                    f"{" OF user_id" if trigger_event == "update" else ""} "
+                    f"ON {tables["post"]} FOR EACH ROW"
+                ),
+                f"""
+                DELETE FROM {tables["disliked_post"]}
+                WHERE user_id = NEW.user_id AND post_id = NEW.id;
+                INSERT INTO {tables["liked_post"]} (user_id, post_id)
+                VALUES (NEW.user_id, NEW.id)
+                ON CONFLICT DO NOTHING;
+                RETURN NULL;
+                """,  # noqa: S608
+            )
+            for trigger_event in ("insert", "update")
+        ),
+        (
+            "ratemymodule_post_creator_cannot_dislike",
+            f"BEFORE INSERT ON {tables["disliked_post"]} FOR EACH ROW",
+            f"""
+            IF NEW.user_id = (SELECT user_id FROM {tables["post"]} WHERE id = NEW.post_id) THEN
+                RETURN NULL;
+            END IF;
+            RETURN NEW;
+            """,  # noqa: S608
+        ),
+        (
+            "ratemymodule_user_keeps_course",
+            (
+                f"AFTER DELETE ON {tables["enrolled_course"]} "
+                "DEFERRABLE INITIALLY DEFERRED FOR EACH ROW"
+            ),
+            f"""
+            IF EXISTS (
+                SELECT 1 FROM {tables["user"]} AS user_
+                WHERE user_.id = OLD.user_id AND NOT user_.is_staff
+            ) AND NOT EXISTS (
+                SELECT 1 FROM {tables["enrolled_course"]} WHERE user_id = OLD.user_id
+            ) THEN
+                RAISE EXCEPTION '{USER_NO_COURSES_MESSAGE}'
+                    USING ERRCODE = 'integrity_constraint_violation';
+            END IF;
+            RETURN NULL;
+            """,  # noqa: S608
+        ),
+        (
+            "ratemymodule_module_keeps_course",
+            (
+                f"AFTER DELETE ON {tables["module_course"]} "
+                "DEFERRABLE INITIALLY DEFERRED FOR EACH ROW"
+            ),
+            f"""
+            IF EXISTS (
+                SELECT 1 FROM {tables["module"]} WHERE id = OLD.module_id
+            ) AND NOT EXISTS (
+                SELECT 1 FROM {tables["module_course"]} WHERE module_id = OLD.module_id
+            ) THEN
+                RAISE EXCEPTION '{MODULE_NO_COURSES_MESSAGE}'
+                    USING ERRCODE = 'integrity_constraint_violation';
+            END IF;
+            RETURN NULL;
+            """,  # noqa: S608
+        ),
+    ):
+        trigger_statements.append(
+            f"""
+            CREATE OR REPLACE FUNCTION {trigger_name}() RETURNS trigger AS $$
+            BEGIN
+                {function_body}
+            END;
+            $$ LANGUAGE plpgsql
+            """,
+        )
+        trigger_statements.append(
+            f"DROP TRIGGER IF EXISTS {trigger_name} "
+            f"ON {tables[_TRIGGER_NAMES[trigger_name]]}",
+        )
+        trigger_statements.append(
+            f"CREATE {"CONSTRAINT " if "DEFERRABLE" in trigger_definition else ""}"
+            f"TRIGGER {trigger_name} {trigger_definition} "
+            f"EXECUTE FUNCTION {trigger_name}()",
+        )
+
+    return trigger_statements
+
+
+def install_integrity_triggers(connection: BaseDatabaseWrapper) -> None:
+    """Install (or replace) every integrity trigger in the given database."""
+    tables: Mapping[str, str] = _get_table_names(connection)
+
+    trigger_statements: Sequence[str]
+    if connection.vendor == "sqlite":
+        trigger_statements = _get_sqlite_trigger_statements(tables)
+    elif connection.vendor == "postgresql":
+        trigger_statements = _get_postgresql_trigger_statements(tables)
+    else:
+        UNSUPPORTED_DATABASE_MESSAGE: Final[str] = (
+            "Integrity triggers can only be installed in SQLite or PostgreSQL databases."
+        )
+        raise NotImplementedError(UNSUPPORTED_DATABASE_MESSAGE)
+
+    with connection.cursor() as cursor:
+        trigger_statement: str
+        for trigger_statement in trigger_statements:
+            cursor.execute(trigger_statement)
+
+    forget_installed_integrity_triggers(connection)
+
+
+def remove_integrity_triggers(connection: BaseDatabaseWrapper) -> None:
+    """Remove every integrity trigger from the given database, if they were installed."""
+    tables: Mapping[str, str] = _get_table_names(connection)
+
+    with connection.cursor() as cursor:
+        trigger_name: str
+        table_key: str
+        for trigger_name, table_key in _TRIGGER_NAMES.items():
+            if connection.vendor == "postgresql":
+                cursor.execute(f"DROP TRIGGER IF EXISTS {trigger_name} ON {tables[table_key]}")
+                cursor.execute(f"DROP FUNCTION IF EXISTS {trigger_name}()")
+            else:
+                cursor.execute(f"DROP TRIGGER IF EXISTS {trigger_name}")
+
+    forget_installed_integrity_triggers(connection)
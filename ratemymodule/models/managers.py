@@ -11,12 +11,12 @@ __all__: Sequence[str] = (
 )
 
 
-from collections.abc import Iterable
+from collections.abc import Callable, Iterable
 from typing import TYPE_CHECKING, Final, override
 
 from django.contrib.auth.models import UserManager as DjangoUserManager
 from django.db import models
-from django.db.models import Count, Manager, QuerySet
+from django.db.models import Exists, F, Manager, OuterRef, QuerySet
 from django.http import HttpRequest
 
 from .utils import AttributeDeleter
@@ -80,8 +80,12 @@ class UniversityModuleManager(Manager["Module"]):
 
     Module objects are selected by the instances that are linked to a university
     through its `course_set`.
+    The modules of many universities can be fetched in a single query,
+    with `prefetch_related("module_set")`.
     """
 
+    PREFETCH_CACHE_NAME: Final[str] = "module_set"
+
     @override
     def __init__(self, university: "University", module_model: type["Module"]) -> None:
         self._university: University = university
@@ -91,10 +95,34 @@ class UniversityModuleManager(Manager["Module"]):
 
     @override
     def get_queryset(self) -> QuerySet["Module"]:
+        try:
+            # noinspection PyProtectedMember
+            return self._university._prefetched_objects_cache[self.PREFETCH_CACHE_NAME]  # type: ignore[attr-defined,no-any-return]  # noqa: SLF001
+        except (AttributeError, KeyError):
+            pass
+
         return self._module_model.objects.filter(
             course_set__pk__in=self._university.course_set.all(),
         ).distinct()
 
+    def get_prefetch_queryset(self, instances: Sequence["University"], queryset: QuerySet["Module"] | None = None) -> tuple[QuerySet["Module"], Callable[["Module"], object], Callable[["University"], object], bool, str, bool]:  # noqa: E501
+        """Return what `prefetch_related()` needs to fetch many universities' modules."""
+        if queryset is None:
+            queryset = self._module_model.objects.all()
+
+        return (
+            queryset.filter(
+                course_set__university__in=instances,
+            ).annotate(
+                prefetched_for_university_pk=F("course_set__university"),
+            ).distinct(),
+            lambda module: module.prefetched_for_university_pk,  # type: ignore[attr-defined]
+            lambda university: university.pk,
+            False,
+            self.PREFETCH_CACHE_NAME,
+            False,
+        )
+
 
 class UserPossibleModuleManager(Manager["Module"]):
     """
@@ -166,17 +194,23 @@ class ModuleOrRequestVisiblePostsManager(Manager["Post"]):
             queryset = queryset.filter(module=self._module)
 
         if not self._request or not self._request.user.is_staff:
-            queryset = queryset.annotate(
-                num_reports=Count("report_set"),
-            ).annotate(
-                num_solved_reports=Count(
-                    "report_set",
-                    filter=models.Q(report_set__is_solved=True),
-                ),
-            ).filter(
+            report_model: type[models.Model] = self._post_model._meta.get_field(
+                "report_set",
+            ).related_model  # type: ignore[assignment]
+
+            # NOTE: Reports are checked with subqueries rather than counted, so visible posts can be selected without any grouping
+            queryset = queryset.filter(
                 hidden=False,
             ).exclude(
-                models.Q(num_reports__gt=0) & ~models.Q(num_solved_reports__gt=0),
+                models.Q(Exists(report_model._default_manager.filter(post=OuterRef("pk"))))
+                & ~models.Q(
+                    Exists(
+                        report_model._default_manager.filter(
+                            post=OuterRef("pk"),
+                            is_solved=True,
+                        ),
+                    ),
+                ),
             )
 
         return queryset.order_by("date_time_created")
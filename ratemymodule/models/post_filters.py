@@ -0,0 +1,127 @@
+"""Query builder for filtering posts, shared by the web views, the REST API & exports."""
+
+from collections.abc import Sequence
+
+__all__: Sequence[str] = ("PostFilters", "RATING_FIELD_NAMES")
+
+import datetime
+from collections.abc import Collection
+from typing import Final, NamedTuple
+
+from django.db import models
+from django.db.models import Exists, OuterRef, QuerySet
+from django.utils import timezone
+
+from ratemymodule.exceptions import UnindexedPostFiltersError
+
+from . import Module, OtherTag, Post, ToolTag, TopicTag, University
+
+RATING_FIELD_NAMES: Final[Sequence[str]] = (
+    "overall_rating",
+    "difficulty_rating",
+    "assessment_rating",
+    "teaching_rating",
+)
+
+
+def _start_of_day(date: datetime.date) -> datetime.datetime:
+    return timezone.make_aware(datetime.datetime.combine(date, datetime.time.min))
+
+
+class PostFilters(NamedTuple):
+    """
+    A set of filters to select posts by.
+
+    Every filter is applied without any joins that could duplicate posts,
+    so filtered querysets never need `distinct()`.
+    Tags are matched with `EXISTS` subqueries against the (indexed) tag through-tables,
+    & universities are matched by the set of their modules' primary keys.
+    """
+
+    module: Module | None = None
+    university: University | None = None
+    overall_rating: int | None = None
+    difficulty_rating: int | None = None
+    assessment_rating: int | None = None
+    teaching_rating: int | None = None
+    academic_year_start: int | None = None
+    date_from: datetime.date | None = None
+    date_to: datetime.date | None = None
+    tag_names: Collection[str] = ()
+    search: str = ""
+
+    def ensure_indexed(self) -> None:
+        """
+        Raise `UnindexedPostFiltersError` if these filters could not be answered from an index.
+
+        Every index on posts starts with the post's module,
+        so filtering by ratings, academic year or date range needs a module or university.
+        Searching the content of posts can never use an index,
+        so searches must be limited to the posts of a single module.
+        """
+        HAS_MODULE_SCOPE: Final[bool] = self.module is not None or self.university is not None
+        HAS_POST_FIELD_FILTERS: Final[bool] = (
+            any(getattr(self, field_name) is not None for field_name in RATING_FIELD_NAMES)
+            or self.academic_year_start is not None
+            or self.date_from is not None
+            or self.date_to is not None
+        )
+
+        if HAS_POST_FIELD_FILTERS and not HAS_MODULE_SCOPE:
+            MISSING_MODULE_SCOPE_MESSAGE: Final[str] = (
+                "Filtering by ratings, academic year or date requires a module or university."
+            )
+            raise UnindexedPostFiltersError(MISSING_MODULE_SCOPE_MESSAGE)
+
+        if self.search and self.module is None:
+            MISSING_MODULE_MESSAGE: Final[str] = "Searching posts requires a module."
+            raise UnindexedPostFiltersError(MISSING_MODULE_MESSAGE)
+
+    def apply(self, queryset: QuerySet[Post]) -> QuerySet[Post]:
+        """Return the posts within the given queryset that match every one of these filters."""
+        if self.module is not None:
+            queryset = queryset.filter(module=self.module)
+
+        if self.university is not None:
+            queryset = queryset.filter(
+                module__in=Module.objects.filter(
+                    course_set__university=self.university,
+                ).values("pk"),
+            )
+
+        queryset = queryset.filter(
+            **{
+                field_name: getattr(self, field_name)
+                for field_name in (*RATING_FIELD_NAMES, "academic_year_start")
+                if getattr(self, field_name) is not None
+            },
+        )
+
+        if self.date_from is not None:
+            queryset = queryset.filter(date_time_created__gte=_start_of_day(self.date_from))
+
+        if self.date_to is not None:
+            queryset = queryset.filter(
+                date_time_created__lt=_start_of_day(self.date_to + datetime.timedelta(days=1)),
+            )
+
+        if self.tag_names:
+            tags_filter: models.Q = models.Q()
+
+            tag_model: type[ToolTag | TopicTag | OtherTag]
+            for tag_model in (ToolTag, TopicTag, OtherTag):
+                tags_filter |= models.Q(
+                    Exists(
+                        tag_model.objects.filter(
+                            post_set=OuterRef("pk"),
+                            name__in=self.tag_names,
+                        ),
+                    ),
+                )
+
+            queryset = queryset.filter(tags_filter)
+
+        if self.search:
+            queryset = queryset.filter(content__icontains=self.search)
+
+        return queryset
@@ -0,0 +1,119 @@
+"""Aggregate statistics about the ratings of a set of posts, for charts drawn client-side."""
+
+from collections.abc import Sequence
+
+__all__: Sequence[str] = ("RatingStats", "MonthlyPostStats", "PostStats", "get_post_stats")
+
+import datetime
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, NamedTuple
+
+from django.db import models
+from django.db.models import Avg, Count
+from django.db.models.functions import TruncMonth
+
+from .post_filters import RATING_FIELD_NAMES
+
+if TYPE_CHECKING:
+    from django.db.models import QuerySet
+
+    from . import Post
+
+
+class RatingStats(NamedTuple):
+    """The distribution of a single rating field's values."""
+
+    counts: tuple[int, ...]
+    average: float | None
+
+    @property
+    def ratings_count(self) -> int:
+        """The number of posts that were given this rating (optional ratings can be blank)."""
+        return sum(self.counts)
+
+
+class MonthlyPostStats(NamedTuple):
+    """The number of posts & the average of each rating field, for a single month."""
+
+    month: datetime.date
+    posts_count: int
+    averages: Mapping[str, float | None]
+
+
+class PostStats(NamedTuple):
+    """Histograms & averages of every rating field, along with their monthly time series."""
+
+    posts_count: int
+    ratings: Mapping[str, RatingStats]
+    monthly: Sequence[MonthlyPostStats]
+
+    def as_dict(self) -> dict[str, object]:
+        """Return these statistics as JSON-serializable primitives."""
+        return {
+            "posts_count": self.posts_count,
+            "ratings": {
+                field_name: {
+                    "counts": rating_stats.counts,
+                    "ratings_count": rating_stats.ratings_count,
+                    "average": rating_stats.average,
+                }
+                for field_name, rating_stats in self.ratings.items()
+            },
+            "monthly": [
+                {
+                    "month": monthly_stats.month.strftime("%Y-%m"),
+                    "posts_count": monthly_stats.posts_count,
+                    "averages": monthly_stats.averages,
+                }
+                for monthly_stats in self.monthly
+            ],
+        }
+
+
+def get_post_stats(queryset: "QuerySet[Post]") -> PostStats:
+    """
+    Calculate the rating statistics of the given posts, with exactly two aggregate queries.
+
+    Each rating's `counts` are the number of posts given each rating from 1 to 5.
+    Months without any posts are left out of the monthly time series.
+    """
+    RATINGS: Sequence[int] = tuple(range(1, 6))
+
+    totals: dict[str, object] = queryset.order_by().aggregate(
+        posts_count=Count("pk"),
+        **{
+            f"{field_name}_{rating}": Count("pk", filter=models.Q(**{field_name: rating}))
+            for field_name in RATING_FIELD_NAMES
+            for rating in RATINGS
+        },
+        **{f"{field_name}_average": Avg(field_name) for field_name in RATING_FIELD_NAMES},
+    )
+
+    monthly_totals: QuerySet[dict[str, object]] = queryset.annotate(
+        month=TruncMonth("date_time_created", output_field=models.DateField()),
+    ).order_by("month").values("month").annotate(
+        posts_count=Count("pk"),
+        **{f"{field_name}_average": Avg(field_name) for field_name in RATING_FIELD_NAMES},
+    )
+
+    return PostStats(
+        posts_count=totals["posts_count"],  # type: ignore[arg-type]
+        ratings={
+            field_name: RatingStats(
+                counts=tuple(totals[f"{field_name}_{rating}"] for rating in RATINGS),  # type: ignore[misc]
+                average=totals[f"{field_name}_average"],  # type: ignore[arg-type]
+            )
+            for field_name in RATING_FIELD_NAMES
+        },
+        monthly=[
+            MonthlyPostStats(
+                month=month_totals["month"],  # type: ignore[arg-type]
+                posts_count=month_totals["posts_count"],  # type: ignore[arg-type]
+                averages={
+                    field_name: month_totals[f"{field_name}_average"]  # type: ignore[misc]
+                    for field_name in RATING_FIELD_NAMES
+                },
+            )
+            for month_totals in monthly_totals
+        ],
+    )
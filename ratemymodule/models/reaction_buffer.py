@@ -0,0 +1,352 @@
+"""
+Optional write-behind buffer for the like/dislike reactions users make on posts.
+
+During high-traffic periods, writing every reaction click straight to the database
+causes lots of small write transactions (and lock contention with SQLite).
+When `REACTION_BUFFER_ENABLED` is set, reactions are instead held in an in-process buffer,
+where repeated toggles by the same user on the same post collapse into a single pending
+reaction. The buffer is flushed in batched transactions every
+`REACTION_BUFFER_FLUSH_INTERVAL` seconds, and any reaction states shown to users
+are overlaid with the pending reactions, so the displayed counts stay consistent
+before the flush has happened.
+"""
+
+from collections.abc import Sequence
+
+__all__: Sequence[str] = (
+    "ReactionBuffer",
+    "get_reaction_buffer",
+    "record_post_reaction",
+    "overlay_post_reaction_state",
+)
+
+import atexit
+import functools
+import itertools
+import logging
+import operator
+import threading
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, Final, NamedTuple
+
+from django.apps import apps
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections, models, transaction
+from django.db.models import Q
+
+from core import metrics
+
+from .data_versions import bump_data_versions
+from .reactions import (
+    PostReactionState,
+    Reaction,
+    _get_through_models,
+    annotate_post_reaction_state,
+    apply_post_reaction,
+)
+
+if TYPE_CHECKING:
+    from . import Post, User
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+
+class _PendingReaction(NamedTuple):
+    reaction: Reaction
+    persisted_reaction: Reaction
+
+
+def _reaction_from_state(reaction_state: PostReactionState) -> Reaction:
+    if reaction_state.liked_by_user:
+        return Reaction.LIKE
+
+    if reaction_state.disliked_by_user:
+        return Reaction.DISLIKE
+
+    return Reaction.CLEAR
+
+
+class ReactionBuffer:
+    """
+    In-process buffer that coalesces post reactions, before writing them in batches.
+
+    Pending reactions are stored per post, then per user,
+    so only the latest reaction from each user to each post is ever written.
+    A reaction that returns a user to their already persisted reaction
+    removes the pending entry entirely.
+
+    All buffer operations (including flushing) hold the same lock,
+    so a reaction state read from the database can never include pending reactions
+    that have been half-written.
+    """
+
+    FLUSH_CHUNK_SIZE: Final[int] = 250
+
+    def __init__(self, flush_interval: float | None = None) -> None:
+        """
+        Create a new empty reaction buffer.
+
+        If `flush_interval` is given, a background thread will flush the buffer
+        every `flush_interval` seconds, once the first reaction has been recorded.
+        """
+        self.flush_interval: float | None = flush_interval
+        self._lock: threading.RLock = threading.RLock()
+        self._pending: dict[int, dict[int, _PendingReaction]] = {}
+        self._flush_thread: threading.Thread | None = None
+        self._stop_flushing: threading.Event = threading.Event()
+
+    def __len__(self) -> int:
+        """Return the number of pending (user, post) reactions that have not been written."""
+        with self._lock:
+            return sum(len(post_pending) for post_pending in self._pending.values())
+
+    def record(self, post: "Post", user: "User", reaction: Reaction) -> PostReactionState:
+        """
+        Buffer the given user's reaction to the given post.
+
+        The returned reaction state includes every pending reaction to this post.
+        The creator of a post always likes their own post, so their reaction cannot be changed.
+        """
+        if user.pk == post.user_id:
+            reaction = Reaction.LIKE
+
+        with self._lock:
+            persisted_state: PostReactionState = PostReactionState.from_annotated_post(
+                annotate_post_reaction_state(
+                    type(post)._default_manager.filter(pk=post.pk),
+                    user,
+                ).get(),
+            )
+
+            post_pending: dict[int, _PendingReaction] = self._pending.setdefault(post.pk, {})
+            previous_pending: _PendingReaction | None = post_pending.get(user.pk)
+            persisted_reaction: Reaction = (
+                previous_pending.persisted_reaction
+                if previous_pending is not None
+                else _reaction_from_state(persisted_state)
+            )
+
+            if reaction == persisted_reaction:
+                post_pending.pop(user.pk, None)
+            else:
+                post_pending[user.pk] = _PendingReaction(reaction, persisted_reaction)
+
+            if not post_pending:
+                del self._pending[post.pk]
+
+            self._start_flush_thread()
+
+            return self._overlay(post.pk, user.pk, persisted_state)
+
+    def overlay(self, post_pk: int, user_pk: int | None, reaction_state: PostReactionState) -> PostReactionState:  # noqa: E501
+        """Adjust a persisted reaction state of a post with any pending reactions to it."""
+        with self._lock:
+            return self._overlay(post_pk, user_pk, reaction_state)
+
+    def _overlay(self, post_pk: int, user_pk: int | None, reaction_state: PostReactionState) -> PostReactionState:  # noqa: E501
+        post_pending: dict[int, _PendingReaction] | None = self._pending.get(post_pk)
+        if not post_pending:
+            return reaction_state
+
+        likes_count: int = reaction_state.likes_count
+        dislikes_count: int = reaction_state.dislikes_count
+        pending: _PendingReaction
+        for pending in post_pending.values():
+            likes_count += (
+                (pending.reaction == Reaction.LIKE)
+                - (pending.persisted_reaction == Reaction.LIKE)
+            )
+            dislikes_count += (
+                (pending.reaction == Reaction.DISLIKE)
+                - (pending.persisted_reaction == Reaction.DISLIKE)
+            )
+
+        user_pending: _PendingReaction | None = (
+            post_pending.get(user_pk) if user_pk is not None else None
+        )
+
+        return PostReactionState(
+            likes_count=likes_count,
+            dislikes_count=dislikes_count,
+            liked_by_user=(
+                user_pending.reaction == Reaction.LIKE
+                if user_pending is not None
+                else reaction_state.liked_by_user
+            ),
+            disliked_by_user=(
+                user_pending.reaction == Reaction.DISLIKE
+                if user_pending is not None
+                else reaction_state.disliked_by_user
+            ),
+        )
+
+    def flush(self) -> int:
+        """
+        Write all pending reactions to the database, within a single transaction.
+
+        Reactions are written in chunks of `FLUSH_CHUNK_SIZE`,
+        with at most six queries per chunk.
+        Pending reactions to posts (or by users) that have since been deleted are discarded,
+        so they can never fail the whole flush.
+        The data versions of posts & users are bumped again once the flush is committed.
+        Returns the number of (user, post) reactions that were written.
+        """
+        with self._lock:
+            pending_reactions: list[tuple[int, int, Reaction]] = [
+                (post_pk, user_pk, pending.reaction)
+                for post_pk, post_pending in self._pending.items()
+                for user_pk, pending in post_pending.items()
+            ]
+            if not pending_reactions:
+                return 0
+
+            post_model: type[models.Model] = apps.get_model("ratemymodule", "Post")
+            user_model: type[models.Model] = apps.get_model("ratemymodule", "User")
+
+            liked_through_model: type[models.Model]
+            disliked_through_model: type[models.Model]
+            liked_through_model, disliked_through_model = _get_through_models(post_model)
+
+            written_count: int = 0
+
+            with transaction.atomic():
+                chunk: tuple[tuple[int, int, Reaction], ...]
+                for chunk in itertools.batched(pending_reactions, self.FLUSH_CHUNK_SIZE):
+                    existing_chunk: list[tuple[int, int, Reaction]] = self._exclude_deleted(
+                        chunk,
+                        post_model,
+                        user_model,
+                    )
+                    self._write_chunk(existing_chunk, liked_through_model, Reaction.LIKE)
+                    self._write_chunk(existing_chunk, disliked_through_model, Reaction.DISLIKE)
+                    written_count += len(existing_chunk)
+
+                # NOTE: Another process may have cached a response built from the database before this flush, under the versions bumped when these reactions were buffered
+                if written_count:
+                    bump_data_versions(post_model, user_model)
+
+            self._pending.clear()
+
+            if written_count < len(pending_reactions):
+                logger.warning(
+                    "Discarded %d buffered reactions to deleted posts or by deleted users.",
+                    len(pending_reactions) - written_count,
+                )
+
+            metrics.REACTION_BUFFER_WRITES.inc(written_count)
+
+            return written_count
+
+    @staticmethod
+    def _exclude_deleted(chunk: Iterable[tuple[int, int, Reaction]], post_model: type[models.Model], user_model: type[models.Model]) -> list[tuple[int, int, Reaction]]:  # noqa: E501
+        rows: list[tuple[int, int, Reaction]] = list(chunk)
+
+        existing_post_pks: set[int] = set(
+            post_model._default_manager.filter(
+                pk__in={post_pk for post_pk, _, _ in rows},
+            ).values_list("pk", flat=True),
+        )
+        existing_user_pks: set[int] = set(
+            user_model._default_manager.filter(
+                pk__in={user_pk for _, user_pk, _ in rows},
+            ).values_list("pk", flat=True),
+        )
+
+        return [
+            (post_pk, user_pk, reaction)
+            for post_pk, user_pk, reaction in rows
+            if post_pk in existing_post_pks and user_pk in existing_user_pks
+        ]
+
+    @staticmethod
+    def _write_chunk(chunk: Iterable[tuple[int, int, Reaction]], through_model: type[models.Model], through_reaction: Reaction) -> None:  # noqa: E501
+        removed_filters: list[Q] = []
+        added_rows: list[models.Model] = []
+
+        post_pk: int
+        user_pk: int
+        reaction: Reaction
+        for post_pk, user_pk, reaction in chunk:
+            if reaction == through_reaction:
+                added_rows.append(through_model(post_id=post_pk, user_id=user_pk))
+            else:
+                removed_filters.append(Q(post_id=post_pk, user_id=user_pk))
+
+        if removed_filters:
+            through_model._default_manager.filter(
+                functools.reduce(operator.or_, removed_filters),
+            ).delete()
+
+        if added_rows:
+            through_model._default_manager.bulk_create(added_rows, ignore_conflicts=True)
+
+    def _start_flush_thread(self) -> None:
+        if not self.flush_interval:
+            return
+
+        if self._flush_thread is not None and self._flush_thread.is_alive():
+            return
+
+        self._flush_thread = threading.Thread(
+            target=self._run_flush_loop,
+            name="reaction-buffer-flush",
+            daemon=True,
+        )
+        self._flush_thread.start()
+        atexit.register(self.stop)
+
+    def _run_flush_loop(self) -> None:
+        if not self.flush_interval:
+            return
+
+        while not self._stop_flushing.wait(self.flush_interval):
+            try:
+                self.flush()
+            except DatabaseError:
+                logger.exception("Failed to flush buffered post reactions.")
+            finally:
+                close_old_connections()
+
+    def stop(self) -> None:
+        """Stop the background flushing thread, then write any remaining pending reactions."""
+        self._stop_flushing.set()
+
+        try:
+            self.flush()
+        except DatabaseError:
+            logger.exception("Failed to flush buffered post reactions.")
+
+
+@functools.cache
+def get_reaction_buffer() -> ReactionBuffer:
+    """Return the reaction buffer shared by this process."""
+    return ReactionBuffer(flush_interval=settings.REACTION_BUFFER_FLUSH_INTERVAL)
+
+
+def record_post_reaction(post: "Post", user: "User", reaction: Reaction) -> PostReactionState:
+    """
+    Set the given user's reaction to the given post.
+
+    The reaction is buffered if `REACTION_BUFFER_ENABLED` is set,
+    otherwise it is written to the database immediately.
+    """
+    metrics.POST_REACTIONS.inc(
+        reaction=reaction.name.lower(),
+        mode="buffered" if settings.REACTION_BUFFER_ENABLED else "direct",
+    )
+
+    if not settings.REACTION_BUFFER_ENABLED:
+        return apply_post_reaction(post=post, user=user, reaction=reaction)
+
+    # NOTE: Buffered reactions are shown straight away, so the data has already changed
+    bump_data_versions(type(post), type(user))
+
+    return get_reaction_buffer().record(post=post, user=user, reaction=reaction)
+
+
+def overlay_post_reaction_state(post_pk: int, user_pk: int | None, reaction_state: PostReactionState) -> PostReactionState:  # noqa: E501
+    """Adjust a persisted reaction state with any buffered reactions that are still pending."""
+    if not settings.REACTION_BUFFER_ENABLED:
+        return reaction_state
+
+    return get_reaction_buffer().overlay(post_pk, user_pk, reaction_state)
@@ -0,0 +1,184 @@
+"""Service functions to apply & read the like/dislike reactions users make on posts."""
+
+from collections.abc import Sequence
+
+__all__: Sequence[str] = (
+    "Reaction",
+    "PostReactionState",
+    "apply_post_reaction",
+    "annotate_post_reaction_state",
+)
+
+from typing import TYPE_CHECKING, Final, NamedTuple, Self
+
+from django.db import models, transaction
+from django.db.models import Count, Exists, OuterRef, QuerySet, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils.translation import gettext_lazy as _
+
+from .data_versions import bump_data_versions
+
+if TYPE_CHECKING:
+    from django.contrib.auth.models import AnonymousUser
+
+    from . import Post, User
+
+
+class Reaction(models.TextChoices):
+    """Enum of the reactions a user can have towards a single post."""
+
+    LIKE = "LIK", _("Like")
+    DISLIKE = "DIS", _("Dislike")
+    CLEAR = "CLR", _("No Reaction")
+
+
+class PostReactionState(NamedTuple):
+    """The counts of reactions on a post, along with one user's reaction to that post."""
+
+    likes_count: int
+    dislikes_count: int
+    liked_by_user: bool
+    disliked_by_user: bool
+
+    @property
+    def overall_likes_count(self) -> int:
+        """The overall number of likes the post has."""
+        return self.likes_count - self.dislikes_count
+
+    @classmethod
+    def from_annotated_post(cls, post: "Post") -> Self:
+        """Build the reaction state from a post fetched with `annotate_post_reaction_state`."""
+        try:
+            return cls(
+                likes_count=post.reaction_likes_count,  # type: ignore[attr-defined]
+                dislikes_count=post.reaction_dislikes_count,  # type: ignore[attr-defined]
+                liked_by_user=post.reaction_liked_by_user,  # type: ignore[attr-defined]
+                disliked_by_user=post.reaction_disliked_by_user,  # type: ignore[attr-defined]
+            )
+        except AttributeError:
+            NOT_ANNOTATED_MESSAGE: Final[str] = (
+                "Post was not retrieved with its reaction state annotations."
+            )
+            raise AttributeError(NOT_ANNOTATED_MESSAGE) from None
+
+
+def _get_through_models(post_model: type["Post"]) -> tuple[type[models.Model], type[models.Model]]:  # noqa: E501
+    return (
+        post_model.liked_user_set.through,  # type: ignore[attr-defined]
+        post_model.disliked_user_set.through,  # type: ignore[attr-defined]
+    )
+
+
+def _reaction_count_subquery(through_model: type[models.Model], post_pk: object) -> Coalesce:
+    return Coalesce(
+        Subquery(
+            through_model._default_manager.filter(post_id=post_pk).values(
+                "post_id",
+            ).annotate(
+                reaction_count=Count("*"),
+            ).values("reaction_count")[:1],
+        ),
+        0,
+    )
+
+
+def annotate_post_reaction_state(queryset: QuerySet["Post"], user: "User | AnonymousUser") -> QuerySet["Post"]:  # noqa: E501
+    """
+    Annotate every post in the queryset with its reaction counts & the given user's reaction.
+
+    The returned posts can be turned into `PostReactionState` objects
+    without running any extra queries.
+    """
+    liked_through_model: type[models.Model]
+    disliked_through_model: type[models.Model]
+    liked_through_model, disliked_through_model = _get_through_models(queryset.model)
+
+    if not user.is_authenticated:
+        return queryset.annotate(
+            reaction_likes_count=_reaction_count_subquery(liked_through_model, OuterRef("pk")),
+            reaction_dislikes_count=_reaction_count_subquery(
+                disliked_through_model,
+                OuterRef("pk"),
+            ),
+            reaction_liked_by_user=Value(False),  # noqa: FBT003
+            reaction_disliked_by_user=Value(False),  # noqa: FBT003
+            reaction_user_pk=Value(None, output_field=models.BigIntegerField()),
+        )
+
+    return queryset.annotate(
+        reaction_likes_count=_reaction_count_subquery(liked_through_model, OuterRef("pk")),
+        reaction_dislikes_count=_reaction_count_subquery(
+            disliked_through_model,
+            OuterRef("pk"),
+        ),
+        reaction_liked_by_user=Exists(
+            liked_through_model._default_manager.filter(
+                post_id=OuterRef("pk"),
+                user_id=user.pk,
+            ),
+        ),
+        reaction_disliked_by_user=Exists(
+            disliked_through_model._default_manager.filter(
+                post_id=OuterRef("pk"),
+                user_id=user.pk,
+            ),
+        ),
+        reaction_user_pk=Value(user.pk, output_field=models.BigIntegerField()),
+    )
+
+
+def apply_post_reaction(post: "Post", user: "User", reaction: Reaction) -> PostReactionState:
+    """
+    Set the given user's reaction to the given post, within a single transaction.
+
+    Exactly two writes are made (removing the opposite reaction & inserting the new one,
+    or removing both reactions when clearing), followed by one read of the new counts.
+    The creator of a post always likes their own post, so their reaction cannot be changed.
+
+    The through-table rows are written directly, so no `m2m_changed` signals are sent
+    (the data versions of posts & users are bumped here instead).
+    """
+    liked_through_model: type[models.Model]
+    disliked_through_model: type[models.Model]
+    liked_through_model, disliked_through_model = _get_through_models(type(post))
+
+    if user.pk == post.user_id:
+        reaction = Reaction.LIKE
+
+    with transaction.atomic():
+        if reaction != Reaction.LIKE:
+            liked_through_model._default_manager.filter(
+                post_id=post.pk,
+                user_id=user.pk,
+            ).delete()
+
+        if reaction != Reaction.DISLIKE:
+            disliked_through_model._default_manager.filter(
+                post_id=post.pk,
+                user_id=user.pk,
+            ).delete()
+
+        if reaction != Reaction.CLEAR:
+            added_reaction_through_model: type[models.Model] = (
+                liked_through_model if reaction == Reaction.LIKE else disliked_through_model
+            )
+            added_reaction_through_model._default_manager.bulk_create(
+                (added_reaction_through_model(post_id=post.pk, user_id=user.pk),),
+                ignore_conflicts=True,
+            )
+
+        reaction_counts: dict[str, int] = type(post)._default_manager.filter(
+            pk=post.pk,
+        ).values(
+            likes_count=_reaction_count_subquery(liked_through_model, OuterRef("pk")),
+            dislikes_count=_reaction_count_subquery(disliked_through_model, OuterRef("pk")),
+        ).get()
+
+        bump_data_versions(type(post), type(user))
+
+    return PostReactionState(
+        likes_count=reaction_counts["likes_count"],
+        dislikes_count=reaction_counts["dislikes_count"],
+        liked_by_user=reaction == Reaction.LIKE,
+        disliked_by_user=reaction == Reaction.DISLIKE,
+    )
@@ -4,14 +4,34 @@ from collections.abc import Sequence
 
 __all__: Sequence[str] = ("ready",)
 
-from collections.abc import Set
 from typing import Final, Literal, TypeAlias
 
 from django import dispatch
-from django.db import IntegrityError
-from django.db.models import Model, signals
+from django.apps import AppConfig, apps
+from django.conf import settings
+from django.db import IntegrityError, connections, router
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.backends.signals import connection_created
+from django.db.models import (
+    CharField,
+    Exists,
+    ExpressionWrapper,
+    F,
+    Model,
+    OuterRef,
+    Q,
+    QuerySet,
+    signals,
+)
 
 from . import Course, Module, University, User
+from .data_versions import bump_data_versions
+from .integrity import (
+    forget_installed_integrity_triggers,
+    install_integrity_triggers,
+    is_enforced_by_database,
+    remove_integrity_triggers,
+)
 
 M2MChangedAction: TypeAlias = (
     Literal["pre_add"]
@@ -25,6 +45,19 @@ M2MChangedAction: TypeAlias = (
 
 def ready() -> None:
     """Initialise this module when importing & starting signal listeners."""
+    # NOTE: Receivers are connected per-model, because a `post_delete` receiver without a sender would stop Django from fast-deleting objects of every model
+    versioned_model: type[Model]
+    for versioned_model in apps.get_app_config("ratemymodule").get_models():
+        signals.post_save.connect(
+            model_data_changed,
+            sender=versioned_model,
+            dispatch_uid=f"model_data_saved_{versioned_model._meta.label_lower}",
+        )
+        signals.post_delete.connect(
+            model_data_changed,
+            sender=versioned_model,
+            dispatch_uid=f"model_data_deleted_{versioned_model._meta.label_lower}",
+        )
 
 
 # noinspection PyUnusedLocal
@@ -33,6 +66,9 @@ def course_removed_from_user(sender: Model, instance: User | Course, action: M2M
     if action not in ("pre_remove", "pre_clear"):
         return
 
+    if is_enforced_by_database(requires_deferred_checks=True):
+        return
+
     if not isinstance(instance, User) or reverse or model is not Course:
         return
 
@@ -60,28 +96,29 @@ def user_removed_from_course(sender: Model, instance: Course | User, action: M2M
     if action not in ("pre_remove", "pre_clear"):
         return
 
+    if is_enforced_by_database(requires_deferred_checks=True):
+        return
+
     if not isinstance(instance, Course) or not reverse or model is not User:
         return
 
     if not (isinstance(instance, Course) and reverse and model is User):
         raise RuntimeError
 
-    ALL_COURSES_REMOVED_FROM_USER: Final[bool] = any(
-        (
-            not to_be_removed_enrolled_user.is_staff
-            and (
-                not to_be_removed_enrolled_user.enrolled_course_set.exclude(
-                    pk=instance.pk,
-                ).exists()
-            )
-        )
-        for to_be_removed_enrolled_user
-        in (
-            instance.enrolled_user_set.all()
-            if action == "pre_clear"
-            else User.objects.filter(pk__in=pk_set)
-        )
+    to_be_removed_enrolled_users: QuerySet[User] = (
+        instance.enrolled_user_set.all()
+        if action == "pre_clear"
+        else User.objects.filter(pk__in=pk_set)
     )
+    ALL_COURSES_REMOVED_FROM_USER: Final[bool] = to_be_removed_enrolled_users.filter(
+        is_staff=False,
+    ).exclude(
+        Exists(
+            User.enrolled_course_set.through.objects.filter(
+                user_id=OuterRef("pk"),
+            ).exclude(course_id=instance.pk),
+        ),
+    ).exists()
     if ALL_COURSES_REMOVED_FROM_USER:
         # noinspection PyProtectedMember
         ALL_COURSES_REMOVED_FROM_USER_MESSAGE: Final[str] = (
@@ -96,6 +133,9 @@ def course_removed_from_module(sender: Model, instance: Module | Course, action:
     if action not in ("pre_remove", "pre_clear"):
         return
 
+    if is_enforced_by_database(requires_deferred_checks=True):
+        return
+
     if not isinstance(instance, Module) or reverse or model is not Course:
         return
 
@@ -120,21 +160,27 @@ def module_removed_from_course(sender: Model, instance: Course | Module, action:
     if action not in ("pre_remove", "pre_clear"):
         return
 
+    if is_enforced_by_database(requires_deferred_checks=True):
+        return
+
     if not isinstance(instance, Course) or not reverse or model is not Module:
         return
 
     if not (isinstance(instance, Course) and reverse and model is Module):
         raise RuntimeError
 
-    ALL_COURSES_REMOVED_FROM_MODULE: Final[bool] = any(
-        not to_be_removed_module.course_set.exclude(pk=instance.pk).exists()
-        for to_be_removed_module
-        in (
-            instance.module_set.all()
-            if action == "pre_clear"
-            else Module.objects.filter(pk__in=pk_set)
-        )
+    to_be_removed_modules: QuerySet[Module] = (
+        instance.module_set.all()
+        if action == "pre_clear"
+        else Module.objects.filter(pk__in=pk_set)
     )
+    ALL_COURSES_REMOVED_FROM_MODULE: Final[bool] = to_be_removed_modules.exclude(
+        Exists(
+            Module.course_set.through.objects.filter(
+                module_id=OuterRef("pk"),
+            ).exclude(course_id=instance.pk),
+        ),
+    ).exists()
     if ALL_COURSES_REMOVED_FROM_MODULE:
         # noinspection PyProtectedMember
         ALL_COURSES_REMOVED_FROM_MODULE_MESSAGE: Final[str] = (
@@ -149,6 +195,9 @@ def course_added_to_user(sender: Model, instance: User | Course, action: M2MChan
     if action != "pre_add":
         return
 
+    if is_enforced_by_database():
+        return
+
     if not isinstance(instance, User) or reverse or model is not Course:
         return
 
@@ -179,6 +228,9 @@ def user_added_to_course(sender: Model, instance: Course | User, action: M2MChan
     if action != "pre_add":
         return
 
+    if is_enforced_by_database():
+        return
+
     if not isinstance(instance, Course) or not reverse or model is not User:
         return
 
@@ -196,48 +248,42 @@ def user_added_to_course(sender: Model, instance: Course | User, action: M2MChan
         } across multiple universities."
     )
 
-    ADDED_USERS_ARE_NOT_AT_COURSES_UNIVERSITY: Final[bool] = any(
-        (user.university and user.university != instance.university)
-        for user
-        in User.objects.filter(pk__in=pk_set)
-    )
+    ADDED_USERS_ARE_NOT_AT_COURSES_UNIVERSITY: Final[bool] = User.objects.filter(
+        pk__in=pk_set,
+    ).exclude(
+        email__endswith=instance.university.email_domain,
+    ).filter(
+        Exists(
+            University.objects.alias(
+                user_email=ExpressionWrapper(OuterRef("email"), output_field=CharField()),
+            ).filter(
+                user_email__endswith=F("email_domain"),
+            ),
+        ),
+    ).exists()
     if ADDED_USERS_ARE_NOT_AT_COURSES_UNIVERSITY:
         raise IntegrityError(COURSE_IS_NOT_AT_USERS_UNIVERSITY_MESSAGE)
 
 
-def _get_module_university_from_course_pk(course_pk_set: Set[int]) -> University:
-    if not course_pk_set:
-        raise Course.DoesNotExist
-
-    mutable_course_pk_set: set[int] = set(course_pk_set).copy()
-
-    try:
-        return Course.objects.get(pk=mutable_course_pk_set.pop()).university
-    except Course.DoesNotExist:
-        return _get_module_university_from_course_pk(mutable_course_pk_set)
-
-
 # noinspection PyUnusedLocal
 @dispatch.receiver(signals.m2m_changed, sender=Module.course_set.through)
 def course_added_to_module(sender: Model, instance: Module | Course, action: M2MChangedAction, reverse: bool, model: type[Module | Course], pk_set: set[int] | None, **_kwargs: str) -> None:  # noqa: E501, FBT001, ARG001
     if action != "pre_add":
         return
 
+    if is_enforced_by_database():
+        return
+
     if not isinstance(instance, Module) or reverse or model is not Course:
         return
 
     if not (isinstance(instance, Module) and not reverse and model is Course):
         raise RuntimeError
 
-    try:
-        module_university: University = instance.university
-    except Course.DoesNotExist:
-        if pk_set is None:
-            raise Course.DoesNotExist from None
-
-        module_university = _get_module_university_from_course_pk(pk_set)
-
-    if Course.objects.filter(pk__in=pk_set).exclude(university=module_university).exists():
+    MODULE_ATTACHED_TO_MULTIPLE_UNIVERSITIES: Final[bool] = Course.objects.filter(
+        Q(pk__in=pk_set) | Q(module_set=instance),
+    ).values("university_id").distinct().count() > 1
+    if MODULE_ATTACHED_TO_MULTIPLE_UNIVERSITIES:
         # noinspection PyProtectedMember
         MODULE_ATTACHED_TO_MULTIPLE_UNIVERSITIES_MESSAGE: Final[str] = (
             "VALIDATION constraint failed: "
@@ -250,6 +296,46 @@ def course_added_to_module(sender: Model, instance: Module | Course, action: M2M
         )
         raise IntegrityError(MODULE_ATTACHED_TO_MULTIPLE_UNIVERSITIES_MESSAGE)
 
+
+# noinspection PyUnusedLocal
+def model_data_changed(sender: type[Model], update_fields: frozenset[str] | None = None, **_kwargs: object) -> None:  # noqa: E501
+    # NOTE: Logging in only updates the user's `last_login`, which is never shown to anyone but staff, so it would needlessly invalidate every response that includes users
+    if update_fields is not None and update_fields <= {"last_login"}:
+        return
+
+    bump_data_versions(sender)
+
+
+# noinspection PyUnusedLocal
+@dispatch.receiver(signals.m2m_changed)
+def model_relations_changed(sender: type[Model], instance: Model, action: M2MChangedAction, model: type[Model], **_kwargs: object) -> None:  # noqa: E501
+    if sender._meta.app_label != "ratemymodule":
+        return
+
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    bump_data_versions(type(instance), model)
+
+
+# noinspection PyUnusedLocal
+@dispatch.receiver(signals.post_migrate)
+def sync_integrity_triggers(sender: AppConfig, using: str, **_kwargs: object) -> None:
+    if sender.name != "ratemymodule" or not router.allow_migrate(using, sender.label):
+        return
+
+    if settings.DATABASE_INTEGRITY_BACKEND == "database":
+        install_integrity_triggers(connections[using])
+    else:
+        remove_integrity_triggers(connections[using])
+
+
+# noinspection PyUnusedLocal
+@dispatch.receiver(connection_created)
+def database_connection_created(connection: BaseDatabaseWrapper, **_kwargs: object) -> None:
+    forget_installed_integrity_triggers(connection)
+
+
 # DONE: Signal to prevent deleting all courses from user (if they are not staff)
 # DONE: Signal to prevent deleting user from course if it would make their enrolled_course_set empty (if they are not staff)
 # DONE: Signal to prevent deleting all courses from module
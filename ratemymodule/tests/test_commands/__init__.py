@@ -0,0 +1 @@
+"""Test suite for custom management commands."""
@@ -0,0 +1,43 @@
+"""Test suite for the `export_posts` management command."""
+
+from collections.abc import Sequence
+
+__all__: Sequence[str] = ()
+
+import json
+from io import StringIO
+from typing import TYPE_CHECKING
+
+from django.core.management import CommandError, call_command
+
+from ratemymodule.tests.utils import TestCase
+from ratemymodule.utils.benchmarks import seed_benchmark_data
+
+if TYPE_CHECKING:
+    from ratemymodule.utils.benchmarks import BenchmarkData
+
+
+class ExportPostsCommandTests(TestCase):
+    def test_posts_of_module_are_exported(self) -> None:
+        data: BenchmarkData = seed_benchmark_data(1)
+        stdout: StringIO = StringIO()
+
+        call_command(
+            "export_posts",
+            "--university",
+            data.university.email_domain,
+            "--module",
+            data.module.code,
+            stdout=stdout,
+            stderr=StringIO(),
+        )
+
+        rows: list[dict[str, object]] = [
+            json.loads(line) for line in stdout.getvalue().splitlines()
+        ]
+        self.assertEqual(len(rows), data.module.post_set.count())
+        self.assertEqual({row["module"] for row in rows}, {data.module.code})
+
+    def test_module_requires_university(self) -> None:
+        with self.assertRaisesMessage(CommandError, "--module requires --university."):
+            call_command("export_posts", "--module", "LT01001", stdout=StringIO())
@@ -0,0 +1,164 @@
+"""Test suite for the `import_catalogue` management command."""
+
+from collections.abc import Sequence
+
+__all__: Sequence[str] = ()
+
+import json
+from collections.abc import Iterable, Mapping
+from io import StringIO
+from typing import TYPE_CHECKING
+
+import django.urls
+from django.contrib.auth.models import AnonymousUser
+from django.core.management import call_command
+from django.test import override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from api_rest.views import UniversityViewSet
+from ratemymodule.models import Course, Module, Post, University, User
+from ratemymodule.tests.utils import TestCase
+
+if TYPE_CHECKING:
+    from rest_framework.request import Request
+    from rest_framework.response import Response
+
+
+def _to_jsonl(rows: Iterable[Mapping[str, object]]) -> StringIO:
+    return StringIO("".join(f"{json.dumps(row)}\n" for row in rows))
+
+
+class ImportCatalogueCommandTests(TestCase):
+    CATALOGUE_ROWS: Sequence[Mapping[str, object]] = (
+        {
+            "type": "university",
+            "name": "University of Importing",
+            "short_name": "UoI",
+            "email_domain": "importing.ac.uk",
+            "founding_date": "1900-01-01",
+        },
+        {
+            "type": "course",
+            "university": "importing.ac.uk",
+            "name": "BSc Bulk Loading",
+            "student_type": "a bulk loader",
+        },
+        {
+            "type": "module",
+            "university": "importing.ac.uk",
+            "code": "IMP101",
+            "name": "Introduction to Importing",
+            "year_started": "2000-09-01",
+            "courses": ["BSc Bulk Loading"],
+        },
+    )
+
+    def _call_import_catalogue(self, file: StringIO, *args: str) -> tuple[str, str]:
+        stdout: StringIO = StringIO()
+        stderr: StringIO = StringIO()
+
+        call_command(
+            "import_catalogue",
+            "-",
+            *args,
+            stdin=file,
+            stdout=stdout,
+            stderr=stderr,
+        )
+
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_import_jsonl_creates_catalogue(self) -> None:
+        stderr: str
+        _, stderr = self._call_import_catalogue(
+            _to_jsonl(self.CATALOGUE_ROWS),
+            "--format=jsonl",
+        )
+
+        self.assertEqual("", stderr)
+
+        module: Module = Module.objects.get(code="IMP101")
+        self.assertEqual("Introduction to Importing", module.name)
+        self.assertQuerySetEqual(
+            module.course_set.values_list("name", "university__email_domain"),
+            [("BSc Bulk Loading", "importing.ac.uk")],
+        )
+
+    @override_settings(DATA_VERSIONS_ENABLED=True)
+    def test_import_is_reflected_in_cached_api_lists(self) -> None:
+        def list_universities() -> "Response":
+            request: Request = APIRequestFactory().get(
+                django.urls.reverse("api_rest:university-list"),
+            )
+            force_authenticate(request, user=AnonymousUser())
+            response: Response = UniversityViewSet.as_view({"get": "list"})(request)
+            return response.render()
+
+        self.assertNotContains(list_universities(), "University of Importing")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self._call_import_catalogue(_to_jsonl(self.CATALOGUE_ROWS), "--format=jsonl")
+
+        self.assertContains(list_universities(), "University of Importing")
+
+    def test_reimport_updates_instead_of_duplicating(self) -> None:
+        self._call_import_catalogue(_to_jsonl(self.CATALOGUE_ROWS), "--format=jsonl")
+
+        stdout: str
+        stdout, _ = self._call_import_catalogue(
+            _to_jsonl(
+                [
+                    *self.CATALOGUE_ROWS[:2],
+                    {**self.CATALOGUE_ROWS[2], "name": "Advanced Importing"},
+                ],
+            ),
+            "--format=jsonl",
+        )
+
+        self.assertIn("0 created, 3 updated, 0 errors", stdout)
+        self.assertEqual(1, University.objects.filter(email_domain="importing.ac.uk").count())
+        self.assertEqual("Advanced Importing", Module.objects.get(code="IMP101").name)
+
+    def test_invalid_rows_reported_without_aborting_batch(self) -> None:
+        stderr: str
+        _, stderr = self._call_import_catalogue(
+            _to_jsonl(
+                [
+                    *self.CATALOGUE_ROWS,
+                    {"type": "course", "university": "missing.ac.uk", "name": "BSc Nothing"},
+                    {**self.CATALOGUE_ROWS[2], "code": "IMP102", "courses": []},
+                ],
+            ),
+            "--format=jsonl",
+        )
+
+        self.assertIn("Row 4: Missing value for column 'student_type'.", stderr)
+        self.assertIn("Row 5: Modules must be attached to at least one course.", stderr)
+        self.assertTrue(Course.objects.filter(name="BSc Bulk Loading").exists())
+        self.assertFalse(Module.objects.filter(code="IMP102").exists())
+
+    def test_import_csv_posts(self) -> None:
+        self._call_import_catalogue(_to_jsonl(self.CATALOGUE_ROWS), "--format=jsonl")
+
+        user: User = User.objects.create_user(email="student@importing.ac.uk")
+        user.enrolled_course_set.add(Course.objects.get(name="BSc Bulk Loading"))
+
+        stderr: str
+        _, stderr = self._call_import_catalogue(
+            StringIO(
+                "type,university,module,user,overall_rating,content,academic_year_start\n"
+                "post,importing.ac.uk,IMP101,student@importing.ac.uk,4,Great module,2023\n"
+                "post,importing.ac.uk,IMP101,nobody@importing.ac.uk,4,Unknown user,2023\n",
+            ),
+            "--format=csv",
+            "--batch-size=1",
+        )
+
+        self.assertEqual(
+            "Row 3: No user with email address 'nobody@importing.ac.uk'.",
+            stderr.strip(),
+        )
+
+        post: Post = Post.objects.get(user=user, module__code="IMP101")
+        self.assertEqual(4, post.overall_rating)
+        self.assertTrue(post.liked_user_set.filter(pk=user.pk).exists())
@@ -0,0 +1,81 @@
+"""Test suite for the `populate_load_test_database` management command."""
+
+from collections.abc import Sequence
+
+__all__: Sequence[str] = ()
+
+from io import StringIO
+from typing import Final
+
+from django.core.management import call_command
+from django.db.models import Count, Model
+
+from ratemymodule.models import Course, Module, Post, University, User
+from ratemymodule.models.data_versions import DataVersion, get_data_version
+from ratemymodule.tests.utils import TestCase
+
+
+class PopulateLoadTestDatabaseCommandTests(TestCase):
+    def test_creates_requested_volume_of_valid_data(self) -> None:
+        call_command(
+            "populate_load_test_database",
+            "--universities=1",
+            "--courses-per-university=2",
+            "--modules-per-course=2",
+            "--years-back=1",
+            "--reviews-per-month=1",
+            "--reactions-per-post=2",
+            stdout=StringIO(),
+        )
+
+        posts: Sequence[Post] = list(
+            Post.objects.filter(module__code__startswith="LT").select_related("module"),
+        )
+        self.assertEqual(2 * 2 * 12, len(posts))
+
+        post: Post
+        for post in posts:
+            with self.subTest(post=post):
+                post.full_clean()
+                self.assertTrue(post.liked_user_set.filter(pk=post.user_id).exists())
+                self.assertFalse(post.disliked_user_set.filter(pk=post.user_id).exists())
+                self.assertGreaterEqual(
+                    post.date_time_created.date(),
+                    post.module.year_started,
+                )
+
+        self.assertFalse(
+            any(
+                user.has_usable_password()
+                for user in User.objects.filter(made_post_set__in=posts)
+            ),
+        )
+        self.assertFalse(
+            Module.objects.filter(code__startswith="LT")
+            .annotate(courses_count=Count("course_set"))
+            .exclude(courses_count=1)
+            .exists(),
+        )
+
+    def test_bumps_data_versions_of_created_models(self) -> None:
+        CREATED_MODELS: Final[Sequence[type[Model]]] = (University, Course, Module, Post, User)
+        previous_data_versions: Sequence[DataVersion] = [
+            get_data_version((model,)) for model in CREATED_MODELS
+        ]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command(
+                "populate_load_test_database",
+                "--universities=1",
+                "--courses-per-university=1",
+                "--modules-per-course=1",
+                "--years-back=1",
+                "--reviews-per-month=1",
+                stdout=StringIO(),
+            )
+
+        model: type[Model]
+        previous_data_version: DataVersion
+        for model, previous_data_version in zip(CREATED_MODELS, previous_data_versions, strict=True):  # noqa: E501
+            with self.subTest(model=model):
+                self.assertNotEqual(get_data_version((model,)), previous_data_version)
@@ -0,0 +1,74 @@
+"""Test suite for the database-enforced integrity backend."""
+
+from collections.abc import Sequence
+
+__all__: Sequence[str] = ()
+
+import unittest
+from typing import override
+
+from django.db import IntegrityError, connection, transaction
+from django.test import override_settings
+from django.utils import timezone
+
+from ratemymodule.models import Course, Module, Post, User
+from ratemymodule.models.integrity import (
+    install_integrity_triggers,
+    is_enforced_by_database,
+    remove_integrity_triggers,
+)
+from ratemymodule.tests.utils import TestCase, TestDataGenerator
+
+
+@unittest.skipUnless(
+    connection.vendor in ("sqlite", "postgresql"),
+    "Integrity triggers only exist for SQLite & PostgreSQL.",
+)
+@override_settings(DATABASE_INTEGRITY_BACKEND="database")
+class DatabaseIntegrityTriggerTests(TestCase):
+    @override
+    def setUp(self) -> None:
+        super().setUp()
+        install_integrity_triggers(connection)
+
+    def test_course_at_different_university_added_to_user(self) -> None:
+        user: User = TestDataGenerator.create_enrolled_user(TestDataGenerator.create_course())
+
+        with transaction.atomic(), self.assertRaisesRegex(IntegrityError, r"VALIDATION constraint failed.*user cannot be enrolled.*multiple universities"):  # noqa: E501
+            user.enrolled_course_set.add(TestDataGenerator.create_course())
+
+    def test_course_at_different_university_added_to_module(self) -> None:
+        module: Module = TestDataGenerator.create_module()
+        module.course_set.add(TestDataGenerator.create_course())
+
+        with transaction.atomic(), self.assertRaisesRegex(IntegrityError, r"VALIDATION constraint failed.*module cannot be attached.*multiple universities"):  # noqa: E501
+            module.course_set.add(TestDataGenerator.create_course())
+
+    def test_new_post_is_liked_by_creator_without_python(self) -> None:
+        course: Course = TestDataGenerator.create_course()
+        creator: User = TestDataGenerator.create_enrolled_user(course)
+        module: Module = TestDataGenerator.create_module()
+        module.course_set.add(course)
+
+        post: Post = Post.objects.create(
+            module=module,
+            user=creator,
+            overall_rating=Post.Ratings.FIVE,
+            academic_year_start=timezone.now().year,
+        )
+        post.disliked_user_set.add(creator)
+
+        self.assertIn(creator, post.liked_user_set.all())
+        self.assertNotIn(creator, post.disliked_user_set.all())
+
+    def test_python_receivers_enforce_invariants_until_triggers_are_installed(self) -> None:
+        remove_integrity_triggers(connection)
+        user: User = TestDataGenerator.create_enrolled_user(TestDataGenerator.create_course())
+
+        self.assertFalse(is_enforced_by_database())
+        with transaction.atomic(), self.assertRaises(IntegrityError):
+            user.enrolled_course_set.add(TestDataGenerator.create_course())
+
+        install_integrity_triggers(connection)
+
+        self.assertTrue(is_enforced_by_database())
@@ -0,0 +1,357 @@
+"""Test suite for the `Post` model."""
+
+from collections.abc import Sequence
+
+__all__: Sequence[str] = ()
+
+from typing import TYPE_CHECKING
+
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from ratemymodule.models import Course, Module, Post, User
+from ratemymodule.models.data_versions import get_data_version
+from ratemymodule.models.reaction_buffer import ReactionBuffer
+from ratemymodule.models.reactions import (
+    PostReactionState,
+    Reaction,
+    annotate_post_reaction_state,
+)
+from ratemymodule.tests.utils import TestCase, TestDataGenerator
+
+if TYPE_CHECKING:
+    from django.http import HttpRequest
+
+
+def _create_module(course: Course) -> Module:
+    module: Module = TestDataGenerator.create_module()
+    module.course_set.add(course)
+    return module
+
+
+def _create_post(user: User, module: Module) -> Post:
+    return Post.objects.create(
+        module=module,
+        user=user,
+        overall_rating=Post.Ratings.FIVE,
+        academic_year_start=timezone.now().year,
+    )
+
+
+class PostCreatorReactionTests(TestCase):
+    def test_new_post_is_liked_by_creator(self) -> None:
+        course: Course = TestDataGenerator.create_course()
+        user: User = TestDataGenerator.create_enrolled_user(course)
+
+        post: Post = _create_post(user, _create_module(course))
+
+        self.assertIn(user, post.liked_user_set.all())
+        self.assertNotIn(user, post.disliked_user_set.all())
+
+    def test_resaved_post_restores_creator_like(self) -> None:
+        course: Course = TestDataGenerator.create_course()
+        user: User = TestDataGenerator.create_enrolled_user(course)
+        post: Post = _create_post(user, _create_module(course))
+
+        post.liked_user_set.remove(user)
+        post.disliked_user_set.add(user)
+        post.save()
+
+        self.assertIn(user, post.liked_user_set.all())
+        self.assertNotIn(user, post.disliked_user_set.all())
+
+    def test_post_save_query_count_independent_of_likes(self) -> None:
+        course: Course = TestDataGenerator.create_course()
+        post: Post = _create_post(
+            TestDataGenerator.create_enrolled_user(course),
+            _create_module(course),
+        )
+
+        with CaptureQueriesContext(connection) as few_likes_queries:
+            post.save()
+
+        post.liked_user_set.add(
+            *(TestDataGenerator.create_enrolled_user(course) for _ in range(5)),
+        )
+
+        with CaptureQueriesContext(connection) as many_likes_queries:
+            post.save()
+
+        self.assertEqual(len(few_likes_queries), len(many_likes_queries))
+
+    def test_user_save_query_count_independent_of_made_posts(self) -> None:
+        course: Course = TestDataGenerator.create_course()
+        user: User = TestDataGenerator.create_enrolled_user(course)
+
+        with CaptureQueriesContext(connection) as no_posts_queries:
+            user.save(update_fields=("last_login",))
+
+        _create_post(user, _create_module(course))
+        _create_post(user, _create_module(course))
+
+        with CaptureQueriesContext(connection) as many_posts_queries:
+            user.save(update_fields=("last_login",))
+
+        self.assertEqual(len(no_posts_queries), len(many_posts_queries))
+
+
+class ApplyPostReactionTests(TestCase):
+    def test_like_then_dislike_then_clear(self) -> None:
+        course: Course = TestDataGenerator.create_course()
+        post: Post = _create_post(
+            TestDataGenerator.create_enrolled_user(course),
+            _create_module(course),
+        )
+        reactor: User = TestDataGenerator.create_enrolled_user(course)
+
+        liked_state: PostReactionState = post.user_like(reactor)
+        self.assertEqual(
+            liked_state,
+            PostReactionState(
+                likes_count=2,
+                dislikes_count=0,
+                liked_by_user=True,
+                disliked_by_user=False,
+            ),
+        )
+
+        disliked_state: PostReactionState = post.user_dislike(reactor)
+        self.assertEqual(
+            disliked_state,
+            PostReactionState(
+                likes_count=1,
+                dislikes_count=1,
+                liked_by_user=False,
+                disliked_by_user=True,
+            ),
+        )
+        self.assertNotIn(reactor, post.liked_user_set.all())
+        self.assertIn(reactor, post.disliked_user_set.all())
+
+        cleared_state: PostReactionState = post.user_unlike(reactor)
+        self.assertEqual(cleared_state.overall_likes_count, 1)
+        self.assertFalse(cleared_state.liked_by_user or cleared_state.disliked_by_user)
+        self.assertNotIn(reactor, post.disliked_user_set.all())
+
+    def test_repeated_like_is_idempotent(self) -> None:
+        course: Course = TestDataGenerator.create_course()
+        post: Post = _create_post(
+            TestDataGenerator.create_enrolled_user(course),
+            _create_module(course),
+        )
+        reactor: User = TestDataGenerator.create_enrolled_user(course)
+
+        post.user_like(reactor)
+
+        self.assertEqual(post.user_like(reactor).likes_count, 2)
+
+    def test_creator_reaction_cannot_change(self) -> None:
+        course: Course = TestDataGenerator.create_course()
+        creator: User = TestDataGenerator.create_enrolled_user(course)
+        post: Post = _create_post(creator, _create_module(course))
+
+        reaction_state: PostReactionState = post.user_dislike(creator)
+
+        self.assertTrue(reaction_state.liked_by_user)
+        self.assertEqual(reaction_state.dislikes_count, 0)
+        self.assertIn(creator, post.liked_user_set.all())
+
+    def test_reaction_query_count_independent_of_likes(self) -> None:
+        course: Course = TestDataGenerator.create_course()
+        post: Post = _create_post(
+            TestDataGenerator.create_enrolled_user(course),
+            _create_module(course),
+        )
+        reactor: User = TestDataGenerator.create_enrolled_user(course)
+
+        with CaptureQueriesContext(connection) as few_likes_queries:
+            post.user_like(reactor)
+
+        post.liked_user_set.add(
+            *(TestDataGenerator.create_enrolled_user(course) for _ in range(5)),
+        )
+
+        with CaptureQueriesContext(connection) as many_likes_queries:
+            post.user_dislike(reactor)
+
+        self.assertEqual(len(few_likes_queries), len(many_likes_queries))
+
+    def test_annotated_reaction_state_matches_applied_state(self) -> None:
+        course: Course = TestDataGenerator.create_course()
+        post: Post = _create_post(
+            TestDataGenerator.create_enrolled_user(course),
+            _create_module(course),
+        )
+        reactor: User = TestDataGenerator.create_enrolled_user(course)
+
+        applied_state: PostReactionState = post.user_dislike(reactor)
+
+        annotated_post: Post = annotate_post_reaction_state(
+            Post.objects.filter(pk=post.pk),
+            reactor,
+        ).get()
+        self.assertEqual(annotated_post.reaction_state, applied_state)
+
+
+class ReactionBufferTests(TestCase):
+    def test_toggles_collapse_into_one_pending_reaction(self) -> None:
+        course: Course = TestDataGenerator.create_course()
+        post: Post = _create_post(
+            TestDataGenerator.create_enrolled_user(course),
+            _create_module(course),
+        )
+        reactor: User = TestDataGenerator.create_enrolled_user(course)
+        reaction_buffer: ReactionBuffer = ReactionBuffer()
+
+        reaction_buffer.record(post, reactor, Reaction.LIKE)
+        reaction_buffer.record(post, reactor, Reaction.DISLIKE)
+        reaction_state: PostReactionState = reaction_buffer.record(
+            post,
+            reactor,
+            Reaction.LIKE,
+        )
+
+        self.assertEqual(len(reaction_buffer), 1)
+        self.assertEqual(reaction_state.likes_count, 2)
+        self.assertTrue(reaction_state.liked_by_user)
+        self.assertNotIn(reactor, post.liked_user_set.all())
+
+        reaction_buffer.record(post, reactor, Reaction.CLEAR)
+
+        self.assertEqual(len(reaction_buffer), 0)
+
+    def test_overlay_includes_other_users_pending_reactions(self) -> None:
+        course: Course = TestDataGenerator.create_course()
+        post: Post = _create_post(
+            TestDataGenerator.create_enrolled_user(course),
+            _create_module(course),
+        )
+        reaction_buffer: ReactionBuffer = ReactionBuffer()
+
+        reaction_buffer.record(
+            post,
+            TestDataGenerator.create_enrolled_user(course),
+            Reaction.DISLIKE,
+        )
+        reaction_buffer.record(
+            post,
+            TestDataGenerator.create_enrolled_user(course),
+            Reaction.DISLIKE,
+        )
+        viewer: User = TestDataGenerator.create_enrolled_user(course)
+
+        reaction_state: PostReactionState = reaction_buffer.overlay(
+            post.pk,
+            viewer.pk,
+            annotate_post_reaction_state(Post.objects.filter(pk=post.pk), viewer)
+            .get()
+            .reaction_state,
+        )
+
+        self.assertEqual(reaction_state.dislikes_count, 2)
+        self.assertEqual(reaction_state.overall_likes_count, -1)
+        self.assertFalse(reaction_state.disliked_by_user)
+
+    def test_flush_writes_pending_reactions(self) -> None:
+        course: Course = TestDataGenerator.create_course()
+        creator: User = TestDataGenerator.create_enrolled_user(course)
+        post: Post = _create_post(creator, _create_module(course))
+        liker: User = TestDataGenerator.create_enrolled_user(course)
+        disliker: User = TestDataGenerator.create_enrolled_user(course)
+        reaction_buffer: ReactionBuffer = ReactionBuffer()
+
+        reaction_buffer.record(post, liker, Reaction.LIKE)
+        reaction_buffer.record(post, disliker, Reaction.DISLIKE)
+        reaction_buffer.record(post, creator, Reaction.CLEAR)
+
+        self.assertEqual(reaction_buffer.flush(), 2)
+        self.assertEqual(len(reaction_buffer), 0)
+        self.assertEqual(set(post.liked_user_set.all()), {creator, liker})
+        self.assertEqual(set(post.disliked_user_set.all()), {disliker})
+
+    def test_flush_discards_reactions_to_deleted_posts(self) -> None:
+        course: Course = TestDataGenerator.create_course()
+        module: Module = _create_module(course)
+        post: Post = _create_post(TestDataGenerator.create_enrolled_user(course), module)
+        deleted_post: Post = _create_post(
+            TestDataGenerator.create_enrolled_user(course),
+            module,
+        )
+        reactor: User = TestDataGenerator.create_enrolled_user(course)
+        reaction_buffer: ReactionBuffer = ReactionBuffer()
+
+        reaction_buffer.record(post, reactor, Reaction.LIKE)
+        reaction_buffer.record(deleted_post, reactor, Reaction.DISLIKE)
+        reaction_buffer.record(
+            post,
+            TestDataGenerator.create_enrolled_user(course),
+            Reaction.DISLIKE,
+        )
+        deleted_post.delete()
+
+        self.assertEqual(reaction_buffer.flush(), 2)
+        self.assertEqual(len(reaction_buffer), 0)
+        self.assertIn(reactor, post.liked_user_set.all())
+        self.assertEqual(post.disliked_user_set.count(), 1)
+
+    def test_flush_invalidates_etags_from_before_the_flush(self) -> None:
+        course: Course = TestDataGenerator.create_course()
+        post: Post = _create_post(
+            TestDataGenerator.create_enrolled_user(course),
+            _create_module(course),
+        )
+        reaction_buffer: ReactionBuffer = ReactionBuffer()
+
+        reaction_buffer.record(
+            post,
+            TestDataGenerator.create_enrolled_user(course),
+            Reaction.LIKE,
+        )
+        request: HttpRequest = RequestFactory().get(
+            "/",
+            headers={"If-None-Match": get_data_version((Post, User)).make_etag()},
+        )
+        self.assertIsNotNone(get_data_version((Post, User)).get_not_modified_response(request))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            reaction_buffer.flush()
+
+        self.assertIsNone(get_data_version((Post, User)).get_not_modified_response(request))
+
+    def test_flush_query_count_independent_of_pending_reactions(self) -> None:
+        course: Course = TestDataGenerator.create_course()
+        post: Post = _create_post(
+            TestDataGenerator.create_enrolled_user(course),
+            _create_module(course),
+        )
+        reaction_buffer: ReactionBuffer = ReactionBuffer()
+
+        reaction_buffer.record(
+            post,
+            TestDataGenerator.create_enrolled_user(course),
+            Reaction.LIKE,
+        )
+        reaction_buffer.record(
+            post,
+            TestDataGenerator.create_enrolled_user(course),
+            Reaction.DISLIKE,
+        )
+
+        with CaptureQueriesContext(connection) as few_pending_queries:
+            reaction_buffer.flush()
+
+        reactor: User
+        for reactor in (TestDataGenerator.create_enrolled_user(course) for _ in range(5)):
+            reaction_buffer.record(post, reactor, Reaction.LIKE)
+            reaction_buffer.record(
+                post,
+                TestDataGenerator.create_enrolled_user(course),
+                Reaction.DISLIKE,
+            )
+
+        with CaptureQueriesContext(connection) as many_pending_queries:
+            reaction_buffer.flush()
+
+        self.assertEqual(len(few_pending_queries), len(many_pending_queries))
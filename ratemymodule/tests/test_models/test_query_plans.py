@@ -0,0 +1,76 @@
+"""Test suite to ensure the hot query shapes are served by their indexes."""
+
+from collections.abc import Sequence
+
+__all__: Sequence[str] = ()
+
+import re
+import unittest
+
+from django.db import connection
+from django.db.models import QuerySet
+
+from ratemymodule.models import Module, OtherTag, Post, Report, ToolTag, TopicTag
+from ratemymodule.tests.utils import TestCase
+
+
+@unittest.skipUnless(connection.vendor == "sqlite", "Query plans are only checked on SQLite.")
+class HotQueryPlanTests(TestCase):
+    def assertSearchesIndex(self, queryset: QuerySet[object], index_name: str) -> None:  # noqa: N802
+        self.assertRegex(
+            queryset.explain(),
+            (
+                rf"\bSEARCH {re.escape(queryset.model._meta.db_table)} "
+                rf"USING (COVERING )?INDEX {re.escape(index_name)}\b"
+            ),
+        )
+
+    def assertScansIndex(self, queryset: QuerySet[object], index_name: str) -> None:  # noqa: N802
+        self.assertRegex(
+            queryset.explain(),
+            (
+                rf"\bSCAN {re.escape(queryset.model._meta.db_table)} "
+                rf"USING (COVERING )?INDEX {re.escape(index_name)}\b"
+            ),
+        )
+
+    def test_home_post_list_uses_index(self) -> None:
+        self.assertSearchesIndex(
+            Post.objects.filter(module_id=1, hidden=False).order_by("-date_time_created"),
+            "post_module_visible_new_idx",
+        )
+
+    def test_filtered_post_list_uses_index(self) -> None:
+        self.assertSearchesIndex(
+            Post.objects.filter(module_id=1, academic_year_start=2023, overall_rating=5),
+            "post_module_year_rating_idx",
+        )
+
+    def test_post_unsolved_reports_use_index(self) -> None:
+        self.assertSearchesIndex(
+            Report.objects.filter(post_id=1, is_solved=False),
+            "report_post_unsolved_idx",
+        )
+
+    def test_moderation_report_list_uses_index(self) -> None:
+        # NOTE: Every entry of the partial index is an unsolved report, so reading the whole index in order is the narrowest plan (there is no key to search on)
+        self.assertScansIndex(
+            Report.objects.filter(is_solved=False).order_by("-date_time_created"),
+            "report_unsolved_new_idx",
+        )
+
+    def test_tag_autocomplete_uses_index(self) -> None:
+        tag_model: type[ToolTag | TopicTag | OtherTag]
+        for tag_model in (ToolTag, TopicTag, OtherTag):
+            with self.subTest(tag_model=tag_model):
+                # NOTE: A substring can match anywhere within a name, so it cannot be searched for in a B-tree index; only the (smaller) partial index of verified tags is scanned, rather than the whole table
+                self.assertScansIndex(
+                    tag_model.objects.filter(
+                        name__icontains="python",
+                        is_verified=True,
+                    ).values("id", "name"),
+                    f"{tag_model._meta.model_name}_verified_name_idx",
+                )
+
+    def test_module_code_lookup_uses_index(self) -> None:
+        self.assertSearchesIndex(Module.objects.filter(code="CS101"), "module_code_idx")
@@ -6,7 +6,8 @@ __all__: Sequence[str] = ()
 
 import re
 
-from django.db import IntegrityError, transaction
+from django.db import IntegrityError, connection, transaction
+from django.test.utils import CaptureQueriesContext
 
 from ratemymodule.models import Course, Module, University, User
 from ratemymodule.tests.utils import TestCase, TestDataGenerator
@@ -1015,3 +1016,80 @@ class CourseAddedToModuleSignalTests(TestCase):
             module.course_set.add(course2)
 
         self.assertNotIn(course2, module.course_set.all())
+
+
+class BulkChangeSignalQueryCountTests(TestCase):
+    @staticmethod
+    def _create_courses_at_same_university() -> tuple[Course, Course]:
+        course1: Course = TestDataGenerator.create_course()
+        course2: Course = Course.objects.create(
+            name=TestDataGenerator.create_course_name(),
+            student_type=TestDataGenerator.create_course_student_type(),
+            university=course1.university,
+        )
+        return course1, course2
+
+    @staticmethod
+    def _create_users(course1: Course, course2: Course, count: int) -> list[User]:
+        users: list[User] = []
+
+        _: int
+        for _ in range(count):
+            user: User = User.objects.create_user(
+                email=(
+                    f"{TestDataGenerator.create_user_email().rpartition("@")[0]}@"
+                    f"{course1.university.email_domain}"
+                ),
+            )
+            user.enrolled_course_set.add(course1, course2)
+            users.append(user)
+
+        return users
+
+    def test_users_removed_from_course_query_count_independent_of_users(self) -> None:
+        course1: Course
+        course2: Course
+        course1, course2 = self._create_courses_at_same_university()
+        few_users: list[User] = self._create_users(course1, course2, 1)
+        many_users: list[User] = self._create_users(course1, course2, 5)
+
+        with CaptureQueriesContext(connection) as few_users_queries:
+            course1.enrolled_user_set.remove(*few_users)
+
+        with CaptureQueriesContext(connection) as many_users_queries:
+            course1.enrolled_user_set.remove(*many_users)
+
+        self.assertEqual(len(few_users_queries), len(many_users_queries))
+
+    def test_users_added_to_course_query_count_independent_of_users(self) -> None:
+        course1: Course
+        course2: Course
+        course1, course2 = self._create_courses_at_same_university()
+        few_users: list[User] = self._create_users(course1, course1, 1)
+        many_users: list[User] = self._create_users(course1, course1, 5)
+
+        with CaptureQueriesContext(connection) as few_users_queries:
+            course2.enrolled_user_set.add(*few_users)
+
+        with CaptureQueriesContext(connection) as many_users_queries:
+            course2.enrolled_user_set.add(*many_users)
+
+        self.assertEqual(len(few_users_queries), len(many_users_queries))
+
+    def test_modules_removed_from_course_query_count_independent_of_modules(self) -> None:
+        course1: Course
+        course2: Course
+        course1, course2 = self._create_courses_at_same_university()
+
+        modules: list[Module] = [TestDataGenerator.create_module() for _ in range(6)]
+        module: Module
+        for module in modules:
+            module.course_set.add(course1, course2)
+
+        with CaptureQueriesContext(connection) as few_modules_queries:
+            course1.module_set.remove(*modules[:1])
+
+        with CaptureQueriesContext(connection) as many_modules_queries:
+            course1.module_set.remove(*modules[1:])
+
+        self.assertEqual(len(few_modules_queries), len(many_modules_queries))
@@ -16,6 +16,7 @@ from types import TracebackType
 from typing import IO, Final, Protocol, Self, override
 
 from django.conf import settings
+from django.core.cache import caches
 from django.core.exceptions import ImproperlyConfigured, ValidationError
 from django.db import IntegrityError, transaction
 from django.test import TestCase as DjangoTestCase
@@ -24,6 +25,13 @@ from django.utils import timezone
 from ratemymodule.exceptions import NotEnoughTestDataError
 from ratemymodule.models import Course, Module, University, User
 from ratemymodule.models.managers import UserManager
+from ratemymodule.utils.benchmarks import (
+    BenchmarkData,
+    BenchmarkEndpoint,
+    BenchmarkResult,
+    run_endpoint_benchmark,
+    seed_benchmark_data,
+)
 
 
 class _SubTestCallable(Protocol):
@@ -206,6 +214,34 @@ class TestDataGenerator:
 
         return created_user
 
+    @classmethod
+    def create_enrolled_user(cls, course: Course) -> User:
+        """Create a user with an email address at the course's university, enrolled on it."""
+        if not hasattr(cls, "_test_data_iterators"):
+            NO_TEST_DATA_ERROR_MESSAGE: Final[str] = (
+                "Cannot create a User because the test data has not been loaded. "
+                "Call the \"set_up()\" class-method to load the test data."
+            )
+            raise RuntimeError(NO_TEST_DATA_ERROR_MESSAGE)
+
+        previous_test_data_iterators: _TestDataWrapper = cls._test_data_iterators.copy()
+
+        try:
+            created_user: User = User.objects.create_user(
+                email=(
+                    f"{cls.create_user_email().rpartition("@")[0]}@"
+                    f"{course.university.email_domain}"
+                ),
+            )
+
+        except (ValidationError, IntegrityError):
+            cls._test_data_iterators = previous_test_data_iterators
+            raise
+
+        created_user.enrolled_course_set.add(course)
+
+        return created_user
+
     @classmethod
     def create_university_name(cls) -> str:
         """Create a university name for automated tests."""
@@ -520,6 +556,11 @@ class TestCase(DjangoTestCase):
     def setUp(self) -> None:
         TestDataGenerator.set_up()
 
+        # NOTE: Data versions & cached responses would otherwise outlive each test's rolled-back database changes
+        cache_alias: str
+        for cache_alias in settings.CACHES:
+            caches[cache_alias].clear()
+
     @staticmethod
     def _sub_test_wrapper(func: _SubTestWrapperFuncCallable) -> _SubTestCallable:
         class _SubTestContextManager(GeneratorContextManager[None]):
@@ -543,3 +584,24 @@ class TestCase(DjangoTestCase):
     subTest: _SubTestCallable = _sub_test_wrapper(  # noqa: N815
         DjangoTestCase.subTest.__wrapped__,  # type: ignore[attr-defined]
     )
+
+    def assertEndpointsWithinQueryBudgets(self, endpoints: Iterable[BenchmarkEndpoint], sizes: Iterable[int] = (1, 2)) -> None:  # noqa: E501, N802
+        """Assert that none of the given endpoints exceed their query budgets at any size."""
+        size: int
+        for size in sizes:
+            with self.subTest(size=size):
+                data: BenchmarkData = seed_benchmark_data(size)
+
+                endpoint: BenchmarkEndpoint
+                for endpoint in endpoints:
+                    with self.subTest(endpoint=endpoint.name):
+                        result: BenchmarkResult = run_endpoint_benchmark(
+                            endpoint,
+                            data,
+                            iterations=1,
+                        )
+                        self.assertLessEqual(
+                            result.max_query_count,
+                            result.query_budget,
+                            f"Query budget exceeded at size {size}: {result}",
+                        )
@@ -0,0 +1,386 @@
+"""
+End-to-end request benchmarks, with declared SQL query budgets for every endpoint.
+
+Each endpoint is requested through Django's test client against seeded synthetic data,
+recording the latency, number of SQL queries & response size of every request.
+An endpoint's query budget is the maximum number of queries a single request may make,
+regardless of the size of the seeded data, so any N+1 query regressions exceed the budget.
+"""
+
+from collections.abc import Sequence
+
+__all__: Sequence[str] = (
+    "BenchmarkData",
+    "BenchmarkEndpoint",
+    "BenchmarkResult",
+    "WEB_BENCHMARK_ENDPOINTS",
+    "HTMX_BENCHMARK_ENDPOINTS",
+    "REST_BENCHMARK_ENDPOINTS",
+    "BENCHMARK_ENDPOINTS",
+    "seed_benchmark_data",
+    "run_endpoint_benchmark",
+)
+
+import statistics
+import time
+from collections.abc import Callable, Mapping
+from typing import TYPE_CHECKING, Final, Literal, NamedTuple
+from urllib.parse import urlencode
+
+from django.db import connection
+from django.test import Client
+from django.urls import reverse
+
+from ratemymodule.models import (
+    Module,
+    OtherTag,
+    Post,
+    ToolTag,
+    TopicTag,
+    University,
+    User,
+)
+from ratemymodule.models.data_versions import bump_data_versions
+from ratemymodule.utils.populate_data import populate_load_test_database
+
+if TYPE_CHECKING:
+    from django.contrib.sessions.backends.base import SessionBase
+    from django.http import HttpResponse
+
+TAGS_PER_TYPE: Final[int] = 10
+
+
+class BenchmarkData(NamedTuple):
+    """The seeded objects that benchmarked endpoints are requested about."""
+
+    university: University
+    module: Module
+    post: Post
+    student: User
+    staff_user: User
+
+
+class BenchmarkEndpoint(NamedTuple):
+    """
+    A single endpoint to benchmark, with the maximum number of queries it may make.
+
+    Budgets are fixed, so they must hold no matter how much data has been seeded.
+    """
+
+    name: str
+    get_url: Callable[[BenchmarkData], str]
+    query_budget: int
+    method: Literal["get", "post"] = "get"
+    client_user: Literal["anonymous", "student", "staff"] = "student"
+    expected_status_code: int = 200
+
+
+class BenchmarkResult(NamedTuple):
+    """The recorded measurements of every request made to a single benchmarked endpoint."""
+
+    endpoint: BenchmarkEndpoint
+    query_budget: int
+    latencies: Sequence[float]
+    query_counts: Sequence[int]
+    response_sizes: Sequence[int]
+
+    def get_latency_percentile(self, percentile: int) -> float:
+        """Return the given percentile (1-99) of the recorded latencies, in seconds."""
+        if len(self.latencies) < 2:
+            return self.latencies[0]
+
+        return statistics.quantiles(self.latencies, n=100, method="inclusive")[percentile - 1]
+
+    @property
+    def max_query_count(self) -> int:
+        """The largest number of SQL queries made by any single request."""
+        return max(self.query_counts)
+
+    @property
+    def exceeds_query_budget(self) -> bool:
+        """Whether any request made more SQL queries than the endpoint's budget."""
+        return self.max_query_count > self.query_budget
+
+    def __str__(self) -> str:
+        """Summarise the measurements in a single line of text."""
+        return (
+            f"{self.endpoint.name}: "
+            f"p50={self.get_latency_percentile(50) * 1000:.1f}ms "
+            f"p90={self.get_latency_percentile(90) * 1000:.1f}ms "
+            f"p99={self.get_latency_percentile(99) * 1000:.1f}ms "
+            f"queries={self.max_query_count}/{self.query_budget} "
+            f"size={max(self.response_sizes)}B"
+        )
+
+
+def seed_benchmark_data(size: int) -> BenchmarkData:
+    """
+    Populate the database with synthetic data, for endpoints to be benchmarked against.
+
+    The given size is the number of posts made about each module, per month of one year.
+    """
+    populate_load_test_database(
+        universities=1,
+        courses_per_university=1,
+        modules_per_course=2,
+        years_back=1,
+        reviews_per_month=size,
+        reactions_per_post=3,
+    )
+
+    university: University = University.objects.filter(
+        email_domain__endswith=".loadtest.ac.uk",
+    ).latest("pk")
+    module: Module = university.module_set.order_by("pk")[0]
+    post: Post = module.post_set.select_related("user").order_by("pk")[0]
+
+    tag_model: type[ToolTag | TopicTag | OtherTag]
+    for tag_model in (ToolTag, TopicTag, OtherTag):
+        tags: Sequence[ToolTag | TopicTag | OtherTag] = tag_model.objects.bulk_create(
+            tag_model(
+                name=f"Benchmark {university.short_name} {tag_model.__name__} {letter}",
+                is_verified=True,
+            )
+            for letter in "ABCDEFGHIJKLMNOPQRSTUVWXYZ"[:TAGS_PER_TYPE]
+        )
+        tag_through_model: type[object] = tag_model.post_set.through
+        tag_through_model.objects.bulk_create(  # type: ignore[attr-defined]
+            tag_through_model(  # type: ignore[call-arg]
+                **{
+                    f"{tag_model.__name__.lower()}_id": tags[post_number % len(tags)].pk,
+                    "post_id": post_pk,
+                },
+            )
+            for post_number, post_pk in enumerate(
+                module.post_set.values_list("pk", flat=True),
+            )
+        )
+
+    bump_data_versions(ToolTag, TopicTag, OtherTag)
+
+    # NOTE: The creator of a post can never change their reaction to it, so the benchmarked student must be someone else enrolled on the module
+    student: User = (
+        module.post_set.exclude(user=post.user).select_related("user").order_by("pk")[0].user
+    )
+
+    return BenchmarkData(
+        university=university,
+        module=module,
+        post=post,
+        student=student,
+        staff_user=User.objects.create_superuser(
+            email=f"benchmark-staff@{university.email_domain}",
+        ),
+    )
+
+
+class _QueryCounter:
+    """Database execute wrapper that counts every executed query, without storing them."""
+
+    def __init__(self) -> None:
+        self.count: int = 0
+
+    def __call__(self, execute: Callable[..., object], sql: str, params: object, many: bool, context: Mapping[str, object]) -> object:  # noqa: E501, FBT001
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def _prepare_client(endpoint: BenchmarkEndpoint, data: BenchmarkData) -> Client:
+    client: Client = Client()
+
+    if endpoint.client_user == "student":
+        client.force_login(data.student)
+    elif endpoint.client_user == "staff":
+        client.force_login(data.staff_user)
+
+    session: SessionBase = client.session
+    session["selected_university_pk"] = data.university.pk
+    session["selected_module_pk"] = data.module.pk
+    session.save()
+
+    return client
+
+
+def run_endpoint_benchmark(endpoint: BenchmarkEndpoint, data: BenchmarkData, iterations: int) -> BenchmarkResult:  # noqa: E501
+    """Request the given endpoint repeatedly, recording the measurements of every request."""
+    client: Client = _prepare_client(endpoint, data)
+    url: str = endpoint.get_url(data)
+
+    latencies: list[float] = []
+    query_counts: list[int] = []
+    response_sizes: list[int] = []
+
+    _: int
+    for _ in range(iterations):
+        query_counter: _QueryCounter = _QueryCounter()
+        with connection.execute_wrapper(query_counter):
+            start_time: float = time.perf_counter()
+            response: HttpResponse = getattr(client, endpoint.method)(url)
+            latencies.append(time.perf_counter() - start_time)
+
+        if response.status_code != endpoint.expected_status_code:
+            UNEXPECTED_STATUS_CODE_MESSAGE: Final[str] = (
+                f"Benchmarked endpoint {endpoint.name!r} responded with "
+                f"status code {response.status_code}, "
+                f"not {endpoint.expected_status_code}."
+            )
+            raise AssertionError(UNEXPECTED_STATUS_CODE_MESSAGE)
+
+        query_counts.append(query_counter.count)
+        response_sizes.append(len(response.content))
+
+    return BenchmarkResult(
+        endpoint=endpoint,
+        query_budget=endpoint.query_budget,
+        latencies=latencies,
+        query_counts=query_counts,
+        response_sizes=response_sizes,
+    )
+
+
+def _get_home_url(get_params: Callable[[BenchmarkData], Mapping[str, str]] | None = None) -> Callable[[BenchmarkData], str]:  # noqa: E501
+    def get_url(data: BenchmarkData) -> str:
+        home_url: str = reverse("ratemymodule:home")
+        return f"{home_url}?{urlencode(get_params(data))}" if get_params else home_url
+
+    return get_url
+
+
+def _get_post_url(url_name: str) -> Callable[[BenchmarkData], str]:
+    def get_url(data: BenchmarkData) -> str:
+        return reverse(url_name, kwargs={"pk": data.post.pk})
+
+    return get_url
+
+
+def _get_static_url(url_name: str, get_params: Mapping[str, str] | None = None) -> Callable[[BenchmarkData], str]:  # noqa: E501
+    def get_url(_data: BenchmarkData) -> str:
+        url: str = reverse(url_name)
+        return f"{url}?{urlencode(get_params)}" if get_params else url
+
+    return get_url
+
+
+WEB_BENCHMARK_ENDPOINTS: Final[Sequence[BenchmarkEndpoint]] = (
+    BenchmarkEndpoint(
+        name="home",
+        get_url=_get_home_url(),
+        query_budget=36,
+    ),
+    BenchmarkEndpoint(
+        name="home_anonymous",
+        get_url=_get_home_url(),
+        query_budget=33,
+        client_user="anonymous",
+    ),
+    BenchmarkEndpoint(
+        name="home_filtered",
+        get_url=_get_home_url(
+            lambda data: {
+                "q": "",
+                "rating": str(data.post.overall_rating),
+                "year": str(data.post.academic_year_start),
+                "tags": ToolTag.objects.filter(post_set=data.post).values_list(
+                    "name",
+                    flat=True,
+                )[0],
+            },
+        ),
+        query_budget=36,
+    ),
+    BenchmarkEndpoint(
+        name="home_generate_graph",
+        get_url=_get_home_url(
+            lambda data: {
+                "action": "generate_graph",
+                "aa_overall_rating": "on",
+                "aa_difficulty_rating": "on",
+                "aa_teaching_quality": "on",
+                "aa_assessment_quality": "on",
+                "aa_start_year": str(data.module.year_started.year),
+                "aa_end_year": str(data.post.academic_year_start + 1),
+            },
+        ),
+        query_budget=39,
+    ),
+    *(
+        BenchmarkEndpoint(
+            name=url_name.partition(":")[2],
+            get_url=_get_static_url(url_name, {"term": "benchmark"}),
+            query_budget=1,
+            client_user="anonymous",
+        )
+        for url_name in (
+            "ratemymodule:autocomplete_tool_tags",
+            "ratemymodule:autocomplete_topic_tags",
+            "ratemymodule:autocomplete_other_tags",
+        )
+    ),
+)
+HTMX_BENCHMARK_ENDPOINTS: Final[Sequence[BenchmarkEndpoint]] = tuple(
+    BenchmarkEndpoint(
+        name=url_name.partition(":")[2],
+        get_url=_get_post_url(url_name),
+        query_budget=9,
+        method="post",
+    )
+    for url_name in (
+        "api_htmx:like_post",
+        "api_htmx:dislike_post",
+        "api_htmx:unlike_post",
+    )
+)
+REST_BENCHMARK_ENDPOINTS: Final[Sequence[BenchmarkEndpoint]] = (
+    *(
+        BenchmarkEndpoint(
+            name=f"api_rest_{basename}_list",
+            get_url=_get_static_url(f"api_rest:{basename}-list"),
+            query_budget=query_budget,
+            client_user="staff",
+        )
+        for basename, query_budget in (
+            ("user", 9),
+            ("university", 5),
+            ("course", 5),
+            ("module", 11),
+            ("tooltag", 3),
+            ("topictag", 3),
+            ("othertag", 3),
+            ("post", 9),
+            ("report", 3),
+        )
+    ),
+    BenchmarkEndpoint(
+        name="api_rest_post_list_filtered",
+        get_url=lambda data: f"{reverse("api_rest:post-list")}?{urlencode(
+            {
+                "module": data.module.pk,
+                "overall_rating": data.post.overall_rating,
+                "academic_year_start": data.post.academic_year_start,
+                "tags": ToolTag.objects.filter(post_set=data.post).values_list(
+                    "name",
+                    flat=True,
+                )[0],
+            },
+        )}",
+        query_budget=10,
+        client_user="staff",
+    ),
+    BenchmarkEndpoint(
+        name="api_rest_module_stats",
+        get_url=lambda data: reverse("api_rest:module-stats", kwargs={"pk": data.module.pk}),
+        query_budget=5,
+        client_user="staff",
+    ),
+    BenchmarkEndpoint(
+        name="api_rest_post_detail",
+        get_url=_get_post_url("api_rest:post-detail"),
+        query_budget=9,
+        client_user="staff",
+    ),
+)
+BENCHMARK_ENDPOINTS: Final[Sequence[BenchmarkEndpoint]] = (
+    *WEB_BENCHMARK_ENDPOINTS,
+    *HTMX_BENCHMARK_ENDPOINTS,
+    *REST_BENCHMARK_ENDPOINTS,
+)
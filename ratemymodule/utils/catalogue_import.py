@@ -0,0 +1,584 @@
+"""
+Streaming bulk import of universities, courses, modules & posts.
+
+Rows are read one at a time from CSV or JSON Lines files, then imported in batches.
+Each batch is validated without any per-row queries, has its foreign keys resolved
+with one query per referenced model & is written with `bulk_create()`/`bulk_update()`
+inside its own transaction, so memory use only depends on the batch size.
+
+Every row must have a `type` column, which is one of `university`, `course`, `module`
+or `post`. The other columns depend on the row's type:
+    * `university`: `name`, `short_name`, `email_domain`, `founding_date` (YYYY-MM-DD)
+    * `course`: `university` (email domain), `name`, `student_type`
+    * `module`: `university` (email domain), `code`, `name`, `year_started` (YYYY-MM-DD),
+      `courses` (course names, separated by ";" in CSV files)
+    * `post`: `university` (email domain), `module` (code), `user` (email address),
+      `overall_rating`, `difficulty_rating`, `assessment_rating`, `teaching_rating`,
+      `content`, `academic_year_start`
+"""
+
+from collections.abc import Sequence
+
+__all__: Sequence[str] = (
+    "CatalogueRowError",
+    "CatalogueImportResult",
+    "CatalogueImporter",
+    "CATALOGUE_FILE_FORMATS",
+)
+
+import csv
+import datetime
+import itertools
+import json
+from collections import Counter, defaultdict
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from typing import IO, Final, NamedTuple
+
+from django.core.exceptions import ValidationError
+from django.db import DatabaseError, transaction
+
+from ratemymodule.models import Course, Module, Post, University, User
+from ratemymodule.models.data_versions import bump_data_versions
+from ratemymodule.models.integrity import is_enforced_by_database
+
+CATALOGUE_FILE_FORMATS: Final[Sequence[str]] = ("csv", "jsonl")
+ROW_TYPES: Final[Sequence[str]] = ("university", "course", "module", "post")
+POST_FIELD_NAMES: Final[Sequence[str]] = (
+    "overall_rating",
+    "difficulty_rating",
+    "assessment_rating",
+    "teaching_rating",
+    "content",
+    "academic_year_start",
+)
+
+_Row = Mapping[str, object]
+_NumberedRow = tuple[int, _Row]
+
+
+class CatalogueRowError(NamedTuple):
+    """A single row that could not be imported, along with the reason why."""
+
+    row_number: int
+    message: str
+
+
+class CatalogueImportResult:
+    """Running totals of the rows imported so far."""
+
+    def __init__(self) -> None:
+        """Create a new empty set of import totals."""
+        self.rows_count: int = 0
+        self.created_counts: Counter[str] = Counter()
+        self.updated_counts: Counter[str] = Counter()
+        self.errors_count: int = 0
+
+    def __str__(self) -> str:
+        """Summarise the import totals in a single line of text."""
+        return (
+            f"{self.rows_count} rows processed: "
+            f"{sum(self.created_counts.values())} created, "
+            f"{sum(self.updated_counts.values())} updated, "
+            f"{self.errors_count} errors"
+        )
+
+
+def _get_str(row: _Row, column: str, *, required: bool = True) -> str:
+    value: object = row.get(column)
+    if value is None or (isinstance(value, str) and not value.strip()):
+        if required:
+            MISSING_COLUMN_MESSAGE: Final[str] = f"Missing value for column {column!r}."
+            raise ValueError(MISSING_COLUMN_MESSAGE)
+
+        return ""
+
+    return str(value).strip()
+
+
+def _get_optional_int(row: _Row, column: str) -> int | None:
+    raw_value: str = _get_str(row, column, required=False)
+    return int(raw_value) if raw_value else None
+
+
+def _get_str_list(row: _Row, column: str) -> list[str]:
+    value: object = row.get(column)
+    if isinstance(value, list):
+        return [str(item).strip() for item in value if str(item).strip()]
+
+    return [item.strip() for item in _get_str(row, column).split(";") if item.strip()]
+
+
+def _format_validation_error(validation_error: ValidationError) -> str:
+    if hasattr(validation_error, "error_dict"):
+        return "; ".join(
+            f"{field_name}: {" ".join(messages)}"
+            for field_name, messages in validation_error.message_dict.items()
+        )
+
+    return " ".join(validation_error.messages)
+
+
+class CatalogueImporter:
+    """Importer of catalogue rows, that writes them to the database in batches."""
+
+    def __init__(self, batch_size: int = 500, on_progress: Callable[[CatalogueImportResult], None] | None = None, on_row_error: Callable[[CatalogueRowError], None] | None = None) -> None:  # noqa: E501
+        """
+        Create a new importer, with the given number of rows written in each transaction.
+
+        `on_progress` is called after each batch has been written,
+        and `on_row_error` is called for every row that cannot be imported.
+        """
+        if batch_size < 1:
+            INVALID_BATCH_SIZE_MESSAGE: Final[str] = "batch_size must be a positive integer."
+            raise ValueError(INVALID_BATCH_SIZE_MESSAGE)
+
+        self.batch_size: int = batch_size
+        self.on_progress: Callable[[CatalogueImportResult], None] | None = on_progress
+        self.on_row_error: Callable[[CatalogueRowError], None] | None = on_row_error
+        self.result: CatalogueImportResult = CatalogueImportResult()
+
+    def _report_error(self, row_number: int, message: str) -> None:
+        self.result.errors_count += 1
+
+        if self.on_row_error is not None:
+            self.on_row_error(CatalogueRowError(row_number=row_number, message=message))
+
+    def _read_rows(self, file: IO[str], file_format: str) -> Iterator[_NumberedRow]:
+        if file_format == "csv":
+            row_number: int
+            csv_row: dict[str, str]
+            for row_number, csv_row in enumerate(csv.DictReader(file), start=2):
+                yield row_number, csv_row
+
+            return
+
+        if file_format != "jsonl":
+            INVALID_FILE_FORMAT_MESSAGE: Final[str] = (
+                f"file_format must be one of {", ".join(CATALOGUE_FILE_FORMATS)}."
+            )
+            raise ValueError(INVALID_FILE_FORMAT_MESSAGE)
+
+        line: str
+        for row_number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+
+            try:
+                json_row: object = json.loads(line)
+            except json.JSONDecodeError as json_decode_error:
+                self._report_error(row_number, f"Invalid JSON: {json_decode_error.msg}.")
+                continue
+
+            if not isinstance(json_row, dict):
+                self._report_error(row_number, "Each line must be a JSON object.")
+                continue
+
+            yield row_number, json_row
+
+    def import_file(self, file: IO[str], file_format: str) -> CatalogueImportResult:
+        """Import every row within the given CSV or JSON Lines file."""
+        batch: tuple[_NumberedRow, ...]
+        for batch in itertools.batched(self._read_rows(file, file_format), self.batch_size):
+            self.import_batch(batch)
+
+        return self.result
+
+    def import_batch(self, batch: Sequence[_NumberedRow]) -> None:
+        """
+        Import a single batch of rows, within one transaction.
+
+        Rows are imported in dependency order (universities, then courses, then modules,
+        then posts), so rows can refer to other rows earlier within the same batch.
+        If the database rejects the batch, every row within it is reported as an error.
+        """
+        rows_by_type: defaultdict[str, list[_NumberedRow]] = defaultdict(list)
+
+        row_number: int
+        row: _Row
+        for row_number, row in batch:
+            row_type: str = str(row.get("type", "")).strip().lower()
+            if row_type not in ROW_TYPES:
+                self._report_error(
+                    row_number,
+                    f"Column 'type' must be one of {", ".join(ROW_TYPES)}.",
+                )
+                continue
+
+            rows_by_type[row_type].append((row_number, row))
+
+        previous_created_counts: Counter[str] = self.result.created_counts.copy()
+        previous_updated_counts: Counter[str] = self.result.updated_counts.copy()
+
+        try:
+            with transaction.atomic():
+                self._import_universities(rows_by_type["university"])
+                self._import_courses(rows_by_type["course"])
+                self._import_modules(rows_by_type["module"])
+                self._import_posts(rows_by_type["post"])
+
+                # NOTE: Bulk writes send no signals, so the changed models' data versions are bumped here (once the batch is committed)
+                bump_data_versions(University, Course, Module, Post, User)
+
+        except DatabaseError as database_error:
+            self.result.created_counts = previous_created_counts
+            self.result.updated_counts = previous_updated_counts
+
+            for row_number, _ in itertools.chain.from_iterable(rows_by_type.values()):
+                self._report_error(row_number, f"Batch rejected by database: {database_error}")
+
+        self.result.rows_count += len(batch)
+
+        if self.on_progress is not None:
+            self.on_progress(self.result)
+
+    def _validate(self, row_number: int, instance: University | Course | Module | Post, *, exclude: Iterable[str] = ()) -> bool:  # noqa: E501
+        try:
+            instance.clean_fields(exclude=set(exclude))
+        except ValidationError as validation_error:
+            self._report_error(row_number, _format_validation_error(validation_error))
+            return False
+
+        return True
+
+    def _import_universities(self, rows: Sequence[_NumberedRow]) -> None:
+        if not rows:
+            return
+
+        existing_universities: dict[str, University] = University.objects.in_bulk(
+            {_get_str(row, "email_domain", required=False).lower() for _, row in rows},
+            field_name="email_domain",
+        )
+        created_universities: dict[str, University] = {}
+        updated_universities: dict[str, University] = {}
+
+        row_number: int
+        row: _Row
+        for row_number, row in rows:
+            try:
+                email_domain: str = _get_str(row, "email_domain").lower()
+                university_values: Mapping[str, object] = {
+                    "name": _get_str(row, "name"),
+                    "short_name": _get_str(row, "short_name"),
+                    "founding_date": datetime.date.fromisoformat(
+                        _get_str(row, "founding_date"),
+                    ),
+                }
+            except ValueError as value_error:
+                self._report_error(row_number, str(value_error))
+                continue
+
+            university: University | None = (
+                created_universities.get(email_domain)
+                or existing_universities.get(email_domain)
+            )
+            if university is None:
+                university = University(email_domain=email_domain, **university_values)
+            else:
+                field_name: str
+                field_value: object
+                for field_name, field_value in university_values.items():
+                    setattr(university, field_name, field_value)
+
+            if not self._validate(row_number, university):
+                continue
+
+            if university.pk is None:
+                created_universities[email_domain] = university
+            else:
+                updated_universities[email_domain] = university
+
+        University.objects.bulk_create(created_universities.values())
+        University.objects.bulk_update(
+            updated_universities.values(),
+            ("name", "short_name", "founding_date"),
+        )
+        self.result.created_counts["university"] += len(created_universities)
+        self.result.updated_counts["university"] += len(updated_universities)
+
+    def _get_university_pks(self, rows: Sequence[_NumberedRow]) -> Mapping[str, int]:
+        return dict(
+            University.objects.filter(
+                email_domain__in={
+                    _get_str(row, "university", required=False).lower() for _, row in rows
+                },
+            ).values_list("email_domain", "pk"),
+        )
+
+    def _import_courses(self, rows: Sequence[_NumberedRow]) -> None:
+        if not rows:
+            return
+
+        university_pks: Mapping[str, int] = self._get_university_pks(rows)
+        existing_courses: dict[tuple[int, str], Course] = {
+            (course.university_id, course.name): course
+            for course in Course.objects.filter(
+                university_id__in=university_pks.values(),
+                name__in={_get_str(row, "name", required=False) for _, row in rows},
+            )
+        }
+        created_courses: dict[tuple[int, str], Course] = {}
+        updated_courses: dict[tuple[int, str], Course] = {}
+
+        row_number: int
+        row: _Row
+        for row_number, row in rows:
+            try:
+                university_email_domain: str = _get_str(row, "university").lower()
+                name: str = _get_str(row, "name")
+                student_type: str = _get_str(row, "student_type")
+            except ValueError as value_error:
+                self._report_error(row_number, str(value_error))
+                continue
+
+            university_pk: int | None = university_pks.get(university_email_domain)
+            if university_pk is None:
+                self._report_error(
+                    row_number,
+                    f"No university with email domain {university_email_domain!r}.",
+                )
+                continue
+
+            course_key: tuple[int, str] = (university_pk, name)
+            course: Course | None = (
+                created_courses.get(course_key) or existing_courses.get(course_key)
+            )
+            if course is None:
+                course = Course(university_id=university_pk, name=name)
+            course.student_type = student_type
+
+            if not self._validate(row_number, course, exclude=("university",)):
+                continue
+
+            if course.pk is None:
+                created_courses[course_key] = course
+            else:
+                updated_courses[course_key] = course
+
+        Course.objects.bulk_create(created_courses.values())
+        Course.objects.bulk_update(updated_courses.values(), ("student_type",))
+        self.result.created_counts["course"] += len(created_courses)
+        self.result.updated_counts["course"] += len(updated_courses)
+
+    @staticmethod
+    def _get_module_pks(university_pks: Iterable[int], codes: Iterable[str]) -> Mapping[tuple[int, str], int]:  # noqa: E501
+        return {
+            (university_pk, code): module_pk
+            for module_pk, code, university_pk in Module.objects.filter(
+                code__in=set(codes),
+                course_set__university_id__in=set(university_pks),
+            ).values_list("pk", "code", "course_set__university_id").distinct()
+        }
+
+    def _import_modules(self, rows: Sequence[_NumberedRow]) -> None:
+        if not rows:
+            return
+
+        university_pks: Mapping[str, int] = self._get_university_pks(rows)
+        course_pks: Mapping[tuple[int, str], int] = {
+            (university_pk, name): course_pk
+            for course_pk, name, university_pk in Course.objects.filter(
+                university_id__in=university_pks.values(),
+            ).filter(
+                name__in={
+                    course_name
+                    for _, row in rows
+                    for course_name in _get_str_list(row, "courses")
+                },
+            ).values_list("pk", "name", "university_id")
+        }
+        existing_module_pks: Mapping[tuple[int, str], int] = self._get_module_pks(
+            university_pks.values(),
+            (_get_str(row, "code", required=False) for _, row in rows),
+        )
+        existing_modules: Mapping[int, Module] = Module.objects.in_bulk(
+            existing_module_pks.values(),
+        )
+        created_modules: dict[tuple[int, str], Module] = {}
+        updated_modules: dict[tuple[int, str], Module] = {}
+        module_course_pks: defaultdict[tuple[int, str], set[int]] = defaultdict(set)
+
+        row_number: int
+        row: _Row
+        for row_number, row in rows:
+            try:
+                university_email_domain: str = _get_str(row, "university").lower()
+                code: str = _get_str(row, "code")
+                name: str = _get_str(row, "name")
+                year_started: datetime.date = datetime.date.fromisoformat(
+                    _get_str(row, "year_started"),
+                )
+                course_names: list[str] = _get_str_list(row, "courses")
+            except ValueError as value_error:
+                self._report_error(row_number, str(value_error))
+                continue
+
+            university_pk: int | None = university_pks.get(university_email_domain)
+            if university_pk is None:
+                self._report_error(
+                    row_number,
+                    f"No university with email domain {university_email_domain!r}.",
+                )
+                continue
+
+            missing_course_names: list[str] = [
+                course_name
+                for course_name in course_names
+                if (university_pk, course_name) not in course_pks
+            ]
+            if missing_course_names or not course_names:
+                self._report_error(
+                    row_number,
+                    (
+                        f"No courses named {", ".join(map(repr, missing_course_names))} "
+                        f"at university {university_email_domain!r}."
+                        if missing_course_names
+                        else "Modules must be attached to at least one course."
+                    ),
+                )
+                continue
+
+            module_key: tuple[int, str] = (university_pk, code)
+            existing_module_pk: int | None = existing_module_pks.get(module_key)
+            module: Module | None = created_modules.get(module_key) or (
+                existing_modules.get(existing_module_pk)
+                if existing_module_pk is not None
+                else None
+            )
+            if module is None:
+                module = Module(code=code)
+            module.name = name
+            module.year_started = year_started
+
+            if not self._validate(row_number, module):
+                continue
+
+            if module.pk is None:
+                created_modules[module_key] = module
+            else:
+                updated_modules[module_key] = module
+
+            module_course_pks[module_key].update(
+                course_pks[(university_pk, course_name)] for course_name in course_names
+            )
+
+        Module.objects.bulk_create(created_modules.values())
+        Module.objects.bulk_update(updated_modules.values(), ("name", "year_started"))
+        Module.course_set.through.objects.bulk_create(
+            (
+                Module.course_set.through(module_id=module.pk, course_id=course_pk)
+                for module_key, module in itertools.chain(
+                    created_modules.items(),
+                    updated_modules.items(),
+                )
+                for course_pk in module_course_pks[module_key]
+            ),
+            ignore_conflicts=True,
+        )
+        self.result.created_counts["module"] += len(created_modules)
+        self.result.updated_counts["module"] += len(updated_modules)
+
+    def _import_posts(self, rows: Sequence[_NumberedRow]) -> None:
+        if not rows:
+            return
+
+        university_pks: Mapping[str, int] = self._get_university_pks(rows)
+        module_pks: Mapping[tuple[int, str], int] = self._get_module_pks(
+            university_pks.values(),
+            (_get_str(row, "module", required=False) for _, row in rows),
+        )
+        user_pks: Mapping[str, int] = dict(
+            User.objects.filter(
+                email__in={_get_str(row, "user", required=False) for _, row in rows},
+            ).values_list("email", "pk"),
+        )
+        possible_user_modules: set[tuple[int, int]] = set(
+            Module.course_set.through.objects.filter(
+                module_id__in=module_pks.values(),
+                course__enrolled_user_set__in=user_pks.values(),
+            ).values_list("course__enrolled_user_set", "module_id"),
+        )
+        existing_posts: dict[tuple[int, int], Post] = {
+            (post.user_id, post.module_id): post
+            for post in Post.objects.filter(
+                user_id__in=user_pks.values(),
+                module_id__in=module_pks.values(),
+            )
+        }
+        created_posts: dict[tuple[int, int], Post] = {}
+        updated_posts: dict[tuple[int, int], Post] = {}
+
+        row_number: int
+        row: _Row
+        for row_number, row in rows:
+            try:
+                university_email_domain: str = _get_str(row, "university").lower()
+                module_code: str = _get_str(row, "module")
+                user_email: str = _get_str(row, "user")
+                post_values: Mapping[str, object] = {
+                    "overall_rating": int(_get_str(row, "overall_rating")),
+                    "difficulty_rating": _get_optional_int(row, "difficulty_rating"),
+                    "assessment_rating": _get_optional_int(row, "assessment_rating"),
+                    "teaching_rating": _get_optional_int(row, "teaching_rating"),
+                    "content": _get_str(row, "content", required=False),
+                    "academic_year_start": int(_get_str(row, "academic_year_start")),
+                }
+            except ValueError as value_error:
+                self._report_error(row_number, str(value_error))
+                continue
+
+            module_pk: int | None = module_pks.get(
+                (university_pks.get(university_email_domain, -1), module_code),
+            )
+            user_pk: int | None = user_pks.get(user_email)
+            if module_pk is None or user_pk is None:
+                self._report_error(
+                    row_number,
+                    (
+                        f"No module with code {module_code!r} "
+                        f"at university {university_email_domain!r}."
+                        if module_pk is None
+                        else f"No user with email address {user_email!r}."
+                    ),
+                )
+                continue
+
+            if (user_pk, module_pk) not in possible_user_modules:
+                self._report_error(
+                    row_number,
+                    f"User {user_email!r} has not taken module {module_code!r}.",
+                )
+                continue
+
+            post_key: tuple[int, int] = (user_pk, module_pk)
+            post: Post | None = created_posts.get(post_key) or existing_posts.get(post_key)
+            if post is None:
+                post = Post(user_id=user_pk, module_id=module_pk)
+
+            field_name: str
+            field_value: object
+            for field_name, field_value in post_values.items():
+                setattr(post, field_name, field_value)
+
+            if not self._validate(row_number, post, exclude=("user", "module")):
+                continue
+
+            if post.pk is None:
+                created_posts[post_key] = post
+            else:
+                updated_posts[post_key] = post
+
+        Post.objects.bulk_create(created_posts.values())
+        Post.objects.bulk_update(updated_posts.values(), POST_FIELD_NAMES)
+
+        if not is_enforced_by_database():
+            User.liked_post_set.through.objects.bulk_create(
+                (
+                    User.liked_post_set.through(user_id=post.user_id, post_id=post.pk)
+                    for post in created_posts.values()
+                ),
+                ignore_conflicts=True,
+            )
+
+        self.result.created_counts["post"] += len(created_posts)
+        self.result.updated_counts["post"] += len(updated_posts)
+
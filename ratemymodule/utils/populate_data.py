@@ -4,13 +4,23 @@ from collections.abc import Sequence
 
 __all__: Sequence[str] = (
     "populate_database",
+    "populate_load_test_database",
 )
 import datetime
 import random
+import string
+from collections.abc import Callable
 
 import numpy as np
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
 
-from ratemymodule.models import Course, Post, User
+from ratemymodule.models import Course, Module, Post, University, User
+from ratemymodule.models.data_versions import bump_data_versions
+
+BULK_BATCH_SIZE = 1000
+LIKE_PROBABILITY = 0.7
 
 
 def populate_database() -> None:
@@ -54,6 +64,189 @@ def populate_database() -> None:
                 # don't need names, password, just need a email for uni, course
 
 
+def _to_letters(number: int) -> str:
+    """Encode a number as lowercase letters, for names that cannot contain digits."""
+    letters = ""
+    while True:
+        number, remainder = divmod(number, 26)
+        letters = string.ascii_lowercase[remainder] + letters
+        if not number:
+            return letters
+
+
+def _generate_reaction_rows(posts: list[Post], users: list[User], reactions_per_post: int) -> tuple[list[object], list[object]]:  # noqa: E501
+    """
+    Build the liked & disliked through rows for the given posts.
+
+    Every creator likes their own post,
+    then a random set of the other users like or dislike each post.
+    """
+    LikedThrough = User.liked_post_set.through
+    DislikedThrough = User.disliked_post_set.through
+
+    liked_rows: list[object] = [
+        LikedThrough(user_id=post.user_id, post_id=post.pk) for post in posts
+    ]
+    disliked_rows: list[object] = []
+    for post_number, post in enumerate(posts):
+        reactions_count = min(random.randint(0, 2 * reactions_per_post), len(users) - 1)
+        for reactor_number in random.sample(range(len(users) - 1), reactions_count):
+            # NOTE: Skip over the post's creator, who cannot react to their own post
+            reactor = users[reactor_number + (reactor_number >= post_number)]
+            if random.random() < LIKE_PROBABILITY:
+                liked_rows.append(LikedThrough(user_id=reactor.pk, post_id=post.pk))
+            else:
+                disliked_rows.append(DislikedThrough(user_id=reactor.pk, post_id=post.pk))
+
+    return liked_rows, disliked_rows
+
+
+def populate_load_test_database(*, universities: int = 2, courses_per_university: int = 2, modules_per_course: int = 5, years_back: int = 5, reviews_per_month: int = 5, reactions_per_post: int = 3, on_progress: Callable[[str], None] | None = None) -> int:  # noqa: E501
+    """
+    Quickly populate the database with a large volume of synthetic data for load testing.
+
+    Ratings follow the same quality trends as `populate_database()`,
+    but every row is inserted with `bulk_create()` (including the many-to-many through rows),
+    & users share one precomputed unusable password, so no password hashing is done per user.
+    Each course has its own pool of users, who each post once about every module
+    in that course & react to some of the other posts.
+    Returns the number of posts that were created.
+    """
+    current_year = timezone.now().year
+    unusable_password = make_password(None)
+    posts_per_module = reviews_per_month * 12 * years_back
+    run_letters = "".join(random.choices(string.ascii_lowercase, k=6))
+
+    EnrolmentThrough = User.enrolled_course_set.through
+    ModuleCourseThrough = Module.course_set.through
+    total_posts_count = 0
+    for university_number in range(universities):
+        university_letters = f"{run_letters}{_to_letters(university_number)}"
+        with transaction.atomic():
+            university = University.objects.bulk_create(
+                [
+                    University(
+                        name=f"Load Test University {university_letters.title()}",
+                        short_name=f"LT{university_letters[:6]}",
+                        email_domain=f"{university_letters}.loadtest.ac.uk",
+                        founding_date=datetime.date(1900, 1, 1),
+                    ),
+                ],
+            )[0]
+            courses = Course.objects.bulk_create(
+                Course(
+                    name=f"BSc Load Testing {course_number + 1}",
+                    student_type="a load tester",
+                    university=university,
+                )
+                for course_number in range(courses_per_university)
+            )
+            # NOTE: Bulk writes send no signals, so the data versions are bumped manually
+            bump_data_versions(University, Course)
+
+        for course_number, course in enumerate(courses):
+            with transaction.atomic():
+                modules = Module.objects.bulk_create(
+                    Module(
+                        name=f"Load Testing Module {module_number + 1}",
+                        code=f"LT{course_number + 1:02}{module_number + 1:03}",
+                        # NOTE: Posts are spread from January of the first year, so the module must have started by the preceding September
+                        year_started=datetime.date(current_year - years_back - 1, 9, 1),
+                    )
+                    for module_number in range(modules_per_course)
+                )
+                ModuleCourseThrough.objects.bulk_create(
+                    (
+                        ModuleCourseThrough(module_id=module.pk, course_id=course.pk)
+                        for module in modules
+                    ),
+                    batch_size=BULK_BATCH_SIZE,
+                )
+
+                users = User.objects.bulk_create(
+                    (
+                        User(
+                            email=(
+                                f"student{course_number}x{user_number}@"
+                                f"{university.email_domain}"
+                            ),
+                            password=unusable_password,
+                        )
+                        for user_number in range(posts_per_module)
+                    ),
+                    batch_size=BULK_BATCH_SIZE,
+                )
+                EnrolmentThrough.objects.bulk_create(
+                    (EnrolmentThrough(user_id=user.pk, course_id=course.pk) for user in users),
+                    batch_size=BULK_BATCH_SIZE,
+                )
+                bump_data_versions(Course, Module, User)
+
+            for module in modules:
+                trends = [
+                    generate_quality_trend(years_back, reviews_per_month) for _ in range(4)
+                ]
+                posts = []
+                for post_number, user in enumerate(users):
+                    month_number = post_number // reviews_per_month
+                    year = current_year - years_back + month_number // 12
+                    post = Post(
+                        module=module,
+                        user=user,
+                        overall_rating=trends[0][post_number],
+                        difficulty_rating=trends[1][post_number],
+                        assessment_rating=trends[2][post_number],
+                        teaching_rating=trends[3][post_number],
+                        content="",
+                        academic_year_start=year,
+                    )
+                    post.date_time_created = datetime.datetime(
+                        year,
+                        month_number % 12 + 1,
+                        random.randint(1, 28),
+                        random.randint(0, 23),
+                        random.randint(0, 59),
+                        tzinfo=datetime.UTC,
+                    )
+                    posts.append(post)
+
+                date_times_created = [post.date_time_created for post in posts]
+
+                with transaction.atomic():
+                    Post.objects.bulk_create(posts, batch_size=BULK_BATCH_SIZE)
+
+                    # NOTE: `bulk_create()` overwrites `auto_now_add` fields, so restore them
+                    for post, date_time_created in zip(posts, date_times_created, strict=True):
+                        post.date_time_created = date_time_created
+                    Post.objects.bulk_update(
+                        posts,
+                        ("date_time_created",),
+                        batch_size=BULK_BATCH_SIZE,
+                    )
+
+                    liked_rows, disliked_rows = _generate_reaction_rows(
+                        posts,
+                        users,
+                        reactions_per_post,
+                    )
+                    User.liked_post_set.through.objects.bulk_create(
+                        liked_rows,
+                        batch_size=BULK_BATCH_SIZE,
+                        ignore_conflicts=True,
+                    )
+                    User.disliked_post_set.through.objects.bulk_create(
+                        disliked_rows,
+                        batch_size=BULK_BATCH_SIZE,
+                    )
+                    bump_data_versions(Post, User)
+
+                total_posts_count += len(posts)
+                if on_progress is not None:
+                    on_progress(f"Created {total_posts_count} posts")
+
+    return total_posts_count
+
+
 def generate_trend_up(num_samples: int, _start: float) -> list[int]:
     """Get a trending up list of numbers 1-5."""
     _stop = _start + random.uniform(0.25, _start+1) if _start < 4 else _start
@@ -0,0 +1,120 @@
+"""
+Streaming export of posts & their ratings, for offline analysis.
+
+Posts (selected with `ratemymodule.models.post_filters.PostFilters`)
+are read from the database in chunks with `QuerySet.iterator()`
+& written out one line at a time as CSV or JSON Lines (NDJSON),
+so memory use only depends on the chunk size, never on the number of exported posts.
+
+Every row has the columns in `POST_EXPORT_COLUMNS`.
+The `university` (email domain) & `module` (code) columns match those expected by
+`ratemymodule.utils.catalogue_import`; posts' creators are never exported.
+"""
+
+from collections.abc import Sequence
+
+__all__: Sequence[str] = (
+    "POST_EXPORT_COLUMNS",
+    "POST_EXPORT_FILE_FORMATS",
+    "POST_EXPORT_CONTENT_TYPES",
+    "get_post_export_queryset",
+    "iter_post_export_lines",
+)
+
+import csv
+import json
+from collections.abc import Iterable, Iterator, Mapping
+from typing import Final
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+from ratemymodule.models import Course, Post
+from ratemymodule.models.reactions import annotate_post_reaction_state
+from ratemymodule.utils.catalogue_import import POST_FIELD_NAMES
+
+POST_EXPORT_FILE_FORMATS: Final[Sequence[str]] = ("csv", "jsonl")
+POST_EXPORT_CONTENT_TYPES: Final[Mapping[str, str]] = {
+    "csv": "text/csv; charset=utf-8",
+    "jsonl": "application/x-ndjson; charset=utf-8",
+}
+POST_EXPORT_COLUMNS: Final[Sequence[str]] = (
+    "id",
+    "university",
+    "module",
+    *POST_FIELD_NAMES,
+    "date_time_posted",
+    "likes_count",
+    "dislikes_count",
+)
+DEFAULT_CHUNK_SIZE: Final[int] = 2000
+
+
+def get_post_export_queryset(queryset: models.QuerySet[Post]) -> models.QuerySet[dict[str, object]]:  # noqa: E501
+    """
+    Turn a queryset of posts into one of export rows, each fetched with a single query.
+
+    The module's university & the posts' reaction counts are fetched with subqueries.
+    Reactions that are still buffered (not yet written to the database) are not included.
+    """
+    return annotate_post_reaction_state(queryset, AnonymousUser()).annotate(
+        export_university=models.Subquery(
+            Course.objects.filter(
+                module_set=models.OuterRef("module_id"),
+            ).order_by("pk").values("university__email_domain")[:1],
+        ),
+    ).order_by("pk").values(
+        "id",
+        *POST_FIELD_NAMES,
+        university=models.F("export_university"),
+        module_code=models.F("module__code"),
+        date_time_posted=models.F("date_time_created"),
+        likes_count=models.F("reaction_likes_count"),
+        dislikes_count=models.F("reaction_dislikes_count"),
+    )
+
+
+class _EchoBuffer:
+    """File-like object that returns each written value, so `csv.writer` can stream lines."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def _to_export_row(row: Mapping[str, object]) -> dict[str, object]:
+    return {
+        column: row["module_code" if column == "module" else column]
+        for column in POST_EXPORT_COLUMNS
+    }
+
+
+def iter_post_export_lines(queryset: models.QuerySet[dict[str, object]], file_format: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:  # noqa: E501
+    """
+    Yield every export row as a line of the given format, starting with a CSV header row.
+
+    Rows are fetched lazily in chunks of `chunk_size`,
+    so the first line is yielded before the query's full results are read.
+    """
+    if file_format not in POST_EXPORT_FILE_FORMATS:
+        INVALID_FILE_FORMAT_MESSAGE: Final[str] = (
+            f"file_format must be one of {", ".join(POST_EXPORT_FILE_FORMATS)}."
+        )
+        raise ValueError(INVALID_FILE_FORMAT_MESSAGE)
+
+    rows: Iterable[Mapping[str, object]] = queryset.iterator(chunk_size=chunk_size)
+
+    if file_format == "jsonl":
+        row: Mapping[str, object]
+        for row in rows:
+            yield f"{json.dumps(_to_export_row(row), cls=DjangoJSONEncoder)}\n"
+
+        return
+
+    csv_writer: csv.DictWriter[str] = csv.DictWriter(_EchoBuffer(), POST_EXPORT_COLUMNS)  # type: ignore[arg-type]
+    yield csv_writer.writeheader()  # type: ignore[misc]
+
+    for row in rows:
+        export_row: dict[str, object] = _to_export_row(row)
+        export_row["date_time_posted"] = export_row["date_time_posted"].isoformat()  # type: ignore[attr-defined]
+        yield csv_writer.writerow(export_row)  # type: ignore[misc]
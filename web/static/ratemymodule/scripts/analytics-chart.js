@@ -0,0 +1,217 @@
+/*
+ * Draws the advanced analytics graph in the browser, from the module statistics REST endpoint.
+ *
+ * Submitting the analytics form fetches the monthly rating averages as JSON
+ * & renders them as an SVG line graph, instead of reloading the page
+ * to have the server render the graph with matplotlib.
+ * If the inputs are invalid or the statistics cannot be fetched,
+ * the form is submitted normally so the server-rendered graph (or error) is shown instead.
+ */
+(function() {
+    const SVG_NAMESPACE = "http://www.w3.org/2000/svg";
+    const MONTH_NAMES = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"];
+    const SERIES = [
+        {inputName: "aa_overall_rating", fieldName: "overall_rating", label: "Overall Rating", colour: "#1f77b4"},
+        {inputName: "aa_difficulty_rating", fieldName: "difficulty_rating", label: "Difficulty Rating", colour: "#ff7f0e"},
+        {inputName: "aa_teaching_quality", fieldName: "teaching_rating", label: "Teaching Quality", colour: "#2ca02c"},
+        {inputName: "aa_assessment_quality", fieldName: "assessment_rating", label: "Assessment Quality", colour: "#d62728"},
+    ];
+    const WIDTH = 650;
+    const HEIGHT = 435;
+    const PLOT = {left: 50, right: WIDTH - 15, top: 55, bottom: HEIGHT - 60};
+    const MIN_RATING = 0.5;
+    const MAX_RATING = 5.5;
+
+    function createSVGElement(tagName, attributes, textContent) {
+        const element = document.createElementNS(SVG_NAMESPACE, tagName);
+        Object.entries(attributes).forEach(function([name, value]) {
+            element.setAttribute(name, value);
+        });
+        if (textContent !== undefined) {
+            element.textContent = textContent;
+        }
+        return element;
+    }
+
+    function isInvalidDateRange(startYear, endYear, now) {
+        // NOTE: Matches the server's validation, so the server can report what is wrong with invalid ranges
+        return (
+            Number.isNaN(startYear)
+            || Number.isNaN(endYear)
+            || startYear > endYear
+            || startYear < 1900
+            || endYear - startYear > 50
+            || endYear > now.getFullYear()
+        );
+    }
+
+    function getMonths(startYear, endYear, now) {
+        const months = [];
+        for (let year = startYear; year <= endYear; year++) {
+            const lastMonth = year === now.getFullYear() ? now.getMonth() : 11;
+            for (let month = 0; month <= lastMonth; month++) {
+                months.push({
+                    key: `${year}-${String(month + 1).padStart(2, "0")}`,
+                    label: `${MONTH_NAMES[month]}${year}`,
+                });
+            }
+        }
+        return months;
+    }
+
+    function getX(index, monthsCount) {
+        if (monthsCount < 2) {
+            return (PLOT.left + PLOT.right) / 2;
+        }
+        return PLOT.left + (index / (monthsCount - 1)) * (PLOT.right - PLOT.left);
+    }
+
+    function getY(rating) {
+        return PLOT.bottom - ((rating - MIN_RATING) / (MAX_RATING - MIN_RATING)) * (PLOT.bottom - PLOT.top);
+    }
+
+    function drawAxes(svg, months) {
+        for (let rating = 1; rating <= 5; rating += 0.5) {
+            svg.appendChild(createSVGElement("line", {
+                x1: PLOT.left, x2: PLOT.right, y1: getY(rating), y2: getY(rating),
+                stroke: "#888888", "stroke-width": 0.5,
+            }));
+            svg.appendChild(createSVGElement("text", {
+                x: PLOT.left - 8, y: getY(rating), "text-anchor": "end", "dominant-baseline": "middle",
+                fill: "var(--text-color)", "font-weight": "bold", "font-size": 12,
+            }, `${rating}★`));
+        }
+
+        // NOTE: At most 12 month labels are shown (along with the final month), so they never overlap
+        const labelStep = Math.max(1, Math.floor(months.length / 12));
+        months.forEach(function(month, index) {
+            const isLastMonth = index === months.length - 1;
+            if ((index % labelStep !== 0 || index === months.length - 2) && !isLastMonth) {
+                return;
+            }
+            const x = getX(index, months.length);
+            svg.appendChild(createSVGElement("text", {
+                x: x, y: PLOT.bottom + 12, transform: `rotate(45 ${x} ${PLOT.bottom + 12})`,
+                fill: "var(--text-color)", "font-weight": "bold", "font-size": 11,
+            }, month.label));
+        });
+    }
+
+    function drawSeries(svg, months, averagesByMonth, series) {
+        // NOTE: Months without any posts leave a gap in the line, rather than being drawn as a zero rating
+        let path = "";
+        let isDrawing = false;
+        months.forEach(function(month, index) {
+            const average = (averagesByMonth.get(month.key) || {})[series.fieldName];
+            if (average === undefined || average === null) {
+                isDrawing = false;
+                return;
+            }
+            const point = `${getX(index, months.length).toFixed(1)} ${getY(average).toFixed(1)}`;
+            path += isDrawing ? ` L ${point}` : ` M ${point}`;
+            isDrawing = true;
+
+            svg.appendChild(createSVGElement("circle", {
+                cx: getX(index, months.length), cy: getY(average), r: 2, fill: series.colour,
+            }));
+        });
+
+        if (path) {
+            svg.appendChild(createSVGElement("path", {
+                d: path.trim(), fill: "none", stroke: series.colour, "stroke-width": 1.5,
+            }));
+        }
+    }
+
+    function drawLegend(svg, selectedSeries) {
+        const legend = createSVGElement("g", {});
+        const legendHeight = selectedSeries.length * 18 + 8;
+        legend.appendChild(createSVGElement("rect", {
+            x: PLOT.right - 150, y: PLOT.top + 5, width: 145, height: legendHeight, rx: 4,
+            fill: "var(--secondary-color)", stroke: "var(--button-hover)",
+        }));
+        selectedSeries.forEach(function(series, index) {
+            const y = PLOT.top + 18 + index * 18;
+            legend.appendChild(createSVGElement("line", {
+                x1: PLOT.right - 142, x2: PLOT.right - 122, y1: y, y2: y,
+                stroke: series.colour, "stroke-width": 2,
+            }));
+            legend.appendChild(createSVGElement("text", {
+                x: PLOT.right - 116, y: y, "dominant-baseline": "middle",
+                fill: "var(--text-color)", "font-size": 12,
+            }, series.label));
+        });
+        svg.appendChild(legend);
+    }
+
+    function renderGraph(container, moduleName, startYear, endYear, now, stats, selectedSeries) {
+        const months = getMonths(startYear, endYear, now);
+        const averagesByMonth = new Map(stats.monthly.map(function(monthlyStats) {
+            return [monthlyStats.month, monthlyStats.averages];
+        }));
+        const endDate = endYear === now.getFullYear()
+            ? `${now.getDate()}/${now.getMonth() + 1}/${now.getFullYear()}`
+            : `31/12/${endYear}`;
+
+        const svg = createSVGElement("svg", {
+            viewBox: `0 0 ${WIDTH} ${HEIGHT}`, width: "100%", role: "img",
+            "aria-label": `Graph of ${moduleName}, from 1/1/${startYear} to ${endDate}`,
+        });
+        svg.appendChild(createSVGElement("text", {
+            x: 0, y: 18, fill: "var(--text-color)", "font-weight": "bold", "font-size": 15,
+        }, `Graph of ${moduleName},`));
+        svg.appendChild(createSVGElement("text", {
+            x: 0, y: 38, fill: "var(--text-color)", "font-weight": "bold", "font-size": 15,
+        }, `from 1/1/${startYear} to ${endDate}`));
+
+        drawAxes(svg, months);
+        selectedSeries.forEach(function(series) {
+            drawSeries(svg, months, averagesByMonth, series);
+        });
+        if (selectedSeries.length) {
+            drawLegend(svg, selectedSeries);
+        }
+
+        container.replaceChildren(svg);
+    }
+
+    document.addEventListener("DOMContentLoaded", function() {
+        const form = document.getElementById("analytics-form");
+        const container = document.getElementById("aa-graph-div");
+        if (!form || !container || !form.dataset.statsUrl || !window.fetch) {
+            return;
+        }
+
+        form.addEventListener("submit", function(event) {
+            const now = new Date();
+            const startYear = parseInt(form.elements["aa_start_year"].value, 10);
+            const endYear = parseInt(form.elements["aa_end_year"].value, 10);
+            if (isInvalidDateRange(startYear, endYear, now)) {
+                return;
+            }
+
+            event.preventDefault();
+            const selectedSeries = SERIES.filter(function(series) {
+                return form.elements[series.inputName].checked;
+            });
+            const statsURL = new URL(form.dataset.statsUrl, window.location.href);
+            statsURL.searchParams.set("date_from", `${startYear}-01-01`);
+            statsURL.searchParams.set("date_to", `${endYear}-12-31`);
+
+            fetch(statsURL, {headers: {Accept: "application/json"}, credentials: "same-origin"})
+                .then(function(response) {
+                    if (!response.ok) {
+                        throw new Error(`Module statistics request failed: ${response.status}`);
+                    }
+                    return response.json();
+                })
+                .then(function(stats) {
+                    renderGraph(container, form.dataset.moduleName, startYear, endYear, now, stats, selectedSeries);
+                })
+                .catch(function(error) {
+                    console.error(error);
+                    form.submit();
+                });
+        });
+    });
+})();
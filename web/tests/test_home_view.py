@@ -0,0 +1,37 @@
+"""Test suite for the `HomeView` of the `web` app."""
+
+from collections.abc import Sequence
+
+__all__: Sequence[str] = ()
+
+from typing import TYPE_CHECKING
+
+import django.urls
+from django.contrib.messages.storage.session import SessionStorage
+from django.contrib.sessions.backends.db import SessionStore
+from django.test import RequestFactory
+
+from ratemymodule.models import Module
+from ratemymodule.tests.utils import TestCase
+from ratemymodule.utils.benchmarks import seed_benchmark_data
+from web.views import HomeView
+
+if TYPE_CHECKING:
+    from django.http import HttpRequest, HttpResponse
+
+    from ratemymodule.utils.benchmarks import BenchmarkData
+
+
+class HomeViewTests(TestCase):
+    def test_missing_selected_module_shows_error(self) -> None:
+        data: BenchmarkData = seed_benchmark_data(1)
+        request: HttpRequest = RequestFactory().get(django.urls.reverse("ratemymodule:home"))
+        request.user = data.student
+        request.session = SessionStore()
+        request.session["selected_module_pk"] = Module.objects.latest("pk").pk + 1
+        request._messages = SessionStorage(request)  # type: ignore[attr-defined]  # noqa: SLF001
+
+        response: HttpResponse = HomeView.as_view()(request)
+
+        self.assertContains(response, "Module Not Found")
+        self.assertNotContains(response, "data-stats-url")
@@ -0,0 +1,13 @@
+"""Test suite for the SQL query budgets of the `web` app's views."""
+
+from collections.abc import Sequence
+
+__all__: Sequence[str] = ()
+
+from ratemymodule.tests.utils import TestCase
+from ratemymodule.utils.benchmarks import WEB_BENCHMARK_ENDPOINTS
+
+
+class WebQueryBudgetTests(TestCase):
+    def test_views_within_query_budgets(self) -> None:
+        self.assertEndpointsWithinQueryBudgets(WEB_BENCHMARK_ENDPOINTS)
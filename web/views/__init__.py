@@ -33,6 +33,8 @@ from allauth.account.views import LogoutView as AllAuthLogoutView
 from allauth.account.views import PasswordChangeView as AllAuthPasswordChangeView
 from allauth.account.views import SignupView as AllAuthSignupView
 from django import forms, urls
+from django.apps import apps
+from django.conf import settings
 from django.contrib.auth import logout
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.core.exceptions import BadRequest
@@ -57,6 +59,9 @@ from ratemymodule.models import (
     University,
     User,
 )
+from ratemymodule.models.data_versions import DataVersion, get_data_version
+from ratemymodule.models.post_filters import PostFilters
+from ratemymodule.models.reactions import annotate_post_reaction_state
 from web.forms import AnalyticsForm, ChangeCoursesForm, PostForm, ReportForm, SignupForm
 
 from . import graph_generators, utils
@@ -65,6 +70,7 @@ from .utils import EnsureUserHasCoursesMixin, NextURLRemovedFromGETParams
 if TYPE_CHECKING:
     from django.contrib.auth.models import AnonymousUser
     from django.db.models import QuerySet
+    from django.http import HttpResponseBase
 
 
 class LogoutView(AllAuthLogoutView):  # type: ignore[misc,no-any-unimported]
@@ -323,7 +329,41 @@ class HomeView(EnsureUserHasCoursesMixin, TemplateView):
                 to=utils.get_reload_with_get_params_url(self.request, returned_get_params),
             )
 
-        return super().get(*args, **kwargs)  # type: ignore[arg-type]
+        return self._get_conditional_response(*args, **kwargs)
+
+    def _get_conditional_response(self, *args: object, **kwargs: object) -> HttpResponse:
+        """
+        Render the dashboard, unless the client's copy is still current.
+
+        Pages that show one-off state from the session (E.g. a failed login form)
+        are always rendered, as is every page when `DATA_VERSIONS_ENABLED` is not set.
+        """
+        HAS_ONE_OFF_STATE: Final[bool] = (
+            "selected_module_pk" not in self.request.session
+            or "login_form" in self.request.session
+            or "signup_form" in self.request.session
+        )
+        if HAS_ONE_OFF_STATE or not settings.DATA_VERSIONS_ENABLED:
+            return super().get(*args, **kwargs)  # type: ignore[arg-type]
+
+        data_version: DataVersion = get_data_version(
+            apps.get_app_config("ratemymodule").get_models(),
+        )
+        VARIANT_PARTS: Final[Sequence[object]] = (
+            self.request.user.pk,
+            self.request.session.get("selected_university_pk", None),
+            self.request.session["selected_module_pk"],
+        )
+
+        not_modified_response: HttpResponseBase | None = (
+            data_version.get_not_modified_response(self.request, *VARIANT_PARTS)
+        )
+        if not_modified_response is not None:
+            return not_modified_response  # type: ignore[return-value]
+
+        response: HttpResponse = super().get(*args, **kwargs)  # type: ignore[arg-type]
+        data_version.add_validator_headers(response, *VARIANT_PARTS)
+        return response
 
     # noinspection PyMethodMayBeStatic
     def _get_graphs_context_data(self, selected_module: Module) -> dict[str, object]:
@@ -400,45 +440,49 @@ class HomeView(EnsureUserHasCoursesMixin, TemplateView):
         }
 
     def _get_post_list_context_data(self, selected_module: Module) -> dict[str, object]:
-        post_set: QuerySet[Post] = Post.filter_by_viewable(selected_module, self.request).all()
-        print(post_set)
-
-        # noinspection PyTypeChecker
-        raw_search_string: str | None = self.request.GET.get("q", None)
-        if raw_search_string:
-            post_set = post_set.filter(content__icontains=unquote_plus(raw_search_string))
-
         # noinspection PyTypeChecker
         raw_rating: str | None = self.request.GET.get("rating", None)
+        rating: Post.Ratings | None = None
         if raw_rating:
             try:
-                rating: Post.Ratings = Post.Ratings(int(unquote_plus(raw_rating)))
+                rating = Post.Ratings(int(unquote_plus(raw_rating)))
             except ValueError:
                 return {"error": _("Error: Incorrect rating value")}
 
-            post_set = post_set.filter(overall_rating=rating)
-
         # noinspection PyTypeChecker
         raw_year: str | None = self.request.GET.get("year", None)
+        year: int | None = None
         if raw_year:
             try:
-                year: int = int(unquote_plus(raw_year))
+                year = int(unquote_plus(raw_year))
             except ValueError:
                 return {"error": _("Error: Incorrect rating value")}
 
-            post_set = post_set.filter(academic_year_start=year)
-
         # noinspection PyTypeChecker
         raw_tags: list[str] | None = self.request.GET.getlist("tags", None)
-        if raw_tags:
-            post_set = Post.filter_by_tags(
-                tag_names=(tag.strip() for raw_tag in raw_tags for tag in raw_tag.split(",")),
-            ).all() & post_set
 
-        post_set = post_set.distinct()
+        # noinspection PyTypeChecker
+        raw_search_string: str | None = self.request.GET.get("q", None)
+
+        post_set: QuerySet[Post] = PostFilters(
+            module=selected_module,
+            overall_rating=rating,
+            academic_year_start=year,
+            tag_names=tuple(
+                tag.strip() for raw_tag in raw_tags or () for tag in raw_tag.split(",")
+            ),
+            search=unquote_plus(raw_search_string) if raw_search_string else "",
+        ).apply(Post.filter_by_viewable(request=self.request).all())
 
         return {
-            "post_list": post_set.order_by("-date_time_created"),
+            "post_list": Post.annotate_display_details(
+                annotate_post_reaction_state(
+                    post_set.order_by("-date_time_created"),
+                    self.request.user,
+                ),
+            )
+            .select_related("module")
+            .prefetch_related("tool_tag_set", "topic_tag_set", "other_tag_set"),
             "can_filter_by_tags": (
                 ToolTag.objects.exists()
                 or TopicTag.objects.exists()
@@ -597,6 +641,7 @@ class HomeView(EnsureUserHasCoursesMixin, TemplateView):
             **context_data,
             "LOGIN_URL": utils.get_login_url_from_request(self.request),
             "course_list": university.course_set.prefetch_related("module_set").all(),
+            "selected_module": selected_module,
             **self._get_university_selection_context_data(university),
             **self._get_graphs_context_data(selected_module),
             **self._get_post_list_context_data(selected_module),
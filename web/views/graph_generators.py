@@ -20,6 +20,7 @@ import numpy as np
 from django import template
 from matplotlib.patches import FancyBboxPatch
 
+from core.performance import record_timing
 from ratemymodule.models import Module
 
 register = template.Library()
@@ -192,6 +193,7 @@ def decide_in_or_out_of_bars(array_of_in_ratings: list[int], array_of_bar_labels
     return out_of_bar_texts, inside_of_bar_texts
 
 
+@record_timing("graphs")
 def overall_rating_bar_graph(module: Module, button_colour: str, text_colour: str) -> str:
     """Use rating_bar_graph to generate a bar graph of overall rating."""
     title = "Overall Rating"
@@ -204,6 +206,7 @@ def overall_rating_bar_graph(module: Module, button_colour: str, text_colour: st
     return rating_bar_graph(data, title, bar_colour, label_colour)
 
 
+@record_timing("graphs")
 def difficulty_rating_bar_graph(module: Module, button_colour: str, text_colour: str) -> str:
     """Use rating_bar_graph to generate a bar graph of difficulty rating."""
     title = "Difficulty Rating"
@@ -215,6 +218,7 @@ def difficulty_rating_bar_graph(module: Module, button_colour: str, text_colour:
     return rating_bar_graph(data, title, bar_colour, label_colour)
 
 
+@record_timing("graphs")
 def teaching_quality_bar_graph(module: Module, button_colour: str, text_colour: str) -> str:
     """Use rating_bar_graph to generate a bar graph of teaching rating."""
     title = "Teaching Quality"
@@ -226,6 +230,7 @@ def teaching_quality_bar_graph(module: Module, button_colour: str, text_colour:
     return rating_bar_graph(data, title, bar_colour, label_colour)
 
 
+@record_timing("graphs")
 def assessment_quality_bar_graph(module: Module, button_colour: str, text_colour: str) -> str:
     """Use rating_bar_graph to generate a bar graph of assessment rating."""
     title = "Assessment Quality"
@@ -237,6 +242,7 @@ def assessment_quality_bar_graph(module: Module, button_colour: str, text_colour
     return rating_bar_graph(data, title, bar_colour, label_colour)
 
 
+@record_timing("graphs")
 def advanced_analytics_graph(module: Module, difficulty_rating: bool, assessment_quality: bool, teaching_rating: bool, overall_rating: bool, start_year: int, end_year: int) -> str:  # noqa: E501, FBT001, PLR0915
     """Plot a custom line graph for the analytics modal."""
     """
@@ -398,6 +404,10 @@ def aa_set_up_axis(start_year: int, end_year: int) -> tuple[list[str], list[None
 def get_module_averages(start_year: int, end_year: int, module: Module, attribute: str) -> list[float]:  # noqa: E501
     """Get the average of each month's reviews for a module in a specified date range."""
     set_of_averages: list[float] = []
+    # NOTE: Every post's rating is fetched with a single query, rather than once per month
+    ratings: list[tuple[datetime.datetime, int | None]] = list(
+        module.post_set.values_list("date_time_created", attribute),
+    )
     for year in range(start_year, end_year):
         if year == datetime.datetime.now(tz=datetime.UTC).date().year:
             for month in range(
@@ -413,9 +423,9 @@ def get_module_averages(start_year: int, end_year: int, module: Module, attribut
                 # gets last day of the month, normalize to timezone
 
                 this_months_reviews = [
-                    getattr(post, attribute) for post in module.post_set.all()
-                    if start_band <= post.date_time_created <= end_band and
-                    getattr(post, attribute) is not None
+                    rating for date_time_created, rating in ratings
+                    if start_band <= date_time_created <= end_band and
+                    rating is not None
                 ]
 
                 if this_months_reviews:
@@ -431,9 +441,9 @@ def get_module_averages(start_year: int, end_year: int, module: Module, attribut
             # gets last day of the month, normalize to timezone
 
             this_months_reviews = [
-                getattr(post, attribute) for post in module.post_set.all()
-                if start_band <= post.date_time_created <= end_band and
-                getattr(post, attribute) is not None
+                rating for date_time_created, rating in ratings
+                if start_band <= date_time_created <= end_band and
+                rating is not None
             ]
 
             if this_months_reviews: